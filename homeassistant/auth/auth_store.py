@@ -38,7 +38,7 @@ class AuthStore:
         self._groups = None  # type: Optional[Dict[str, models.Group]]
         self._perm_lookup = None  # type: Optional[PermissionLookup]
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY,
-                                                 private=True)
+                                                 private=True, fsync=True)
         self._lock = asyncio.Lock()
 
     async def async_get_groups(self) -> List[models.Group]:
@@ -52,7 +52,7 @@ class Data:
         """Initialize the user data store."""
         self.hass = hass
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY,
-                                                 private=True)
+                                                 private=True, fsync=True)
         self._data = None  # type: Optional[Dict[str, Any]]
         # Legacy mode will allow usernames to start/end with whitespace
         # and will compare usernames case-insensitive.
@@ -6,18 +6,23 @@ import os
 import sys
 from time import time
 from collections import OrderedDict
-from typing import Any, Optional, Dict, Set
+from typing import Any, Optional, Dict, Iterable, List, Set
 
 import voluptuous as vol
 
-from homeassistant import core, config as conf_util, config_entries, loader
-from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant import (
+    core, config as conf_util, config_entries, loader, requirements)
+from homeassistant.const import (
+    ATTR_RESTORED, EVENT_HOMEASSISTANT_CLOSE, EVENT_HOMEASSISTANT_START,
+    STATE_UNAVAILABLE)
 from homeassistant.setup import async_setup_component
 from homeassistant.util.logging import AsyncHandler
 from homeassistant.util.package import async_get_user_site, is_virtual_env
-from homeassistant.util.yaml import clear_secret_cache
+from homeassistant.util.yaml import (
+    clear_secret_cache, load_parsed_cache, save_parsed_cache)
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import config_per_platform, config_validation as cv
+from homeassistant.helpers.restore_state import RestoreStateData
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +33,9 @@ DATA_LOGGING = 'logging'
 
 CORE_INTEGRATIONS = ('homeassistant', 'persistent_notification')
 LOGGING_INTEGRATIONS = {'logger', 'system_log'}
+# Number of slowest imports logged after startup
+SLOWEST_IMPORTS = 10
+
 STAGE_1_INTEGRATIONS = {
     # To record data
     'recorder',
@@ -167,6 +175,9 @@ async def async_from_config_file(config_path: str,
     await hass.async_add_executor_job(
         conf_util.process_ha_config_upgrade, hass)
 
+    yaml_cache_path = hass.config.path(conf_util.YAML_CACHE_FILE)
+    await hass.async_add_executor_job(load_parsed_cache, yaml_cache_path)
+
     try:
         config_dict = await hass.async_add_executor_job(
             conf_util.load_yaml_config_file, config_path)
@@ -176,6 +187,8 @@ async def async_from_config_file(config_path: str,
     finally:
         clear_secret_cache()
 
+    await hass.async_add_executor_job(save_parsed_cache, yaml_cache_path)
+
     return await async_from_config_dict(
         config_dict, hass, enable_log=False, skip_pip=skip_pip)
 
@@ -306,6 +319,11 @@ async def _async_set_up_integrations(
     """Set up all the integrations."""
     domains = _get_domains(hass, config)
 
+    # Seed the state machine with the states of the last run, so they are
+    # available while the integrations are set up.
+    restore_data = await RestoreStateData.async_get_instance(hass)
+    await restore_data.async_restore_snapshot()
+
     # Resolve all dependencies of all components so we can find the logging
     # and integrations that need faster initialization.
     resolved_domains_task = asyncio.gather(*[
@@ -338,6 +356,11 @@ async def _async_set_up_integrations(
     stage_1_domains = domains & STAGE_1_INTEGRATIONS
     stage_2_domains = domains - logging_domains - stage_1_domains
 
+    # Import the integrations in the background in the order they are set up
+    hass.async_create_task(_async_preload_integrations(
+        hass, config,
+        list(logging_domains) + list(stage_1_domains) + list(stage_2_domains)))
+
     if logging_domains:
         _LOGGER.debug("Setting up %s", logging_domains)
 
@@ -360,23 +383,88 @@ async def _async_set_up_integrations(
 
     # Load all integrations
     after_dependencies = {}  # type: Dict[str, Set[str]]
+    after_start_domains = set()  # type: Set[str]
 
     for int_or_exc in await asyncio.gather(*[
             loader.async_get_integration(hass, domain)
             for domain in stage_2_domains
     ], return_exceptions=True):
         # Exceptions are handled in async_setup_component.
-        if (isinstance(int_or_exc, loader.Integration) and
-                int_or_exc.after_dependencies):
+        if not isinstance(int_or_exc, loader.Integration):
+            continue
+        if int_or_exc.after_dependencies:
             after_dependencies[int_or_exc.domain] = set(
                 int_or_exc.after_dependencies
             )
+        if int_or_exc.setup_after_start:
+            after_start_domains.add(int_or_exc.domain)
+
+    # Integrations that are set up after an integration that is set up
+    # after start have to wait for start as well.
+    while True:
+        waiting = set(
+            domain for domain, after_deps in after_dependencies.items()
+            if domain in stage_2_domains and
+            domain not in after_start_domains and
+            after_deps & after_start_domains)
+        if not waiting:
+            break
+        after_start_domains |= waiting
+
+    stage_2_domains -= after_start_domains
+
+    await _async_set_up_stage(
+        hass, config, stage_2_domains, after_dependencies)
+
+    # Integrations that are slow to set up, for example because they discover
+    # devices, are set up once Home Assistant has started. Their entities are
+    # unavailable until then.
+    if after_start_domains:
+        await _async_add_placeholder_states(hass, after_start_domains)
+
+    async def async_finish_setup() -> None:
+        """Set up the integrations that were waiting for start."""
+        if after_start_domains:
+            start = time()
+            await _async_set_up_stage(
+                hass, config, after_start_domains, after_dependencies)
+            _LOGGER.info(
+                "Integrations set up after start in %.2fs: %s",
+                time() - start, ', '.join(sorted(after_start_domains)))
 
+        await _async_clean_up_restored_states(hass)
+
+    if hass.state == core.CoreState.running:
+        hass.async_create_task(async_finish_setup())
+    else:
+        @core.callback
+        def finish_setup(event: core.Event) -> None:
+            """Start setting up the integrations waiting for start."""
+            hass.async_create_task(async_finish_setup())
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, finish_setup)
+
+    # Wrap up startup
+    await hass.async_block_till_done()
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        import_times = hass.data.get(loader.DATA_IMPORT_TIMES, {})
+        _LOGGER.debug("Slowest imports: %s", ', '.join(
+            '{} ({:.3f}s)'.format(name, import_times[name])
+            for name in sorted(import_times, key=import_times.get,
+                               reverse=True)[:SLOWEST_IMPORTS]))
+
+
+async def _async_set_up_stage(
+        hass: core.HomeAssistant, config: Dict[str, Any], domains: Set[str],
+        after_dependencies: Dict[str, Set[str]]) -> None:
+    """Set up integrations, respecting their after_dependencies."""
+    domains = set(domains)
     last_load = None
-    while stage_2_domains:
+    while domains:
         domains_to_load = set()
 
-        for domain in stage_2_domains:
+        for domain in domains:
             after_deps = after_dependencies.get(domain)
             # Load if integration has no after_dependencies or they are
             # all loaded
@@ -395,17 +483,90 @@ async def _async_set_up_integrations(
         ])
 
         last_load = domains_to_load
-        stage_2_domains -= domains_to_load
+        domains -= domains_to_load
 
-    # These are stage 2 domains that never have their after_dependencies
+    # These are domains that never have their after_dependencies
     # satisfied.
-    if stage_2_domains:
-        _LOGGER.debug("Final set up: %s", stage_2_domains)
+    if domains:
+        _LOGGER.debug("Final set up: %s", domains)
 
         await asyncio.gather(*[
             async_setup_component(hass, domain, config)
-            for domain in stage_2_domains
+            for domain in domains
         ])
 
-    # Wrap up startup
-    await hass.async_block_till_done()
+
+async def _async_add_placeholder_states(
+        hass: core.HomeAssistant, domains: Set[str]) -> None:
+    """Add unavailable states for the registered entities of integrations.
+
+    The attributes are restored from the last run if they were stored. The
+    states are taken over by the entities once they are added.
+    """
+    registry = await hass.helpers.entity_registry.async_get_registry()
+    restore_data = await RestoreStateData.async_get_instance(hass)
+
+    for entry in registry.entities.values():
+        if (entry.platform not in domains or entry.disabled or
+                hass.states.get(entry.entity_id) is not None):
+            continue
+
+        stored = restore_data.last_states.get(entry.entity_id)
+        if stored is None:
+            attributes = {}  # type: Dict[str, Any]
+        else:
+            attributes = dict(stored.state.attributes)
+        attributes[ATTR_RESTORED] = True
+
+        hass.states.async_set(entry.entity_id, STATE_UNAVAILABLE, attributes)
+
+
+async def _async_clean_up_restored_states(hass: core.HomeAssistant) -> None:
+    """Handle the restored states that no entity took over during setup.
+
+    Registered entities are marked unavailable, other states are removed.
+    """
+    registry = await hass.helpers.entity_registry.async_get_registry()
+
+    for state in hass.states.async_all():
+        if not state.attributes.get(ATTR_RESTORED):
+            continue
+
+        if not registry.async_is_registered(state.entity_id):
+            hass.states.async_remove(state.entity_id)
+        elif state.state != STATE_UNAVAILABLE:
+            hass.states.async_set(
+                state.entity_id, STATE_UNAVAILABLE, state.attributes)
+
+
+async def _async_preload_integrations(
+        hass: core.HomeAssistant, config: Dict[str, Any],
+        domains: Iterable[str]) -> None:
+    """Import integrations and their configured platforms in the background.
+
+    The import pool runs the imports in the order of the domains. Integrations
+    with requirements that are not installed yet are imported during setup,
+    after their requirements are installed.
+    """
+    platforms = OrderedDict()  # type: Dict[str, List[str]]
+    for domain in domains:
+        platforms.setdefault(domain, [])
+        for p_name, _ in config_per_platform(config, domain):
+            if isinstance(p_name, str):
+                platforms.setdefault(p_name, []).append(domain)
+
+    async def preload(domain: str, platform_names: List[str]) -> None:
+        """Import an integration and platforms."""
+        try:
+            integration = await loader.async_get_integration(hass, domain)
+        except loader.IntegrationNotFound:
+            return
+        reqs = integration.requirements
+        if reqs and not await requirements.async_requirements_met(hass, reqs):
+            return
+        await integration.async_preload(platform_names)
+
+    await asyncio.gather(*[
+        preload(domain, platform_names)
+        for domain, platform_names in platforms.items()
+    ])
@@ -3,14 +3,16 @@ import asyncio
 from functools import partial
 import importlib
 import logging
+from time import monotonic
 
 import voluptuous as vol
 
+from homeassistant import config as conf_util
 from homeassistant.const import (
-    ATTR_ENTITY_ID, ATTR_NAME, CONF_ID, CONF_PLATFORM,
+    ATTR_ENTITY_ID, ATTR_NAME, CONF_ID, CONF_MODE, CONF_PLATFORM,
     EVENT_AUTOMATION_TRIGGERED, EVENT_HOMEASSISTANT_START, SERVICE_RELOAD,
     SERVICE_TOGGLE, SERVICE_TURN_OFF, SERVICE_TURN_ON, STATE_ON)
-from homeassistant.core import Context, CoreState
+from homeassistant.core import Context, CoreState, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import condition, extract_domain_configs, script
 import homeassistant.helpers.config_validation as cv
@@ -46,6 +48,9 @@ ATTR_LAST_TRIGGERED = 'last_triggered'
 ATTR_VARIABLES = 'variables'
 SERVICE_TRIGGER = 'trigger'
 
+# Number of automations reported to system health
+SYSTEM_HEALTH_SLOWEST = 10
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -83,6 +88,7 @@ PLATFORM_SCHEMA = vol.Schema({
     vol.Required(CONF_TRIGGER): _TRIGGER_SCHEMA,
     vol.Optional(CONF_CONDITION): _CONDITION_SCHEMA,
     vol.Required(CONF_ACTION): cv.SCRIPT_SCHEMA,
+    **script.SCRIPT_MODE_SCHEMA,
 })
 
 SERVICE_SCHEMA = vol.Schema({
@@ -114,6 +120,22 @@ async def async_setup(hass, config):
 
     await _async_process_config(hass, config, component)
 
+    async def system_health_info(hass):
+        """Return the automations that spent most time on conditions."""
+        entities = sorted(
+            (entity for entity in component.entities
+             if entity.condition_stats['evaluated']),
+            key=lambda entity: entity.condition_stats['total_time'],
+            reverse=True)
+
+        return {
+            entity.entity_id: entity.condition_stats
+            for entity in entities[:SYSTEM_HEALTH_SLOWEST]
+        }
+
+    hass.components.system_health.async_register_info(
+        DOMAIN, system_health_info)
+
     async def trigger_service_handler(service_call):
         """Handle automation triggers."""
         tasks = []
@@ -149,8 +171,8 @@ async def async_setup(hass, config):
             await asyncio.wait(tasks, loop=hass.loop)
 
     async def reload_service_handler(service_call):
-        """Remove all automations and load new ones from config."""
-        conf = await component.async_prepare_reload()
+        """Reload the automations that changed in the config."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         await _async_process_config(hass, conf, component)
@@ -179,8 +201,9 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
     """Entity to show status of entity."""
 
     def __init__(self, automation_id, name, async_attach_triggers, cond_func,
-                 async_action, hidden, initial_state):
+                 async_action, hidden, initial_state, config_key=None):
         """Initialize an automation entity."""
+        self.config_key = config_key
         self._id = automation_id
         self._name = name
         self._async_attach_triggers = async_attach_triggers
@@ -190,6 +213,10 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         self._last_triggered = None
         self._hidden = hidden
         self._initial_state = initial_state
+        self._evaluated = 0
+        self._passed = 0
+        self._total_time = 0.0
+        self._max_time = 0.0
 
     @property
     def name(self):
@@ -208,6 +235,18 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
             ATTR_LAST_TRIGGERED: self._last_triggered
         }
 
+    @property
+    def condition_stats(self):
+        """Return how often and how long the conditions were evaluated."""
+        return {
+            'evaluated': self._evaluated,
+            'passed': self._passed,
+            'average_time': (self._total_time / self._evaluated
+                             if self._evaluated else 0.0),
+            'max_time': self._max_time,
+            'total_time': self._total_time,
+        }
+
     @property
     def hidden(self) -> bool:
         """Return True if the automation entity should be hidden from UIs."""
@@ -277,7 +316,7 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
 
         This method is a coroutine.
         """
-        if not skip_condition and not self._cond_func(variables):
+        if not skip_condition and not self._async_check_conditions(variables):
             return
 
         # Create a new context referring to the old context.
@@ -293,6 +332,22 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         self._last_triggered = utcnow()
         await self.async_update_ha_state()
 
+    @callback
+    def _async_check_conditions(self, variables):
+        """Check the conditions and keep track of the time it took."""
+        start = monotonic()
+        passed = self._cond_func(variables)
+        elapsed = monotonic() - start
+
+        self._evaluated += 1
+        self._total_time += elapsed
+        if elapsed > self._max_time:
+            self._max_time = elapsed
+        if passed:
+            self._passed += 1
+
+        return passed
+
     async def async_will_remove_from_hass(self):
         """Remove listeners when removing automation from HASS."""
         await super().async_will_remove_from_hass()
@@ -324,8 +379,14 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
 async def _async_process_config(hass, config, component):
     """Process config and add automations.
 
+    Automations whose config did not change keep running, the others are
+    removed and created again.
+
     This method is a coroutine.
     """
+    current = {(entity.name, entity.config_key): entity
+               for entity in component.entities}
+    unchanged = set()
     entities = []
 
     for config_key in extract_domain_configs(config, DOMAIN):
@@ -336,11 +397,16 @@ async def _async_process_config(hass, config, component):
             name = config_block.get(CONF_ALIAS) or "{} {}".format(config_key,
                                                                   list_no)
 
+            block_key = conf_util.config_key(config_block)
+            entity = current.pop((name, block_key), None)
+            if entity is not None and block_key is not None:
+                unchanged.add(entity.entity_id)
+                continue
+
             hidden = config_block[CONF_HIDE_ENTITY]
             initial_state = config_block.get(CONF_INITIAL_STATE)
 
-            action = _async_get_action(hass, config_block.get(CONF_ACTION, {}),
-                                       name)
+            action = _async_get_action(hass, config_block, name)
 
             if CONF_CONDITION in config_block:
                 cond_func = _async_process_if(hass, config, config_block)
@@ -358,17 +424,24 @@ async def _async_process_config(hass, config, component):
             )
             entity = AutomationEntity(
                 automation_id, name, async_attach_triggers, cond_func, action,
-                hidden, initial_state)
+                hidden, initial_state, block_key)
 
             entities.append(entity)
 
+    for entity in list(component.entities):
+        if entity.entity_id not in unchanged:
+            await component.async_remove_entity(entity.entity_id)
+
     if entities:
         await component.async_add_entities(entities)
 
 
-def _async_get_action(hass, config, name):
+def _async_get_action(hass, config_block, name):
     """Return an action based on a configuration."""
-    script_obj = script.Script(hass, config, name)
+    script_obj = script.Script(
+        hass, config_block.get(CONF_ACTION, {}), name,
+        run_mode=config_block[CONF_MODE],
+        max_runs=config_block[script.CONF_MAX])
 
     async def action(entity_id, variables, context):
         """Execute an action."""
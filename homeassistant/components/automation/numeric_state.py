@@ -6,18 +6,24 @@ import voluptuous as vol
 from homeassistant.core import callback
 from homeassistant.const import (
     CONF_VALUE_TEMPLATE, CONF_PLATFORM, CONF_ENTITY_ID,
-    CONF_BELOW, CONF_ABOVE, CONF_FOR)
+    CONF_BELOW, CONF_ABOVE, CONF_FOR, CONF_ATTRIBUTE, ATTR_RESTORED,
+    STATE_UNAVAILABLE)
 from homeassistant.helpers.event import (
     async_track_state_change, async_track_same_state)
 from homeassistant.helpers import condition, config_validation as cv
 
+CONF_HYSTERESIS = 'hysteresis'
+
 TRIGGER_SCHEMA = vol.All(vol.Schema({
     vol.Required(CONF_PLATFORM): 'numeric_state',
     vol.Required(CONF_ENTITY_ID): cv.entity_ids,
     vol.Optional(CONF_BELOW): vol.Coerce(float),
     vol.Optional(CONF_ABOVE): vol.Coerce(float),
-    vol.Optional(CONF_VALUE_TEMPLATE): cv.template,
+    vol.Exclusive(CONF_ATTRIBUTE, 'value'): cv.string,
+    vol.Exclusive(CONF_VALUE_TEMPLATE, 'value'): cv.template,
     vol.Optional(CONF_FOR): vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_HYSTERESIS, default=0): vol.All(
+        vol.Coerce(float), vol.Range(min=0)),
 }), cv.has_at_least_one_key(CONF_BELOW, CONF_ABOVE))
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,18 +36,22 @@ async def async_trigger(hass, config, action, automation_info):
     above = config.get(CONF_ABOVE)
     time_delta = config.get(CONF_FOR)
     value_template = config.get(CONF_VALUE_TEMPLATE)
+    attribute = config.get(CONF_ATTRIBUTE)
+    hysteresis = config[CONF_HYSTERESIS]
     unsub_track_same = {}
     entities_triggered = set()
 
+    # A triggered entity is only reset once its value left the limits by
+    # more than the hysteresis, so a flapping value does not trigger again.
+    reset_below = None if below is None else below + hysteresis
+    reset_above = None if above is None else above - hysteresis
+
     if value_template is not None:
         value_template.hass = hass
 
     @callback
-    def check_numeric_state(entity, from_s, to_s):
-        """Return True if criteria are now met."""
-        if to_s is None:
-            return False
-
+    def numeric_value(entity, state):
+        """Return the numeric value of the state or None."""
         variables = {
             'trigger': {
                 'platform': 'numeric_state',
@@ -50,8 +60,25 @@ async def async_trigger(hass, config, action, automation_info):
                 'above': above,
             }
         }
-        return condition.async_numeric_state(
-            hass, to_s, below, above, value_template, variables)
+        return condition.async_numeric_value(
+            state, value_template, variables, attribute)
+
+    @callback
+    def watched_value(state):
+        """Return the raw value that is tested of a state."""
+        if attribute is not None:
+            return state.attributes.get(attribute)
+        return state.state
+
+    @callback
+    def check_in_band(entity, from_s, to_s):
+        """Return True if the entity should stay triggered."""
+        if to_s is None:
+            return False
+
+        value = numeric_value(entity, to_s)
+        return value is not None and condition.numeric_in_range(
+            value, reset_below, reset_above)
 
     @callback
     def state_automation_listener(entity, from_s, to_s):
@@ -70,17 +97,36 @@ async def async_trigger(hass, config, action, automation_info):
                 }
             }, context=to_s.context))
 
-        matching = check_numeric_state(entity, from_s, to_s)
+        # Nothing to evaluate if only values that are not tested changed.
+        # Templates can use anything, so they are always rendered again.
+        if (value_template is None and from_s is not None and
+                to_s is not None and
+                watched_value(from_s) == watched_value(to_s)):
+            return
+
+        value = None if to_s is None else numeric_value(entity, to_s)
+        matching = value is not None and condition.numeric_in_range(
+            value, below, above)
 
         if not matching:
+            if (hysteresis and value is not None and
+                    condition.numeric_in_range(
+                        value, reset_below, reset_above)):
+                return
             entities_triggered.discard(entity)
         elif entity not in entities_triggered:
             entities_triggered.add(entity)
 
+            # The entity replacing the placeholder it had until it was set
+            # up did not cross the limits.
+            if (from_s is not None and from_s.state == STATE_UNAVAILABLE and
+                    from_s.attributes.get(ATTR_RESTORED)):
+                return
+
             if time_delta:
                 unsub_track_same[entity] = async_track_same_state(
                     hass, time_delta, call_action, entity_ids=entity_id,
-                    async_check_same_func=check_numeric_state)
+                    async_check_same_func=check_in_band)
             else:
                 call_action()
 
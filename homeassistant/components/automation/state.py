@@ -2,7 +2,8 @@
 import voluptuous as vol
 
 from homeassistant.core import callback
-from homeassistant.const import MATCH_ALL, CONF_PLATFORM, CONF_FOR
+from homeassistant.const import (
+    MATCH_ALL, CONF_PLATFORM, CONF_FOR, ATTR_RESTORED, STATE_UNAVAILABLE)
 from homeassistant.helpers.event import (
     async_track_state_change, async_track_same_state)
 import homeassistant.helpers.config_validation as cv
@@ -46,6 +47,12 @@ async def async_trigger(hass, config, action, automation_info):
                 }
             }, context=to_s.context))
 
+        # The entity replacing the placeholder it had until it was set up
+        # is not a change of the entity.
+        if (from_s is not None and from_s.state == STATE_UNAVAILABLE and
+                from_s.attributes.get(ATTR_RESTORED)):
+            return
+
         # Ignore changes to state attributes if from/to is in use
         if (not match_all and from_s is not None and to_s is not None and
                 from_s.state == to_s.state):
@@ -11,8 +11,9 @@ from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
     ATTR_ATTRIBUTION, CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE,
     CONF_MONITORED_CONDITIONS, CONF_NAME, UNIT_UV_INDEX, CONF_SCAN_INTERVAL)
-from homeassistant.helpers.entity import Entity
-from homeassistant.util import Throttle
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity, DataUpdateCoordinator, UpdateFailed)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -189,7 +190,8 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
 })
 
 
-def setup_platform(hass, config, add_entities, discovery_info=None):
+async def async_setup_platform(
+        hass, config, async_add_entities, discovery_info=None):
     """Set up the Dark Sky sensor."""
     latitude = config.get(CONF_LATITUDE, hass.config.latitude)
     longitude = config.get(CONF_LONGITUDE, hass.config.longitude)
@@ -205,12 +207,18 @@ def setup_platform(hass, config, add_entities, discovery_info=None):
 
     forecast_data = DarkSkyData(
         api_key=config.get(CONF_API_KEY, None), latitude=latitude,
-        longitude=longitude, units=units, language=language, interval=interval)
-    forecast_data.update()
-    forecast_data.update_currently()
+        longitude=longitude, units=units, language=language)
+
+    # All sensors share one forecast request per interval. Note that Dark Sky
+    # will charge users for too many calls in 1 day.
+    coordinator = DataUpdateCoordinator(
+        hass, _LOGGER, name=DEFAULT_NAME, update_interval=interval,
+        update_method=forecast_data.update)
+
+    await coordinator.async_refresh()
 
     # If connection failed don't setup platform.
-    if forecast_data.data is None:
+    if not coordinator.last_update_success:
         return
 
     name = config.get(CONF_NAME)
@@ -223,28 +231,31 @@ def setup_platform(hass, config, add_entities, discovery_info=None):
             _LOGGER.warning("Monitored condition %s is deprecated", variable)
         if (not SENSOR_TYPES[variable][7] or
                 'currently' in SENSOR_TYPES[variable][7]):
-            sensors.append(DarkSkySensor(forecast_data, variable, name))
+            sensors.append(DarkSkySensor(coordinator, variable, name))
         if forecast is not None and 'daily' in SENSOR_TYPES[variable][7]:
             for forecast_day in forecast:
                 sensors.append(DarkSkySensor(
-                    forecast_data, variable, name, forecast_day=forecast_day))
+                    coordinator, variable, name, forecast_day=forecast_day))
         if forecast_hour is not None and 'hourly' in SENSOR_TYPES[variable][7]:
             for forecast_h in forecast_hour:
                 sensors.append(DarkSkySensor(
-                    forecast_data, variable, name, forecast_hour=forecast_h))
+                    coordinator, variable, name, forecast_hour=forecast_h))
 
-    add_entities(sensors, True)
+    for sensor in sensors:
+        sensor.update_from_forecast()
 
+    async_add_entities(sensors)
 
-class DarkSkySensor(Entity):
+
+class DarkSkySensor(CoordinatorEntity):
     """Implementation of a Dark Sky sensor."""
 
-    def __init__(self, forecast_data, sensor_type, name,
+    def __init__(self, coordinator, sensor_type, name,
                  forecast_day=None, forecast_hour=None):
         """Initialize the sensor."""
+        super().__init__(coordinator)
         self.client_name = name
         self._name = SENSOR_TYPES[sensor_type][0]
-        self.forecast_data = forecast_data
         self.type = sensor_type
         self.forecast_day = forecast_day
         self.forecast_hour = forecast_hour
@@ -274,6 +285,11 @@ class DarkSkySensor(Entity):
         """Return the unit of measurement of this entity, if any."""
         return self._unit_of_measurement
 
+    @property
+    def forecast_data(self):
+        """Return the forecast data shared by all sensors."""
+        return self.coordinator.data
+
     @property
     def unit_system(self):
         """Return the unit system of this entity."""
@@ -316,46 +332,44 @@ class DarkSkySensor(Entity):
             ATTR_ATTRIBUTION: ATTRIBUTION,
         }
 
-    def update(self):
-        """Get the latest data from Dark Sky and updates the states."""
-        # Call the API for new forecast data. Each sensor will re-trigger this
-        # same exact call, but that's fine. We cache results for a short period
-        # of time to prevent hitting API limits. Note that Dark Sky will
-        # charge users for too many calls in 1 day, so take care when updating.
-        self.forecast_data.update()
+    @callback
+    def _handle_coordinator_update(self):
+        """Update the state from the new forecast data."""
+        self.update_from_forecast()
+        super()._handle_coordinator_update()
+
+    def update_from_forecast(self):
+        """Update the state from the latest Dark Sky forecast data."""
+        if not self.coordinator.last_update_success:
+            return
+
         self.update_unit_of_measurement()
 
         if self.type == 'minutely_summary':
-            self.forecast_data.update_minutely()
             minutely = self.forecast_data.data_minutely
             self._state = getattr(minutely, 'summary', '')
             self._icon = getattr(minutely, 'icon', '')
         elif self.type == 'hourly_summary':
-            self.forecast_data.update_hourly()
             hourly = self.forecast_data.data_hourly
             self._state = getattr(hourly, 'summary', '')
             self._icon = getattr(hourly, 'icon', '')
         elif self.forecast_hour is not None:
-            self.forecast_data.update_hourly()
             hourly = self.forecast_data.data_hourly
             if hasattr(hourly, 'data'):
                 self._state = self.get_state(hourly.data[self.forecast_hour])
             else:
                 self._state = 0
         elif self.type == 'daily_summary':
-            self.forecast_data.update_daily()
             daily = self.forecast_data.data_daily
             self._state = getattr(daily, 'summary', '')
             self._icon = getattr(daily, 'icon', '')
         elif self.forecast_day is not None:
-            self.forecast_data.update_daily()
             daily = self.forecast_data.data_daily
             if hasattr(daily, 'data'):
                 self._state = self.get_state(daily.data[self.forecast_day])
             else:
                 self._state = 0
         else:
-            self.forecast_data.update_currently()
             currently = self.forecast_data.data_currently
             self._state = self.get_state(currently)
 
@@ -403,8 +417,7 @@ def convert_to_camel(data):
 class DarkSkyData:
     """Get the latest data from Darksky."""
 
-    def __init__(
-            self, api_key, latitude, longitude, units, language, interval):
+    def __init__(self, api_key, latitude, longitude, units, language):
         """Initialize the data object."""
         self._api_key = api_key
         self.latitude = latitude
@@ -419,14 +432,7 @@ class DarkSkyData:
         self.data_hourly = None
         self.data_daily = None
 
-        # Apply throttling to methods using configured interval
-        self.update = Throttle(interval)(self._update)
-        self.update_currently = Throttle(interval)(self._update_currently)
-        self.update_minutely = Throttle(interval)(self._update_minutely)
-        self.update_hourly = Throttle(interval)(self._update_hourly)
-        self.update_daily = Throttle(interval)(self._update_daily)
-
-    def _update(self):
+    def update(self):
         """Get the latest data from Dark Sky."""
         import forecastio
 
@@ -435,22 +441,12 @@ class DarkSkyData:
                 self._api_key, self.latitude, self.longitude, units=self.units,
                 lang=self.language)
         except (ConnectError, HTTPError, Timeout, ValueError) as error:
-            _LOGGER.error("Unable to connect to Dark Sky: %s", error)
-            self.data = None
-        self.unit_system = self.data and self.data.json['flags']['units']
+            raise UpdateFailed(
+                "Unable to connect to Dark Sky: {}".format(error))
 
-    def _update_currently(self):
-        """Update currently data."""
+        self.unit_system = self.data and self.data.json['flags']['units']
         self.data_currently = self.data and self.data.currently()
-
-    def _update_minutely(self):
-        """Update minutely data."""
         self.data_minutely = self.data and self.data.minutely()
-
-    def _update_hourly(self):
-        """Update hourly data."""
         self.data_hourly = self.data and self.data.hourly()
-
-    def _update_daily(self):
-        """Update daily data."""
         self.data_daily = self.data and self.data.daily()
+        return self
@@ -1,6 +1,6 @@
 """Allows the creation of a sensor that filters state property."""
 import logging
-import statistics
+import math
 from collections import deque, Counter
 from numbers import Number
 from functools import partial
@@ -20,6 +20,7 @@ from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_state_change
 from homeassistant.components import history
 import homeassistant.util.dt as dt_util
+from homeassistant.util.rolling import RollingStatistics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -402,11 +403,15 @@ class OutlierFilter(Filter):
         self._radius = radius
         self._stats_internal = Counter()
         self._store_raw = True
+        self._window = RollingStatistics()
 
     def _filter_state(self, new_state):
         """Implement the outlier filter."""
-        median = statistics.median([s.state for s in self.states]) \
-            if self.states else 0
+        raw_state = new_state.state
+        if not isinstance(raw_state, Number) or not math.isfinite(raw_state):
+            # Can't be ordered in, or removed from, the rolling window
+            raise ValueError
+        median = self._window.median if self.states else 0
         if (len(self.states) == self.states.maxlen and
                 abs(new_state.state - median) >
                 self._radius):
@@ -417,6 +422,11 @@ class OutlierFilter(Filter):
                           self._stats_internal['erasures'],
                           self._entity, new_state)
             new_state.state = median
+
+        # Mirror the raw window that filter_state is about to update
+        if len(self.states) == self.states.maxlen:
+            self._window.remove(self.states[0].state)
+        self._window.add(raw_state)
         return new_state
 
 
@@ -463,28 +473,52 @@ class TimeSMAFilter(Filter):
         self._time_window = window_size
         self.last_leak = None
         self.queue = deque()
+        # Time weighted sum of the segments between the queued states
+        self._area = 0
+        self._leaks = 0
 
     def _leak(self, left_boundary):
         """Remove timeouted elements."""
         while self.queue:
             if self.queue[0].timestamp + self._time_window <= left_boundary:
                 self.last_leak = self.queue.popleft()
+                if self.queue:
+                    self._area -= self._segment(self.last_leak,
+                                                self.queue[0])
+                    self._leaks += 1
             else:
-                return
+                break
+
+        # Keep floating point drift of the running sum in check
+        if self._leaks >= len(self.queue):
+            self._resync()
+
+    def _resync(self):
+        """Recompute the time weighted sum exactly from the queue."""
+        self._area = math.fsum(
+            self._segment(self.queue[index - 1], self.queue[index])
+            for index in range(1, len(self.queue)))
+        self._leaks = 0
+
+    @staticmethod
+    def _segment(prev_state, state):
+        """Return the time weighted value between two states."""
+        return (state.timestamp - prev_state.timestamp).total_seconds() \
+            * prev_state.state
 
     def _filter_state(self, new_state):
         """Implement the Simple Moving Average filter."""
         self._leak(new_state.timestamp)
+        if self.queue:
+            self._area += self._segment(self.queue[-1], new_state)
+        else:
+            self._area = 0
         self.queue.append(copy(new_state))
 
-        moving_sum = 0
         start = new_state.timestamp - self._time_window
         prev_state = self.last_leak or self.queue[0]
-        for state in self.queue:
-            moving_sum += (state.timestamp-start).total_seconds()\
-                          * prev_state.state
-            start = state.timestamp
-            prev_state = state
+        moving_sum = (self.queue[0].timestamp - start).total_seconds() \
+            * prev_state.state + self._area
 
         new_state.state = moving_sum / self._time_window.total_seconds()
 
@@ -1,15 +1,17 @@
 """Provide the functionality to group entities."""
 import asyncio
+from collections import OrderedDict
 import logging
 
 import voluptuous as vol
 
-from homeassistant import core as ha
+from homeassistant import config as conf_util, core as ha
 from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_ICON, CONF_NAME, STATE_CLOSED, STATE_HOME,
     STATE_NOT_HOME, STATE_OFF, STATE_ON, STATE_OPEN, STATE_LOCKED,
     STATE_UNLOCKED, STATE_OK, STATE_PROBLEM, STATE_UNKNOWN,
-    ATTR_ASSUMED_STATE, SERVICE_RELOAD, ATTR_NAME, ATTR_ICON)
+    ATTR_ASSUMED_STATE, SERVICE_RELOAD, ATTR_NAME, ATTR_ICON,
+    EVENT_STATE_CHANGED)
 from homeassistant.core import callback
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
@@ -21,6 +23,7 @@ from homeassistant.util.async_ import run_coroutine_threadsafe
 from .reproduce_state import async_reproduce_states  # noqa
 
 DOMAIN = 'group'
+DATA_EXPAND_CACHE = 'group_expand_cache'
 
 ENTITY_ID_FORMAT = DOMAIN + '.{}'
 
@@ -128,35 +131,49 @@ def expand_entity_ids(hass, entity_ids):
     Async friendly.
     """
     found_ids = []
+    seen = set()
+    cache = hass.data.get(DATA_EXPAND_CACHE)
+
     for entity_id in entity_ids:
         if not isinstance(entity_id, str):
             continue
 
         entity_id = entity_id.lower()
 
-        try:
-            # If entity_id points at a group, expand it
-            domain, _ = ha.split_entity_id(entity_id)
+        if ha.split_entity_id(entity_id)[0] != DOMAIN:
+            expanded = (entity_id,)
+        elif cache is not None and entity_id in cache:
+            expanded = cache[entity_id]
+        else:
+            expanded = tuple(_expand_group(hass, entity_id, {entity_id}))
+            if cache is not None:
+                cache[entity_id] = expanded
 
-            if domain == DOMAIN:
-                child_entities = get_entity_ids(hass, entity_id)
-                if entity_id in child_entities:
-                    child_entities = list(child_entities)
-                    child_entities.remove(entity_id)
-                found_ids.extend(
-                    ent_id for ent_id
-                    in expand_entity_ids(hass, child_entities)
-                    if ent_id not in found_ids)
+        for ent_id in expanded:
+            if ent_id not in seen:
+                seen.add(ent_id)
+                found_ids.append(ent_id)
 
-            else:
-                if entity_id not in found_ids:
-                    found_ids.append(entity_id)
+    return found_ids
 
-        except AttributeError:
-            # Raised by split_entity_id if entity_id is not a string
-            pass
 
-    return found_ids
+def _expand_group(hass, group_id, expanding):
+    """Return the members of a group with nested groups expanded.
+
+    Groups in expanding are already being expanded and are skipped, so
+    groups that contain themselves don't recurse forever.
+    """
+    for entity_id in get_entity_ids(hass, group_id):
+        entity_id = entity_id.lower()
+
+        if entity_id in expanding:
+            continue
+
+        if ha.split_entity_id(entity_id)[0] == DOMAIN:
+            yield from _expand_group(
+                hass, entity_id, expanding | {entity_id})
+        else:
+            yield entity_id
 
 
 @bind_hass
@@ -187,19 +204,35 @@ async def async_setup(hass, config):
     if component is None:
         component = hass.data[DOMAIN] = EntityComponent(_LOGGER, DOMAIN, hass)
 
+    if DATA_EXPAND_CACHE not in hass.data:
+        hass.data[DATA_EXPAND_CACHE] = {}
+
+        @callback
+        def invalidate_expand_cache(event):
+            """Drop the expanded groups when group members change."""
+            if not event.data['entity_id'].startswith(DOMAIN + '.'):
+                return
+
+            old_state = event.data.get('old_state')
+            new_state = event.data.get('new_state')
+            if old_state is None or new_state is None or \
+                    old_state.attributes.get(ATTR_ENTITY_ID) != \
+                    new_state.attributes.get(ATTR_ENTITY_ID):
+                # Replace instead of clearing so an expansion that is being
+                # computed in a worker thread ends up in the old cache.
+                hass.data[DATA_EXPAND_CACHE] = {}
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, invalidate_expand_cache)
+
     await _async_process_config(hass, config, component)
 
     async def reload_service_handler(service):
-        """Remove all user-defined groups and load new ones from config."""
-        auto = list(filter(lambda e: not e.user_defined, component.entities))
-
-        conf = await component.async_prepare_reload()
+        """Reload the user-defined groups that changed in the config."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         await _async_process_config(hass, conf, component)
 
-        await component.async_add_entities(auto)
-
     hass.services.async_register(
         DOMAIN, SERVICE_RELOAD, reload_service_handler,
         schema=RELOAD_SERVICE_SCHEMA)
@@ -316,8 +349,51 @@ async def async_setup(hass, config):
 
 
 async def _async_process_config(hass, config, component):
-    """Process group configuration."""
-    for object_id, conf in config.get(DOMAIN, {}).items():
+    """Process group configuration.
+
+    User-defined groups whose config did not change are kept, the others are
+    removed and created again. The orders the user-defined groups had are
+    given out again in the order of the config, so reordering the config
+    reorders the groups. Additional groups are ordered after all groups.
+    """
+    configs = OrderedDict(
+        (object_id, (conf, conf_util.config_key([object_id, conf])))
+        for object_id, conf in config.get(DOMAIN, {}).items())
+    keys = set(key for _, key in configs.values() if key is not None)
+    unchanged = {}
+    orders = []
+    next_order = 0
+
+    for group in list(component.entities):
+        if group.order is not None:
+            next_order = max(next_order, group.order + 1)
+        if not group.user_defined:
+            continue
+        if group.order is not None:
+            orders.append(group.order)
+        if group.config_key in keys and group.config_key not in unchanged:
+            unchanged[group.config_key] = group
+        else:
+            await component.async_remove_entity(group.entity_id)
+
+    orders.sort()
+
+    for position, (object_id, (conf, key)) in enumerate(configs.items()):
+        if position < len(orders):
+            order = orders[position]
+        elif next_order:
+            order = next_order
+            next_order += 1
+        else:
+            order = None
+
+        group = unchanged.get(key)
+        if group is not None:
+            if group.order != order:
+                group.order = order
+                await group.async_update_ha_state()
+            continue
+
         name = conf.get(CONF_NAME, object_id)
         entity_ids = conf.get(CONF_ENTITIES) or []
         icon = conf.get(CONF_ICON)
@@ -327,9 +403,10 @@ async def _async_process_config(hass, config, component):
 
         # Don't create tasks and await them all. The order is important as
         # groups get a number based on creation order.
-        await Group.async_create_group(
+        group = await Group.async_create_group(
             hass, name, entity_ids, icon=icon, view=view,
-            control=control, object_id=object_id, mode=mode)
+            control=control, object_id=object_id, mode=mode, order=order)
+        group.config_key = key
 
 
 class Group(Entity):
@@ -356,6 +433,7 @@ class Group(Entity):
         self.visible = visible
         self.control = control
         self.user_defined = user_defined
+        self.config_key = None
         self.mode = any
         if mode:
             self.mode = all
@@ -366,26 +444,31 @@ class Group(Entity):
     @staticmethod
     def create_group(hass, name, entity_ids=None, user_defined=True,
                      visible=True, icon=None, view=False, control=None,
-                     object_id=None, mode=None):
+                     object_id=None, mode=None, order=None):
         """Initialize a group."""
         return run_coroutine_threadsafe(
             Group.async_create_group(
                 hass, name, entity_ids, user_defined, visible, icon, view,
-                control, object_id, mode),
+                control, object_id, mode, order),
             hass.loop).result()
 
     @staticmethod
     async def async_create_group(hass, name, entity_ids=None,
                                  user_defined=True, visible=True, icon=None,
                                  view=False, control=None, object_id=None,
-                                 mode=None):
+                                 mode=None, order=None):
         """Initialize a group.
 
+        Without an order, the group is ordered after the existing groups.
+
         This method must be run in the event loop.
         """
+        if order is None:
+            order = len(hass.states.async_entity_ids(DOMAIN))
+
         group = Group(
             hass, name,
-            order=len(hass.states.async_entity_ids(DOMAIN)),
+            order=order,
             visible=visible, icon=icon, view=view, control=control,
             user_defined=user_defined, entity_ids=entity_ids, mode=mode
         )
@@ -404,6 +487,16 @@ class Group(Entity):
 
         return group
 
+    @property
+    def order(self):
+        """Return the order of the group."""
+        return self._order
+
+    @order.setter
+    def order(self, order):
+        """Set the order of the group."""
+        self._order = order
+
     @property
     def should_poll(self):
         """No need to poll because groups will update themselves."""
@@ -13,6 +13,7 @@ import homeassistant.util.dt as dt_util
 from homeassistant.components import recorder, script
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import ATTR_HIDDEN
+from homeassistant.core import POOL_HISTORY
 from homeassistant.components.recorder.util import session_scope, execute
 import homeassistant.helpers.config_validation as cv
 
@@ -306,9 +307,10 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app['hass']
 
-        result = await hass.async_add_job(
+        result = await hass.async_add_executor_job(
             get_significant_states, hass, start_time, end_time,
-            entity_ids, self.filters, include_start_time_state)
+            entity_ids, self.filters, include_start_time_state,
+            pool=POOL_HISTORY)
         result = list(result.values())
         if _LOGGER.isEnabledFor(logging.DEBUG):
             elapsed = time.perf_counter() - timer_start
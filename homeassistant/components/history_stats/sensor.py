@@ -1,4 +1,5 @@
 """Component to make instant statistics about your history."""
+from collections import deque
 import datetime
 import logging
 import math
@@ -98,15 +99,34 @@ class HistoryStatsSensor(Entity):
         self._unit_of_measurement = UNITS[sensor_type]
 
         self._period = (datetime.datetime.now(), datetime.datetime.now())
+        # If the end of the period is in the past, not now()
+        self._period_ended = False
         self.value = None
         self.count = None
 
+        # Running totals, seeded from the recorder and then kept up to date
+        # from state changes of the tracked entity.
+        self._seed_start = None
+        self._last_state = False
+        self._last_time = None
+        self._elapsed = 0
+        self._count = 0
+        # (timestamp, matches entity_state) of changes not yet folded in
+        self._pending_changes = deque()
+
         @callback
         def start_refresh(*args):
             """Register state tracking."""
             @callback
-            def force_refresh(*args):
-                """Force the component to refresh."""
+            def force_refresh(entity_id=None, old_state=None,
+                              new_state=None):
+                """Record the state change and refresh the component."""
+                if new_state is not None and (
+                        old_state is None or
+                        old_state.state != new_state.state):
+                    self._pending_changes.append((
+                        new_state.last_changed.timestamp(),
+                        new_state.state == self._entity_state))
                 self.async_schedule_update_ha_state(True)
 
             force_refresh()
@@ -184,19 +204,43 @@ class HistoryStatsSensor(Entity):
         p_end_timestamp = math.floor(dt_util.as_timestamp(p_end))
         now_timestamp = math.floor(dt_util.as_timestamp(now))
 
-        # If period has not changed and current time after the period end...
+        # If period has not changed, current time after the period end and
+        # no state change happened since the last update...
         if start_timestamp == p_start_timestamp and \
             end_timestamp == p_end_timestamp and \
-                end_timestamp <= now_timestamp:
+                end_timestamp <= now_timestamp and \
+                not self._pending_changes:
             # Don't compute anything as the value cannot have changed
             return
 
+        # Only query the recorder when the period start moved or on the
+        # first update, otherwise fold in the live state changes.
+        if self._last_time is None or start_timestamp != self._seed_start:
+            if not self._seed_from_history(start, end, start_timestamp):
+                return
+
+        self._fold_pending_changes(dt_util.as_timestamp(end))
+
+        elapsed = self._elapsed
+        # Count time elapsed between last state change and end of measure
+        if self._last_state:
+            measure_end = min(end_timestamp, now_timestamp)
+            elapsed += max(measure_end - self._last_time, 0)
+
+        # Save value in hours
+        self.value = elapsed / 3600
+
+        # Save counter
+        self.count = self._count
+
+    def _seed_from_history(self, start, end, start_timestamp):
+        """Compute the running totals for the period from the recorder."""
         # Get history between start and end
         history_list = history.state_changes_during_period(
             self.hass, start, end, str(self._entity_id))
 
         if self._entity_id not in history_list.keys():
-            return
+            return False
 
         # Get the first state
         last_state = history.get_state(self.hass, start, self._entity_id)
@@ -219,21 +263,48 @@ class HistoryStatsSensor(Entity):
             last_state = current_state
             last_time = current_time
 
-        # Count time elapsed between last history state and end of measure
-        if last_state:
-            measure_end = min(end_timestamp, now_timestamp)
-            elapsed += measure_end - last_time
+        self._seed_start = start_timestamp
+        self._last_state = last_state
+        self._last_time = last_time
+        self._elapsed = elapsed
+        self._count = count
+        return True
 
-        # Save value in hours
-        self.value = elapsed / 3600
+    def _fold_pending_changes(self, end_timestamp):
+        """Add state changes seen since the last update to the totals.
 
-        # Save counter
-        self.count = count
+        Changes after the end of the period are kept for the next update,
+        unless the period ended before now.
+        """
+        while self._pending_changes:
+            current_time, current_state = self._pending_changes[0]
+
+            if current_time > end_timestamp:
+                if not self._period_ended:
+                    break
+                self._pending_changes.clear()
+                return
+
+            self._pending_changes.popleft()
+
+            # Already part of the recorder history
+            if current_time <= self._last_time:
+                continue
+
+            if self._last_state:
+                self._elapsed += current_time - self._last_time
+            if current_state and not self._last_state:
+                self._count += 1
+
+            self._last_state = current_state
+            self._last_time = current_time
 
     def update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
         start = None
         end = None
+        # Before rendering, so an end of now() is never in the past
+        render_time = dt_util.now()
 
         # Parse start
         if self._start is not None:
@@ -283,6 +354,8 @@ class HistoryStatsSensor(Entity):
             end = dt_util.now()
 
         self._period = start, end
+        # Timestamps are rounded down to the second
+        self._period_ended = end < render_time - datetime.timedelta(seconds=1)
 
 
 class HistoryStatsHelper:
@@ -1,22 +1,116 @@
 """Static file handling for HTTP component."""
+import mimetypes
 from pathlib import Path
+from time import monotonic
 
 from aiohttp import hdrs
-from aiohttp.web import FileResponse
+from aiohttp.web import FileResponse, Response
 from aiohttp.web_exceptions import HTTPNotFound, HTTPForbidden
 from aiohttp.web_urldispatcher import StaticResource
 
 CACHE_TIME = 31 * 86400  # = 1 month
 CACHE_HEADERS = {hdrs.CACHE_CONTROL: "public, max-age={}".format(CACHE_TIME)}
 
+# How long resolved paths and file stats are used before checking again
+STAT_CACHE_TIME = 60
+
+# Precompressed variants of a file, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _etag(path, encoding=None):
+    """Return a strong ETag for a file."""
+    stat = path.stat()
+    return '"{:x}-{:x}{}"'.format(
+        stat.st_mtime_ns, stat.st_size,
+        '-{}'.format(encoding) if encoding else '')
+
+
+def _accepted_encodings(request):
+    """Return the content encodings a client accepts."""
+    accepted = set()
+    for part in request.headers.get(hdrs.ACCEPT_ENCODING, '').split(','):
+        coding, _, params = part.partition(';')
+        params = params.replace(' ', '')
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _etag_matches(request, etag):
+    """Return if the request has an If-None-Match header matching an ETag."""
+    if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+    if if_none_match is None:
+        return False
+    for tag in if_none_match.split(','):
+        if tag.strip() in ('*', etag, 'W/' + etag):
+            return True
+    return False
+
 
 # https://github.com/PyCQA/astroid/issues/633
 # pylint: disable=duplicate-bases
 class CachingStaticResource(StaticResource):
-    """Static Resource handler that will add cache headers."""
+    """Static Resource handler that will add cache headers.
+
+    Precompressed .br and .gz siblings of a file are served to clients that
+    accept them. Requests with a matching ETag are answered with a 304.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the static resource."""
+        super().__init__(*args, **kwargs)
+        # filename -> (time checked, content type, variants of the file)
+        self._file_cache = {}
 
     async def _handle(self, request):
         rel_url = request.match_info['filename']
+        cached = self._file_cache.get(rel_url)
+
+        if cached is None or monotonic() - cached[0] > STAT_CACHE_TIME:
+            filepath = self._resolve(request, rel_url)
+
+            # on opening a dir, load its contents if allowed
+            if filepath.is_dir():
+                return await super()._handle(request)
+            if not filepath.is_file():
+                self._file_cache.pop(rel_url, None)
+                raise HTTPNotFound
+
+            cached = self._file_cache[rel_url] = (
+                monotonic(),
+                mimetypes.guess_type(str(filepath))[0] or
+                'application/octet-stream',
+                self._variants(filepath))
+
+        _, content_type, variants = cached
+        accepted = _accepted_encodings(request)
+        encoding, filepath, etag = next(
+            variant for variant in variants
+            if variant[0] is None or variant[0] in accepted)
+
+        headers = dict(CACHE_HEADERS)
+        headers[hdrs.ETAG] = etag
+        if len(variants) > 1:
+            headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+
+        if _etag_matches(request, etag):
+            return Response(status=304, headers=headers)
+
+        headers[hdrs.CONTENT_TYPE] = content_type
+        if encoding is not None:
+            headers[hdrs.CONTENT_ENCODING] = encoding
+
+        return FileResponse(
+            filepath, chunk_size=self._chunk_size, headers=headers)
+
+    def _resolve(self, request, rel_url):
+        """Resolve the path of a file in the static directory."""
         try:
             filename = Path(rel_url)
             if filename.anchor:
@@ -34,11 +128,15 @@ class CachingStaticResource(StaticResource):
             # perm error or other kind!
             request.app.logger.exception(error)
             raise HTTPNotFound() from error
+        return filepath
 
-        # on opening a dir, load its contents if allowed
-        if filepath.is_dir():
-            return await super()._handle(request)
-        if filepath.is_file():
-            return FileResponse(
-                filepath, chunk_size=self._chunk_size, headers=CACHE_HEADERS)
-        raise HTTPNotFound
+    @staticmethod
+    def _variants(filepath):
+        """Return the precompressed variants and the file itself."""
+        variants = []
+        for encoding, suffix in ENCODINGS:
+            path = filepath.with_name(filepath.name + suffix)
+            if path.is_file():
+                variants.append((encoding, path, _etag(path, encoding)))
+        variants.append((None, filepath, _etag(filepath)))
+        return variants
@@ -2,6 +2,7 @@
 import asyncio
 from datetime import timedelta
 import logging
+from time import monotonic
 
 import voluptuous as vol
 
@@ -35,6 +36,8 @@ ATTR_FACES = 'faces'
 ATTR_GENDER = 'gender'
 ATTR_GLASSES = 'glasses'
 ATTR_MOTION = 'motion'
+ATTR_PROCESSING_FPS = 'processing_fps'
+ATTR_PROCESSING_TIME = 'processing_time'
 ATTR_TOTAL_FACES = 'total_faces'
 
 CONF_SOURCE = 'source'
@@ -91,6 +94,10 @@ class ImageProcessingEntity(Entity):
 
     timeout = DEFAULT_TIMEOUT
 
+    # Frame processing bookkeeping, maintained by async_update
+    _frames_processed = 0
+    _processing_time = None
+
     @property
     def camera_entity(self):
         """Return camera entity id from process pictures."""
@@ -101,6 +108,31 @@ class ImageProcessingEntity(Entity):
         """Return minimum confidence for do some things."""
         return None
 
+    @property
+    def processing_time(self):
+        """Return seconds spent processing the last frame."""
+        return self._processing_time
+
+    @property
+    def frames_processed(self):
+        """Return number of frames processed since start."""
+        return self._frames_processed
+
+    @property
+    def state_attributes(self):
+        """Return the processing time of the last frame."""
+        if self._processing_time is None:
+            return None
+
+        fps = None
+        if self._processing_time:
+            fps = round(1 / self._processing_time, 2)
+
+        return {
+            ATTR_PROCESSING_TIME: round(self._processing_time, 3),
+            ATTR_PROCESSING_FPS: fps,
+        }
+
     def process_image(self, image):
         """Process image."""
         raise NotImplementedError()
@@ -129,7 +161,10 @@ class ImageProcessingEntity(Entity):
             return
 
         # process image data
+        start = monotonic()
         await self.async_process_image(image.content)
+        self._processing_time = monotonic() - start
+        self._frames_processed += 1
 
 
 class ImageProcessingFaceEntity(ImageProcessingEntity):
@@ -173,10 +208,9 @@ class ImageProcessingFaceEntity(ImageProcessingEntity):
     @property
     def state_attributes(self):
         """Return device specific state attributes."""
-        attr = {
-            ATTR_FACES: self.faces,
-            ATTR_TOTAL_FACES: self.total_faces,
-        }
+        attr = super().state_attributes or {}
+        attr[ATTR_FACES] = self.faces
+        attr[ATTR_TOTAL_FACES] = self.total_faces
 
         return attr
 
@@ -94,10 +94,9 @@ class ImageProcessingAlprEntity(ImageProcessingEntity):
     @property
     def state_attributes(self):
         """Return device specific state attributes."""
-        attr = {
-            ATTR_PLATES: self.plates,
-            ATTR_VEHICLES: self.vehicles
-        }
+        attr = super().state_attributes or {}
+        attr[ATTR_PLATES] = self.plates
+        attr[ATTR_VEHICLES] = self.vehicles
 
         return attr
 
@@ -135,10 +135,11 @@ class OpenCVImageProcessor(ImageProcessingEntity):
     @property
     def state_attributes(self):
         """Return device specific state attributes."""
-        return {
-            ATTR_MATCHES: self._matches,
-            ATTR_TOTAL_MATCHES: self._total_matches
-        }
+        attr = super().state_attributes or {}
+        attr[ATTR_MATCHES] = self._matches
+        attr[ATTR_TOTAL_MATCHES] = self._total_matches
+
+        return attr
 
     def process_image(self, image):
         """Process the image."""
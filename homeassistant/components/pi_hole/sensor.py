@@ -10,8 +10,8 @@ from homeassistant.const import (
 from homeassistant.exceptions import PlatformNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.entity import Entity
-from homeassistant.util import Throttle
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity, DataUpdateCoordinator, UpdateFailed)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -75,26 +75,40 @@ async def async_setup_platform(
     verify_tls = config.get(CONF_VERIFY_SSL)
 
     session = async_get_clientsession(hass, verify_tls)
-    pi_hole = PiHoleData(Hole(
-        host, hass.loop, session, location=location, tls=use_tls))
+    api = Hole(host, hass.loop, session, location=location, tls=use_tls)
 
-    await pi_hole.async_update()
+    async def async_update_data():
+        """Get the latest data from the Pi-hole."""
+        from hole.exceptions import HoleError
+
+        try:
+            await api.get_data()
+        except HoleError as err:
+            raise UpdateFailed(
+                "Unable to fetch data from Pi-hole: {}".format(err))
+        return api.data
 
-    if pi_hole.api.data is None:
+    coordinator = DataUpdateCoordinator(
+        hass, _LOGGER, name=name, update_interval=MIN_TIME_BETWEEN_UPDATES,
+        update_method=async_update_data)
+
+    await coordinator.async_refresh()
+
+    if coordinator.data is None:
         raise PlatformNotReady
 
-    sensors = [PiHoleSensor(pi_hole, name, condition)
+    sensors = [PiHoleSensor(coordinator, name, condition)
                for condition in config[CONF_MONITORED_CONDITIONS]]
 
-    async_add_entities(sensors, True)
+    async_add_entities(sensors)
 
 
-class PiHoleSensor(Entity):
+class PiHoleSensor(CoordinatorEntity):
     """Representation of a Pi-hole sensor."""
 
-    def __init__(self, pi_hole, name, condition):
+    def __init__(self, coordinator, name, condition):
         """Initialize a Pi-hole sensor."""
-        self.pi_hole = pi_hole
+        super().__init__(coordinator)
         self._name = name
         self._condition = condition
 
@@ -102,7 +116,6 @@ class PiHoleSensor(Entity):
         self._condition_name = variable_info[0]
         self._unit_of_measurement = variable_info[1]
         self._icon = variable_info[2]
-        self.data = {}
 
     @property
     def name(self):
@@ -135,32 +148,6 @@ class PiHoleSensor(Entity):
         }
 
     @property
-    def available(self):
-        """Could the device be accessed during the last update call."""
-        return self.pi_hole.available
-
-    async def async_update(self):
-        """Get the latest data from the Pi-hole API."""
-        await self.pi_hole.async_update()
-        self.data = self.pi_hole.api.data
-
-
-class PiHoleData:
-    """Get the latest data and update the states."""
-
-    def __init__(self, api):
-        """Initialize the data object."""
-        self.api = api
-        self.available = True
-
-    @Throttle(MIN_TIME_BETWEEN_UPDATES)
-    async def async_update(self):
-        """Get the latest data from the Pi-hole."""
-        from hole.exceptions import HoleError
-
-        try:
-            await self.api.get_data()
-            self.available = True
-        except HoleError:
-            _LOGGER.error("Unable to fetch data from Pi-hole")
-            self.available = False
+    def data(self):
+        """Return the latest data of the Pi-hole."""
+        return self.coordinator.data
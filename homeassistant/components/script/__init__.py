@@ -4,16 +4,18 @@ import logging
 
 import voluptuous as vol
 
+from homeassistant import config as conf_util
 from homeassistant.const import (
     ATTR_ENTITY_ID, SERVICE_TURN_OFF, SERVICE_TURN_ON,
-    SERVICE_TOGGLE, SERVICE_RELOAD, STATE_ON, CONF_ALIAS,
+    SERVICE_TOGGLE, SERVICE_RELOAD, STATE_ON, CONF_ALIAS, CONF_MODE,
     EVENT_SCRIPT_STARTED, ATTR_NAME)
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
 import homeassistant.helpers.config_validation as cv
 
-from homeassistant.helpers.script import Script
+from homeassistant.helpers.script import (
+    CONF_MAX, DEFAULT_MAX_RUNS, RUN_MODE_LEGACY, SCRIPT_MODE_SCHEMA, Script)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +34,7 @@ GROUP_NAME_ALL_SCRIPTS = 'all scripts'
 SCRIPT_ENTRY_SCHEMA = vol.Schema({
     CONF_ALIAS: cv.string,
     vol.Required(CONF_SEQUENCE): cv.SCRIPT_SCHEMA,
+    **SCRIPT_MODE_SCHEMA,
 })
 
 CONFIG_SCHEMA = vol.Schema({
@@ -60,8 +63,8 @@ async def async_setup(hass, config):
     await _async_process_config(hass, config, component)
 
     async def reload_service(service):
-        """Call a service to reload scripts."""
-        conf = await component.async_prepare_reload()
+        """Call a service to reload the scripts that changed."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
 
@@ -102,22 +105,38 @@ async def async_setup(hass, config):
 
 
 async def _async_process_config(hass, config, component):
-    """Process script configuration."""
+    """Process script configuration.
+
+    Scripts whose config did not change are kept, the others are removed
+    and created again.
+    """
     async def service_handler(service):
         """Execute a service call to script.<script name>."""
         entity_id = ENTITY_ID_FORMAT.format(service.service)
         script = component.get_entity(entity_id)
-        if script.is_on:
+        if script.is_on and script.script.run_mode == RUN_MODE_LEGACY:
             _LOGGER.warning("Script %s already running.", entity_id)
             return
         await script.async_turn_on(variables=service.data,
                                    context=service.context)
 
+    configs = {object_id: (cfg, conf_util.config_key(cfg))
+               for object_id, cfg in config.get(DOMAIN, {}).items()}
+
+    for script in list(component.entities):
+        if script.object_id not in configs or \
+                script.config_key is None or \
+                script.config_key != configs[script.object_id][1]:
+            await component.async_remove_entity(script.entity_id)
+        else:
+            del configs[script.object_id]
+
     scripts = []
 
-    for object_id, cfg in config.get(DOMAIN, {}).items():
+    for object_id, (cfg, cfg_key) in configs.items():
         alias = cfg.get(CONF_ALIAS, object_id)
-        script = ScriptEntity(hass, object_id, alias, cfg[CONF_SEQUENCE])
+        script = ScriptEntity(hass, object_id, alias, cfg[CONF_SEQUENCE],
+                              cfg[CONF_MODE], cfg[CONF_MAX], cfg_key)
         scripts.append(script)
         hass.services.async_register(
             DOMAIN, object_id, service_handler, schema=SCRIPT_SERVICE_SCHEMA)
@@ -128,11 +147,15 @@ async def _async_process_config(hass, config, component):
 class ScriptEntity(ToggleEntity):
     """Representation of a script entity."""
 
-    def __init__(self, hass, object_id, name, sequence):
+    def __init__(self, hass, object_id, name, sequence,
+                 run_mode=RUN_MODE_LEGACY, max_runs=DEFAULT_MAX_RUNS,
+                 config_key=None):
         """Initialize the script."""
+        self.config_key = config_key
         self.object_id = object_id
         self.entity_id = ENTITY_ID_FORMAT.format(object_id)
-        self.script = Script(hass, sequence, name, self.async_update_ha_state)
+        self.script = Script(hass, sequence, name, self.async_update_ha_state,
+                             run_mode, max_runs)
 
     @property
     def should_poll(self):
@@ -1,7 +1,8 @@
 """Support for statistics for sensor values."""
 import logging
-import statistics
-from collections import deque
+import math
+from collections import defaultdict, deque
+from operator import itemgetter
 
 import voluptuous as vol
 
@@ -14,7 +15,8 @@ from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_state_change
 from homeassistant.util import dt as dt_util
-from homeassistant.components.recorder.util import session_scope, execute
+from homeassistant.util.rolling import RollingStatistics
+from homeassistant.components.recorder.util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,11 +39,16 @@ CONF_SAMPLING_SIZE = 'sampling_size'
 CONF_MAX_AGE = 'max_age'
 CONF_PRECISION = 'precision'
 
+DATA_PENDING_INITIALIZE = 'statistics_pending_initialize'
+
 DEFAULT_NAME = 'Stats'
 DEFAULT_SIZE = 20
 DEFAULT_PRECISION = 2
 ICON = 'mdi:calculator'
 
+# Entity ids per bulk query, keeps the compound select within database limits
+INITIALIZE_QUERY_CHUNK_SIZE = 100
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Required(CONF_ENTITY_ID): cv.entity_id,
     vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
@@ -86,6 +93,7 @@ class StatisticsSensor(Entity):
         self._unit_of_measurement = None
         self.states = deque(maxlen=self._sampling_size)
         self.ages = deque(maxlen=self._sampling_size)
+        self._stats = RollingStatistics()
 
         self.count = 0
         self.mean = self.median = self.stdev = self.variance = None
@@ -115,28 +123,36 @@ class StatisticsSensor(Entity):
 
             if 'recorder' in self.hass.config.components:
                 # Only use the database if it's configured
-                self.hass.async_create_task(
-                    self._async_initialize_from_database()
-                )
+                _async_schedule_initialize_from_database(self.hass, self)
 
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_START, async_stats_sensor_startup)
 
     def _add_state_to_queue(self, new_state):
         """Add the state to the queue."""
-        if new_state.state == STATE_UNKNOWN:
+        self._add_to_queue(new_state.state, new_state.last_updated)
+
+    def _add_to_queue(self, state, last_updated):
+        """Add a raw state value and its update time to the queue."""
+        if state == STATE_UNKNOWN:
             return
 
         try:
             if self.is_binary:
-                self.states.append(new_state.state)
+                self.states.append(state)
             else:
-                self.states.append(float(new_state.state))
-
-            self.ages.append(new_state.last_updated)
+                value = float(state)
+                if not math.isfinite(value):
+                    raise ValueError
+                if len(self.states) == self.states.maxlen:
+                    self._stats.remove(self.states[0])
+                self.states.append(value)
+                self._stats.add(value)
+
+            self.ages.append(last_updated)
         except ValueError:
             _LOGGER.error("%s: parsing error, expected number and received %s",
-                          self.entity_id, new_state.state)
+                          self.entity_id, state)
 
     @property
     def name(self):
@@ -197,7 +213,9 @@ class StatisticsSensor(Entity):
                           self.entity_id, dt_util.as_local(self.ages[0]),
                           (now - self.ages[0]))
             self.ages.popleft()
-            self.states.popleft()
+            value = self.states.popleft()
+            if not self.is_binary:
+                self._stats.remove(value)
 
     async def async_update(self):
         """Get the latest data and updates the states."""
@@ -208,28 +226,26 @@ class StatisticsSensor(Entity):
         self.count = len(self.states)
 
         if not self.is_binary:
-            try:  # require only one data point
-                self.mean = round(statistics.mean(self.states),
-                                  self._precision)
-                self.median = round(statistics.median(self.states),
-                                    self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            stats = self._stats
+
+            if stats.mean is not None:  # require only one data point
+                self.mean = round(stats.mean, self._precision)
+                self.median = round(stats.median, self._precision)
+            else:
+                _LOGGER.debug("%s: no data points", self.entity_id)
                 self.mean = self.median = STATE_UNKNOWN
 
-            try:  # require at least two data points
-                self.stdev = round(statistics.stdev(self.states),
-                                   self._precision)
-                self.variance = round(statistics.variance(self.states),
-                                      self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            if stats.variance is not None:  # require at least two data points
+                self.stdev = round(stats.stdev, self._precision)
+                self.variance = round(stats.variance, self._precision)
+            else:
+                _LOGGER.debug("%s: less than two data points", self.entity_id)
                 self.stdev = self.variance = STATE_UNKNOWN
 
             if self.states:
-                self.total = round(sum(self.states), self._precision)
-                self.min = round(min(self.states), self._precision)
-                self.max = round(max(self.states), self._precision)
+                self.total = round(stats.total, self._precision)
+                self.min = round(stats.min, self._precision)
+                self.max = round(stats.max, self._precision)
 
                 self.min_age = self.ages[0]
                 self.max_age = self.ages[-1]
@@ -256,41 +272,126 @@ class StatisticsSensor(Entity):
                 self.change = self.average_change = STATE_UNKNOWN
                 self.change_rate = STATE_UNKNOWN
 
-    async def _async_initialize_from_database(self):
-        """Initialize the list of states from the database.
+    @property
+    def records_older_than(self):
+        """Return the oldest update time to load, None to load all."""
+        if self._max_age is None:
+            return None
+        return dt_util.utcnow() - self._max_age
+
+    @callback
+    def async_initialize_from_records(self, records):
+        """Initialize the list of states from database records.
+
+        The records are (state, last_updated) tuples in ascending order of
+        last_updated and may cover more than this sensor needs, in which case
+        only the latest records within max_age are used.
+        """
+        records_older_than = self.records_older_than
+        if records_older_than is not None:
+            records = [record for record in records
+                       if record[1] >= records_older_than]
 
-        The query will get the list of states in DESCENDING order so that we
-        can limit the result to self._sample_size. Afterwards reverse the
-        list so that we get it in the right order again.
+        for state, last_updated in records[-self._sampling_size:]:
+            self._add_to_queue(state, last_updated)
 
-        If MaxAge is provided then query will restrict to entries younger then
-        current datetime - MaxAge.
-        """
-        from homeassistant.components.recorder.models import States
-        _LOGGER.debug("%s: initializing values from the database",
+        self.async_schedule_update_ha_state(True)
+
+        _LOGGER.debug("%s: initializing from database completed",
                       self.entity_id)
 
-        with session_scope(hass=self.hass) as session:
-            query = session.query(States)\
-                .filter(States.entity_id == self._entity_id.lower())
 
-            if self._max_age is not None:
-                records_older_then = dt_util.utcnow() - self._max_age
-                _LOGGER.debug("%s: retrieve records not older then %s",
-                              self.entity_id, records_older_then)
-                query = query.filter(States.last_updated >= records_older_then)
+@callback
+def _async_schedule_initialize_from_database(hass, sensor):
+    """Queue a sensor for the shared initialization from the database.
+
+    All sensors queued while the event loop handles the start event are
+    initialized together by a single task.
+    """
+    pending = hass.data.get(DATA_PENDING_INITIALIZE)
+
+    if pending is None:
+        pending = hass.data[DATA_PENDING_INITIALIZE] = []
+        hass.async_create_task(_async_initialize_from_database(hass))
+
+    pending.append(sensor)
+
+
+async def _async_initialize_from_database(hass):
+    """Initialize the queued sensors with one bulk database query."""
+    sensors = hass.data.pop(DATA_PENDING_INITIALIZE)
+
+    # Sensors on the same entity share the widest window of any of them
+    windows = {}
+    for sensor in sensors:
+        # pylint: disable=protected-access
+        entity_id = sensor._entity_id.lower()
+        limit = sensor._sampling_size
+        records_older_than = sensor.records_older_than
+
+        if entity_id in windows:
+            prev_limit, prev_older_than = windows[entity_id]
+            limit = max(limit, prev_limit)
+            if records_older_than is not None and prev_older_than is not None:
+                records_older_than = min(records_older_than, prev_older_than)
             else:
-                _LOGGER.debug("%s: retrieving all records.", self.entity_id)
+                records_older_than = None
 
-            query = query\
-                .order_by(States.last_updated.desc())\
-                .limit(self._sampling_size)
-            states = execute(query)
+        windows[entity_id] = (limit, records_older_than)
 
-        for state in reversed(states):
-            self._add_state_to_queue(state)
+    _LOGGER.debug("Initializing %d statistics sensors from the database",
+                  len(sensors))
 
-        self.async_schedule_update_ha_state(True)
+    records = await hass.async_add_executor_job(
+        _load_records, hass, windows)
 
-        _LOGGER.debug("%s: initializing from database completed",
-                      self.entity_id)
+    for sensor in sensors:
+        # pylint: disable=protected-access
+        sensor.async_initialize_from_records(
+            records.get(sensor._entity_id.lower(), []))
+
+
+def _load_records(hass, windows):
+    """Load the latest (state, last_updated) records per entity.
+
+    The query selects only the columns needed and gets the records in
+    DESCENDING order so that they can be limited per entity. The union of
+    the per entity queries has no defined order, so afterwards the records
+    are sorted oldest first.
+    """
+    from sqlalchemy import union_all
+    from homeassistant.components.recorder.models import (
+        States, process_timestamp)
+
+    records = defaultdict(list)
+    entity_ids = list(windows)
+
+    with session_scope(hass=hass) as session:
+        for idx in range(0, len(entity_ids), INITIALIZE_QUERY_CHUNK_SIZE):
+            selects = []
+
+            for entity_id in \
+                    entity_ids[idx:idx + INITIALIZE_QUERY_CHUNK_SIZE]:
+                limit, records_older_than = windows[entity_id]
+                query = session.query(
+                    States.entity_id, States.state, States.last_updated)\
+                    .filter(States.entity_id == entity_id)
+
+                if records_older_than is not None:
+                    query = query.filter(
+                        States.last_updated >= records_older_than)
+
+                query = query\
+                    .order_by(States.last_updated.desc())\
+                    .limit(limit)
+                selects.append(query.subquery().select())
+
+            for entity_id, state, last_updated in \
+                    session.execute(union_all(*selects)):
+                records[entity_id].append(
+                    (state, process_timestamp(last_updated)))
+
+    for entity_records in records.values():
+        entity_records.sort(key=itemgetter(1))
+
+    return records
@@ -9,8 +9,9 @@ import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.core import callback
+from homeassistant.helpers.storage import async_get_writer
 from homeassistant.helpers.typing import ConfigType, HomeAssistantType
-from homeassistant.loader import bind_hass
+from homeassistant.loader import DATA_IMPORT_TIMES, bind_hass
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +19,9 @@ DOMAIN = 'system_health'
 
 INFO_CALLBACK_TIMEOUT = 5
 
+# Number of slowest module imports that are reported
+SLOWEST_IMPORTS = 20
+
 
 @bind_hass
 @callback
@@ -32,9 +36,31 @@ def async_register_info(hass: HomeAssistantType, domain: str,
 async def async_setup(hass: HomeAssistantType, config: ConfigType):
     """Set up the System Health component."""
     hass.components.websocket_api.async_register_command(handle_info)
+    async_register_info(hass, 'executor_pools', _async_executor_pools_info)
+    async_register_info(hass, 'imports', _async_imports_info)
+    async_register_info(hass, 'storage', _async_storage_info)
     return True
 
 
+async def _async_executor_pools_info(hass):
+    """Return queue depth and wait time of the executor pools."""
+    return hass.async_executor_pool_stats()
+
+
+async def _async_imports_info(hass):
+    """Return the integration modules that took the longest to import."""
+    import_times = hass.data.get(DATA_IMPORT_TIMES, {})
+    return OrderedDict(
+        (name, round(import_times[name], 3))
+        for name in sorted(import_times, key=import_times.get,
+                           reverse=True)[:SLOWEST_IMPORTS])
+
+
+async def _async_storage_info(hass):
+    """Return the number of writes and bytes written per store."""
+    return async_get_writer(hass).stats
+
+
 async def _info_wrapper(hass, info_callback):
     """Wrap info callback."""
     try:
@@ -13,8 +13,8 @@ from homeassistant.const import (
     CONF_NAME, DEVICE_CLASS_HUMIDITY, DEVICE_CLASS_TEMPERATURE, TEMP_CELSIUS)
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.entity import Entity
-from homeassistant.util import Throttle
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity, DataUpdateCoordinator, UpdateFailed)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,8 +26,6 @@ CONF_STATION = 'station'
 
 MIN_TIME_BETWEEN_UPDATES = timedelta(minutes=10)
 
-SCAN_INTERVAL = timedelta(seconds=300)
-
 SENSOR_TYPES = {
     'air_temp': [
         'Air temperature', TEMP_CELSIUS,
@@ -80,30 +78,42 @@ async def async_setup_platform(
 
     weather_api = TrafikverketWeather(web_session, sensor_api)
 
-    dev = []
-    for condition in config[CONF_MONITORED_CONDITIONS]:
-        dev.append(TrafikverketWeatherStation(
-            weather_api, sensor_name, condition, sensor_station))
+    if not config[CONF_MONITORED_CONDITIONS]:
+        return
+
+    async def async_update_data():
+        """Get the latest weather of the station from Trafikverket."""
+        try:
+            return await weather_api.async_get_weather(sensor_station)
+        except (asyncio.TimeoutError,
+                aiohttp.ClientError, ValueError) as error:
+            raise UpdateFailed(
+                "Could not fetch weather data: {}".format(error))
+
+    coordinator = DataUpdateCoordinator(
+        hass, _LOGGER, name=sensor_name,
+        update_interval=MIN_TIME_BETWEEN_UPDATES,
+        update_method=async_update_data)
 
-    if dev:
-        async_add_entities(dev, True)
+    await coordinator.async_refresh()
 
+    async_add_entities([
+        TrafikverketWeatherStation(coordinator, sensor_name, condition)
+        for condition in config[CONF_MONITORED_CONDITIONS]])
 
-class TrafikverketWeatherStation(Entity):
+
+class TrafikverketWeatherStation(CoordinatorEntity):
     """Representation of a Trafikverket sensor."""
 
-    def __init__(self, weather_api, name, sensor_type, sensor_station):
+    def __init__(self, coordinator, name, sensor_type):
         """Initialize the sensor."""
+        super().__init__(coordinator)
         self._client = name
         self._name = SENSOR_TYPES[sensor_type][0]
         self._type = sensor_type
-        self._state = None
         self._unit = SENSOR_TYPES[sensor_type][1]
-        self._station = sensor_station
-        self._weather_api = weather_api
         self._icon = SENSOR_TYPES[sensor_type][3]
         self._device_class = SENSOR_TYPES[sensor_type][4]
-        self._weather = None
 
     @property
     def name(self):
@@ -118,10 +128,14 @@ class TrafikverketWeatherStation(Entity):
     @property
     def device_state_attributes(self):
         """Return the state attributes of Trafikverket Weatherstation."""
+        weather = self.coordinator.data
+        if weather is None:
+            return {ATTR_ATTRIBUTION: ATTRIBUTION}
+
         return {
             ATTR_ATTRIBUTION: ATTRIBUTION,
-            ATTR_ACTIVE: self._weather.active,
-            ATTR_MEASURE_TIME: self._weather.measure_time,
+            ATTR_ACTIVE: weather.active,
+            ATTR_MEASURE_TIME: weather.measure_time,
         }
 
     @property
@@ -132,22 +146,10 @@ class TrafikverketWeatherStation(Entity):
     @property
     def state(self):
         """Return the state of the device."""
-        return self._state
+        return getattr(self.coordinator.data, SENSOR_TYPES[self._type][2],
+                       None)
 
     @property
     def unit_of_measurement(self):
         """Return the unit of measurement of this entity, if any."""
         return self._unit
-
-    @Throttle(MIN_TIME_BETWEEN_UPDATES)
-    async def async_update(self):
-        """Get the latest data from Trafikverket and updates the states."""
-        try:
-            self._weather = await self._weather_api.async_get_weather(
-                self._station)
-            self._state = getattr(
-                self._weather,
-                SENSOR_TYPES[self._type][2])
-        except (asyncio.TimeoutError,
-                aiohttp.ClientError, ValueError) as error:
-            _LOGGER.error("Could not fetch weather data: %s", error)
@@ -1,7 +1,9 @@
 """Module to help with parsing and generating configuration files."""
 from collections import OrderedDict
+import copy
 # pylint: disable=no-name-in-module
 from distutils.version import LooseVersion  # pylint: disable=import-error
+import json
 import logging
 import os
 import re
@@ -17,6 +19,7 @@ from homeassistant.auth import providers as auth_providers,\
     mfa_modules as auth_mfa_modules
 from homeassistant.const import (
     ATTR_FRIENDLY_NAME, ATTR_HIDDEN, ATTR_ASSUMED_STATE,
+    ATTR_MIN_STATE_INTERVAL, ATTR_STATE_THRESHOLD,
     CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME, CONF_PACKAGES, CONF_UNIT_SYSTEM,
     CONF_TIME_ZONE, CONF_ELEVATION, CONF_UNIT_SYSTEM_METRIC,
     CONF_UNIT_SYSTEM_IMPERIAL, CONF_TEMPERATURE_UNIT, TEMP_CELSIUS,
@@ -28,23 +31,29 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import (
     Integration, async_get_integration, IntegrationNotFound
 )
-from homeassistant.util.yaml import load_yaml, SECRET_YAML
+from homeassistant.util.yaml import (
+    load_yaml, save_parsed_cache, SECRET_YAML)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util import dt as date_util, location as loc_util
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
 from homeassistant.helpers.entity_values import EntityValues
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.helpers.template import Template
 from homeassistant.helpers import config_per_platform, extract_domain_configs
 
 _LOGGER = logging.getLogger(__name__)
 
 DATA_PERSISTENT_ERRORS = 'bootstrap_persistent_errors'
+DATA_VALIDATED_PLATFORMS = 'validated_platform_configs'
 RE_YAML_ERROR = re.compile(r"homeassistant\.util\.yaml")
 RE_ASCII = re.compile(r"\033\[[^m]*m")
 HA_COMPONENT_URL = '[{}](https://home-assistant.io/components/{}/)'
 YAML_CONFIG_FILE = 'configuration.yaml'
 VERSION_FILE = '.HA_VERSION'
+YAML_CACHE_FILE = os.path.join(STORAGE_DIR, 'core.yaml_cache')
 CONFIG_DIR_NAME = '.homeassistant'
 DATA_CUSTOMIZE = 'hass_customize'
+CONF_EXECUTOR_POOLS = 'executor_pools'
 
 FILE_MIGRATION = (
     ('ios.conf', '.ios.conf'),
@@ -156,6 +165,10 @@ CUSTOMIZE_DICT_SCHEMA = vol.Schema({
     vol.Optional(ATTR_FRIENDLY_NAME): cv.string,
     vol.Optional(ATTR_HIDDEN): cv.boolean,
     vol.Optional(ATTR_ASSUMED_STATE): cv.boolean,
+    vol.Optional(ATTR_MIN_STATE_INTERVAL):
+        vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(ATTR_STATE_THRESHOLD):
+        vol.All(vol.Coerce(float), vol.Range(min=0)),
 }, extra=vol.ALLOW_EXTRA)
 
 CUSTOMIZE_CONFIG_SCHEMA = vol.Schema({
@@ -179,6 +192,8 @@ CORE_CONFIG_SCHEMA = CUSTOMIZE_CONFIG_SCHEMA.extend({
         # pylint: disable=no-value-for-parameter
         vol.All(cv.ensure_list, [vol.IsDir()]),
     vol.Optional(CONF_PACKAGES, default={}): PACKAGES_CONFIG_SCHEMA,
+    vol.Optional(CONF_EXECUTOR_POOLS, default={}):
+        {cv.string: vol.All(vol.Coerce(int), vol.Range(min=1))},
     vol.Optional(CONF_AUTH_PROVIDERS):
         vol.All(cv.ensure_list,
                 [auth_providers.AUTH_PROVIDER_SCHEMA.extend({
@@ -319,6 +334,7 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> Dict:
             raise HomeAssistantError(
                 "Config file not found in: {}".format(hass.config.config_dir))
         config = load_yaml_config_file(path)
+        save_parsed_cache(hass.config.path(YAML_CACHE_FILE))
         return config
 
     config = await hass.async_add_executor_job(_load_hass_yaml_config)
@@ -522,6 +538,11 @@ async def async_process_ha_core_config(
         hac.whitelist_external_dirs.update(
             set(config[CONF_WHITELIST_EXTERNAL_DIRS]))
 
+    # Executor pools can't be resized, only created once
+    for pool_name, max_workers in config[CONF_EXECUTOR_POOLS].items():
+        if pool_name not in hass.executor_pools:
+            hass.async_create_executor_pool(pool_name, max_workers)
+
     # Customize
     cust_exact = dict(config[CONF_CUSTOMIZE])
     cust_domain = dict(config[CONF_CUSTOMIZE_DOMAIN])
@@ -740,10 +761,13 @@ async def merge_packages_config(hass: HomeAssistant, config: Dict,
 
 
 async def async_process_component_config(
-        hass: HomeAssistant, config: Dict, integration: Integration) \
-            -> Optional[Dict]:
+        hass: HomeAssistant, config: Dict, integration: Integration,
+        memoize: bool = False) -> Optional[Dict]:
     """Check component configuration and return processed configuration.
 
+    If memoize is set, platform configs that did not change since the last
+    memoized call for the domain are not validated again.
+
     Returns None on error.
 
     This method must be run in the event loop.
@@ -765,41 +789,33 @@ async def async_process_component_config(
     if component_platform_schema is None:
         return config
 
+    # The memoized configs are never handed out, every caller gets a copy
+    # so changes made to it do not leak into later reloads.
+    validated = hass.data.setdefault(DATA_VALIDATED_PLATFORMS, {})
+    last_validated = validated.pop(domain, {}) if memoize else {}
+    memoized = {}
+
     platforms = []
     for p_name, p_config in config_per_platform(config, domain):
-        # Validate component specific platform schema
-        try:
-            p_validated = component_platform_schema(p_config)
-        except vol.Invalid as ex:
-            async_log_exception(ex, domain, p_config, hass)
+        key = config_key(p_config) if memoize else None
+        if key is not None and key in last_validated:
+            memoized[key] = last_validated[key]
+            platforms.append(copy.deepcopy(memoized[key]))
             continue
 
-        # Not all platform components follow same pattern for platforms
-        # So if p_name is None we are not going to validate platform
-        # (the automation component is one of them)
-        if p_name is None:
-            platforms.append(p_validated)
-            continue
+        p_validated = await _async_validate_platform_config(
+            hass, domain, component_platform_schema, p_name, p_config)
 
-        try:
-            p_integration = await async_get_integration(hass, p_name)
-            platform = p_integration.get_platform(domain)
-        except (IntegrationNotFound, ImportError):
+        if p_validated is None:
             continue
 
-        # Validate platform specific schema
-        if hasattr(platform, 'PLATFORM_SCHEMA'):
-            # pylint: disable=no-member
-            try:
-                p_validated = platform.PLATFORM_SCHEMA(  # type: ignore
-                    p_config)
-            except vol.Invalid as ex:
-                async_log_exception(ex, '{}.{}'.format(domain, p_name),
-                                    p_config, hass)
-                continue
-
+        if key is not None:
+            memoized[key] = copy.deepcopy(p_validated)
         platforms.append(p_validated)
 
+    if memoize:
+        validated[domain] = memoized
+
     # Create a copy of the configuration with all config for current
     # component removed and add validated config back in.
     filter_keys = extract_domain_configs(config, domain)
@@ -810,6 +826,65 @@ async def async_process_component_config(
     return config
 
 
+async def _async_validate_platform_config(
+        hass: HomeAssistant, domain: str, component_platform_schema: Callable,
+        p_name: Optional[str], p_config: Dict) -> Optional[Dict]:
+    """Validate the config of a platform.
+
+    Returns None on error.
+    """
+    # Validate component specific platform schema
+    try:
+        p_validated = component_platform_schema(p_config)
+    except vol.Invalid as ex:
+        async_log_exception(ex, domain, p_config, hass)
+        return None
+
+    # Not all platform components follow same pattern for platforms
+    # So if p_name is None we are not going to validate platform
+    # (the automation component is one of them)
+    if p_name is None:
+        return p_validated  # type: ignore
+
+    try:
+        p_integration = await async_get_integration(hass, p_name)
+        platform = p_integration.get_platform(domain)
+    except (IntegrationNotFound, ImportError):
+        return None
+
+    # Validate platform specific schema
+    if hasattr(platform, 'PLATFORM_SCHEMA'):
+        # pylint: disable=no-member
+        try:
+            p_validated = platform.PLATFORM_SCHEMA(  # type: ignore
+                p_config)
+        except vol.Invalid as ex:
+            async_log_exception(ex, '{}.{}'.format(domain, p_name),
+                                p_config, hass)
+            return None
+
+    return p_validated  # type: ignore
+
+
+def _config_key_default(value: Any) -> Any:
+    """Serialize values JSON doesn't know for a config key."""
+    if isinstance(value, Template):
+        return value.template
+    return repr(value)
+
+
+def config_key(config: Any) -> Optional[str]:
+    """Return a key that is the same for equal configurations.
+
+    Also works for validated configurations, templates are compared on
+    their template string. Returns None if no key can be made.
+    """
+    try:
+        return json.dumps(config, sort_keys=True, default=_config_key_default)
+    except (TypeError, ValueError):
+        return None
+
+
 async def async_check_ha_config_file(hass: HomeAssistant) -> Optional[str]:
     """Check if Home Assistant configuration file is valid.
 
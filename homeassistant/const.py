@@ -32,6 +32,7 @@ CONF_ALIAS = 'alias'
 CONF_API_KEY = 'api_key'
 CONF_API_VERSION = 'api_version'
 CONF_AT = 'at'
+CONF_ATTRIBUTE = 'attribute'
 CONF_AUTHENTICATION = 'authentication'
 CONF_AUTH_MFA_MODULES = 'auth_mfa_modules'
 CONF_AUTH_PROVIDERS = 'auth_providers'
@@ -296,6 +297,10 @@ ATTR_LAST_TRIP_TIME = 'last_tripped_time'
 # For all entity's, this hold whether or not it should be hidden
 ATTR_HIDDEN = 'hidden'
 
+# Limit how often the state of a noisy entity is written
+ATTR_MIN_STATE_INTERVAL = 'min_state_interval'
+ATTR_STATE_THRESHOLD = 'state_threshold'
+
 # Location of the entity
 ATTR_LATITUDE = 'latitude'
 ATTR_LONGITUDE = 'longitude'
@@ -305,6 +310,9 @@ ATTR_GPS_ACCURACY = 'gps_accuracy'
 
 # If state is assumed
 ATTR_ASSUMED_STATE = 'assumed_state'
+
+# If the state is a placeholder until the entity is set up
+ATTR_RESTORED = 'restored'
 ATTR_STATE = 'state'
 
 ATTR_OPTION = 'option'
@@ -5,14 +5,13 @@ Home Assistant is a Home Automation framework for observing the state
 of entities and react to changes.
 """
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 import datetime
 import enum
 import functools
 import logging
 import os
 import pathlib
-import sys
 import threading
 from time import monotonic
 import uuid
@@ -43,6 +42,7 @@ from homeassistant.util.async_ import (
 from homeassistant import util
 import homeassistant.util.dt as dt_util
 from homeassistant.util import location, slugify
+from homeassistant.util.executor import ExecutorPool
 from homeassistant.util.unit_system import UnitSystem, METRIC_SYSTEM  # NOQA
 
 # Typing imports that create a circular dependency
@@ -61,9 +61,27 @@ DOMAIN = 'homeassistant'
 # How long we wait for the result of a service call
 SERVICE_CALL_LIMIT = 10  # seconds
 
+# Number of validated service data payloads remembered per service
+SERVICE_SCHEMA_CACHE_SIZE = 128
+
+# Values of service data that can be remembered after validation
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+
 # How long to wait till things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# Executor pools
+POOL_DEFAULT = 'Sync'
+# Reserved for latency critical internal work like storage reads and writes
+POOL_CORE = 'Core'
+CORE_POOL_MAX_WORKERS = 4
+# Used for history queries, which can take long on big databases
+POOL_HISTORY = 'History'
+HISTORY_POOL_MAX_WORKERS = 2
+# Used to import integrations in the background during startup
+POOL_IMPORT = 'Import'
+IMPORT_POOL_MAX_WORKERS = 2
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -97,6 +115,50 @@ def is_callback(func: Callable[..., Any]) -> bool:
     return getattr(func, '_hass_callback', False) is True
 
 
+class HassJobType(enum.Enum):
+    """Represent how a job is run."""
+
+    Coroutinefunction = 1
+    Callback = 2
+    Executor = 3
+
+
+class HassJob:
+    """Represent a job to be run later.
+
+    The type of the target is determined once when the job is created, so it
+    does not have to be checked again every time the job is run.
+    """
+
+    __slots__ = ('job_type', 'target')
+
+    def __init__(self, target: Callable) -> None:
+        """Create a job object."""
+        if asyncio.iscoroutine(target):
+            raise ValueError("Coroutine not allowed to be passed to HassJob")
+
+        self.target = target
+        self.job_type = _get_callable_job_type(target)
+
+    def __repr__(self) -> str:
+        """Return the job."""
+        return "<Job {} {}>".format(self.job_type, self.target)
+
+
+def _get_callable_job_type(target: Callable) -> HassJobType:
+    """Determine the job type from the callable."""
+    # Check for partials to properly determine if coroutine function
+    check_target = target
+    while isinstance(check_target, functools.partial):
+        check_target = check_target.func
+
+    if is_callback(check_target):
+        return HassJobType.Callback
+    if asyncio.iscoroutinefunction(check_target):
+        return HassJobType.Coroutinefunction
+    return HassJobType.Executor
+
+
 @callback
 def async_loop_exception_handler(_: Any, context: Dict) -> None:
     """Handle all exception inside the core loop."""
@@ -132,14 +194,18 @@ class HomeAssistant:
         """Initialize new Home Assistant object."""
         self.loop = loop or asyncio.get_event_loop()
 
-        executor_opts = {'max_workers': None}  # type: Dict[str, Any]
-        if sys.version_info[:2] >= (3, 6):
-            executor_opts['thread_name_prefix'] = 'SyncWorker'
-
-        self.executor = ThreadPoolExecutor(**executor_opts)
+        self.executor = ExecutorPool(POOL_DEFAULT)
+        self.executor_pools = {
+            POOL_DEFAULT: self.executor,
+            POOL_CORE: ExecutorPool(POOL_CORE, CORE_POOL_MAX_WORKERS),
+            POOL_HISTORY: ExecutorPool(
+                POOL_HISTORY, HISTORY_POOL_MAX_WORKERS),
+            POOL_IMPORT: ExecutorPool(POOL_IMPORT, IMPORT_POOL_MAX_WORKERS),
+        }  # type: Dict[str, ExecutorPool]
         self.loop.set_default_executor(self.executor)
         self.loop.set_exception_handler(async_loop_exception_handler)
-        self._pending_tasks = []  # type: list
+        # Tracked tasks remove themselves once they are done
+        self._pending_tasks = set()  # type: Set[asyncio.Future]
         self._track_task = True
         self.bus = EventBus(self)
         self.services = ServiceRegistry(self)
@@ -257,26 +323,36 @@ class HomeAssistant:
         target: target to call.
         args: parameters for method to call.
         """
-        task = None
-
-        # Check for partials to properly determine if coroutine function
-        check_target = target
-        while isinstance(check_target, functools.partial):
-            check_target = check_target.func
-
-        if asyncio.iscoroutine(check_target):
-            task = self.loop.create_task(target)  # type: ignore
-        elif is_callback(check_target):
-            self.loop.call_soon(target, *args)
-        elif asyncio.iscoroutinefunction(check_target):
-            task = self.loop.create_task(target(*args))
+        if asyncio.iscoroutine(target):
+            return self.async_create_task(target)  # type: ignore
+
+        return self.async_add_hass_job(HassJob(target), *args)
+
+    @callback
+    def async_add_hass_job(
+            self,
+            hassjob: HassJob,
+            *args: Any) -> Optional[asyncio.Future]:
+        """Add a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+
+        hassjob: HassJob to call.
+        args: parameters for method to call.
+        """
+        if hassjob.job_type == HassJobType.Coroutinefunction:
+            task = self.loop.create_task(
+                hassjob.target(*args))  # type: asyncio.Future
+        elif hassjob.job_type == HassJobType.Callback:
+            self.loop.call_soon(hassjob.target, *args)
+            return None
         else:
             task = self.loop.run_in_executor(  # type: ignore
-                None, target, *args)
+                None, hassjob.target, *args)
 
         # If a task is scheduled
-        if self._track_task and task is not None:
-            self._pending_tasks.append(task)
+        if self._track_task:
+            self._async_track_pending(task)
 
         return task
 
@@ -291,7 +367,7 @@ class HomeAssistant:
         task = self.loop.create_task(target)  # type: asyncio.tasks.Task
 
         if self._track_task:
-            self._pending_tasks.append(task)
+            self._async_track_pending(task)
 
         return task
 
@@ -299,17 +375,49 @@ class HomeAssistant:
     def async_add_executor_job(
             self,
             target: Callable[..., T],
-            *args: Any) -> Awaitable[T]:
-        """Add an executor job from within the event loop."""
+            *args: Any,
+            pool: Optional[str] = None) -> Awaitable[T]:
+        """Add an executor job from within the event loop.
+
+        pool: name of the executor pool to run the job in. Falls back to the
+        default pool if no pool with that name has been created.
+        """
         task = self.loop.run_in_executor(
-            None, target, *args)
+            self.executor_pools.get(pool, self.executor),  # type: ignore
+            target, *args)
 
         # If a task is scheduled
         if self._track_task:
-            self._pending_tasks.append(task)
+            self._async_track_pending(task)
 
         return task
 
+    @callback
+    def async_create_executor_pool(
+            self, name: str, max_workers: Optional[int] = None) -> None:
+        """Create a named executor pool.
+
+        Jobs added with async_add_executor_job for this pool will no longer
+        compete with the default pool for worker threads.
+        """
+        if name in self.executor_pools:
+            raise HomeAssistantError(
+                "Executor pool {} already exists".format(name))
+
+        self.executor_pools[name] = ExecutorPool(name, max_workers)
+
+    @callback
+    def async_executor_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return queue depth and wait time statistics per pool."""
+        return {name: pool.stats
+                for name, pool in self.executor_pools.items()}
+
+    @callback
+    def _async_track_pending(self, task: asyncio.Future) -> None:
+        """Track a task until it is done."""
+        self._pending_tasks.add(task)
+        task.add_done_callback(self._pending_tasks.discard)
+
     @callback
     def async_track_tasks(self) -> None:
         """Track tasks so you can wait for all tasks to be done."""
@@ -334,6 +442,20 @@ class HomeAssistant:
         else:
             self.async_add_job(target, *args)
 
+    @callback
+    def async_run_hass_job(self, hassjob: HassJob, *args: Any) -> None:
+        """Run a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+
+        hassjob: HassJob
+        args: parameters for method to call.
+        """
+        if hassjob.job_type == HassJobType.Callback:
+            hassjob.target(*args)
+        else:
+            self.async_add_hass_job(hassjob, *args)
+
     def block_till_done(self) -> None:
         """Block till all pending work is done."""
         run_coroutine_threadsafe(
@@ -344,14 +466,10 @@ class HomeAssistant:
         # To flush out any call_soon_threadsafe
         await asyncio.sleep(0)
 
+        # Done tasks remove themselves before asyncio.wait returns, so
+        # only tasks that were added while waiting are left.
         while self._pending_tasks:
-            pending = [task for task in self._pending_tasks
-                       if not task.done()]
-            self._pending_tasks.clear()
-            if pending:
-                await asyncio.wait(pending)
-            else:
-                await asyncio.sleep(0)
+            await asyncio.wait(list(self._pending_tasks))
 
     def stop(self) -> None:
         """Stop Home Assistant and shuts down all threads."""
@@ -391,7 +509,8 @@ class HomeAssistant:
         self.state = CoreState.not_running
         self.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
         await self.async_block_till_done()
-        self.executor.shutdown()
+        for pool in self.executor_pools.values():
+            pool.shutdown()
 
         self.exit_code = exit_code
 
@@ -493,7 +612,7 @@ class EventBus:
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners = {}  # type: Dict[str, List[Callable]]
+        self._listeners = {}  # type: Dict[str, List[HassJob]]
         self._hass = hass
 
     @callback
@@ -543,8 +662,8 @@ class EventBus:
         if not listeners:
             return
 
-        for func in listeners:
-            self._hass.async_add_job(func, event)
+        for job in listeners:
+            self._hass.async_add_hass_job(job, event)
 
     def listen(
             self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
@@ -573,14 +692,20 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        return self._async_listen_job(event_type, HassJob(listener))
+
+    @callback
+    def _async_listen_job(
+            self, event_type: str, hassjob: HassJob) -> CALLBACK_TYPE:
+        """Listen for events of a specific type with a HassJob."""
         if event_type in self._listeners:
-            self._listeners[event_type].append(listener)
+            self._listeners[event_type].append(hassjob)
         else:
-            self._listeners[event_type] = [listener]
+            self._listeners[event_type] = [hassjob]
 
         def remove_listener() -> None:
             """Remove the listener."""
-            self._async_remove_listener(event_type, listener)
+            self._async_remove_listener(event_type, hassjob)
 
         return remove_listener
 
@@ -616,6 +741,8 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        listener_job = HassJob(listener)
+
         @callback
         def onetime_listener(event: Event) -> None:
             """Remove listener from event bus and then fire listener."""
@@ -627,20 +754,22 @@ class EventBus:
             # multiple times as well.
             # This will make sure the second time it does nothing.
             setattr(onetime_listener, 'run', True)
-            self._async_remove_listener(event_type, onetime_listener)
-            self._hass.async_run_job(listener, event)
+            self._async_remove_listener(event_type, onetime_job)
+            self._hass.async_run_hass_job(listener_job, event)
 
-        return self.async_listen(event_type, onetime_listener)
+        onetime_job = HassJob(onetime_listener)
+
+        return self._async_listen_job(event_type, onetime_job)
 
     @callback
     def _async_remove_listener(
-            self, event_type: str, listener: Callable) -> None:
+            self, event_type: str, hassjob: HassJob) -> None:
         """Remove a listener of a specific event_type.
 
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(listener)
+            self._listeners[event_type].remove(hassjob)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
@@ -648,7 +777,8 @@ class EventBus:
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
-            _LOGGER.warning("Unable to remove unknown listener %s", listener)
+            _LOGGER.warning("Unable to remove unknown job listener %s",
+                            hassjob)
 
 
 class State:
@@ -865,6 +995,25 @@ class StateMachine:
         })
         return True
 
+    @callback
+    def async_restore(self, state: State) -> None:
+        """Add the state of an entity from a previous run.
+
+        Unlike async_set, the last changed time of the state is kept. States
+        that are set already are not replaced.
+
+        This method must be run in the event loop.
+        """
+        if state.entity_id in self._states:
+            return
+
+        self._states[state.entity_id] = state
+        self._bus.async_fire(EVENT_STATE_CHANGED, {
+            'entity_id': state.entity_id,
+            'old_state': None,
+            'new_state': state,
+        }, EventOrigin.local, state.context)
+
     def set(self, entity_id: str, new_state: Any,
             attributes: Optional[Dict] = None,
             force_update: bool = False,
@@ -926,18 +1075,67 @@ class StateMachine:
         }, EventOrigin.local, context)
 
 
+def _freeze_service_data(data: Dict) -> Optional[frozenset]:
+    """Return a hashable key for simple service data.
+
+    Simple service data only holds strings, numbers, booleans, None and lists
+    of those. Returns None for other service data.
+    """
+    items = []
+    for key, value in data.items():
+        if isinstance(value, _SIMPLE_TYPES):
+            # The type is part of the key as 1 == 1.0 == True
+            items.append((key, type(value), value))
+        elif isinstance(value, list) and all(
+                isinstance(item, _SIMPLE_TYPES) for item in value):
+            items.append((key, list, tuple(
+                (type(item), item) for item in value)))
+        else:
+            return None
+    return frozenset(items)
+
+
 class Service:
     """Representation of a callable service."""
 
-    __slots__ = ['func', 'schema', 'is_callback', 'is_coroutinefunction']
+    __slots__ = ['func', 'job', 'schema', '_validated']
 
     def __init__(self, func: Callable, schema: Optional[vol.Schema],
                  context: Optional[Context] = None) -> None:
         """Initialize a service."""
         self.func = func
+        self.job = HassJob(func)
         self.schema = schema
-        self.is_callback = is_callback(func)
-        self.is_coroutinefunction = asyncio.iscoroutinefunction(func)
+        # Frozen service data -> validated service data
+        self._validated = OrderedDict()  # type: Dict[frozenset, Dict]
+
+    @callback
+    def async_validate(self, service_data: Dict) -> Dict:
+        """Validate service data with the schema of the service.
+
+        Simple service data that validates to simple service data is
+        remembered, so calling a service with the same data again doesn't
+        run the schema.
+        """
+        key = _freeze_service_data(service_data)
+        if key is None:
+            return self.schema(service_data)  # type: ignore
+
+        validated = self._validated.get(key)
+        if validated is not None:
+            self._validated.move_to_end(key)  # type: ignore
+        else:
+            validated = self.schema(service_data)  # type: ignore
+            if not isinstance(validated, dict) or \
+                    _freeze_service_data(validated) is None:
+                return validated
+            self._validated[key] = validated
+            if len(self._validated) > SERVICE_SCHEMA_CACHE_SIZE:
+                self._validated.popitem(last=False)  # type: ignore
+
+        # Lists are copied, so the remembered data can't be changed
+        return {key: list(value) if isinstance(value, list) else value
+                for key, value in validated.items()}
 
 
 class ServiceCall:
@@ -1115,7 +1313,7 @@ class ServiceRegistry:
             raise ServiceNotFound(domain, service) from None
 
         if handler.schema:
-            processed_data = handler.schema(service_data)
+            processed_data = handler.async_validate(service_data)
         else:
             processed_data = service_data
 
@@ -1154,12 +1352,13 @@ class ServiceRegistry:
     async def _execute_service(self, handler: Service,
                                service_call: ServiceCall) -> None:
         """Execute a service."""
-        if handler.is_callback:
-            handler.func(service_call)
-        elif handler.is_coroutinefunction:
-            await handler.func(service_call)
+        if handler.job.job_type == HassJobType.Coroutinefunction:
+            await handler.job.target(service_call)
+        elif handler.job.job_type == HassJobType.Callback:
+            handler.job.target(service_call)
         else:
-            await self._hass.async_add_executor_job(handler.func, service_call)
+            await self._hass.async_add_executor_job(
+                handler.job.target, service_call)
 
 
 class Config:
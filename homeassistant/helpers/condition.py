@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 import functools as ft
 import logging
 import sys
-from typing import Callable, Container, Optional, Union, cast
+from typing import (  # noqa: F401 pylint: disable=unused-import
+    Callable, Container, Optional, Tuple, Union, cast)
 
 from homeassistant.helpers.template import Template
 from homeassistant.helpers.typing import ConfigType, TemplateVarsType
@@ -15,7 +16,7 @@ from homeassistant.const import (
     CONF_ENTITY_ID, CONF_VALUE_TEMPLATE, CONF_CONDITION,
     WEEKDAYS, CONF_STATE, CONF_ZONE, CONF_BEFORE,
     CONF_AFTER, CONF_WEEKDAY, SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET,
-    CONF_BELOW, CONF_ABOVE, STATE_UNAVAILABLE, STATE_UNKNOWN)
+    CONF_BELOW, CONF_ABOVE, CONF_ATTRIBUTE, STATE_UNAVAILABLE, STATE_UNKNOWN)
 from homeassistant.exceptions import TemplateError, HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.sun import get_astral_event_date
@@ -145,11 +146,12 @@ or_from_config = _threaded_factory(async_or_from_config)
 def numeric_state(hass: HomeAssistant, entity: Union[None, str, State],
                   below: Optional[float] = None, above: Optional[float] = None,
                   value_template: Optional[Template] = None,
-                  variables: TemplateVarsType = None) -> bool:
+                  variables: TemplateVarsType = None,
+                  attribute: Optional[str] = None) -> bool:
     """Test a numeric state condition."""
     return cast(bool, run_callback_threadsafe(
         hass.loop, async_numeric_state, hass, entity, below, above,
-        value_template, variables,
+        value_template, variables, attribute,
     ).result())
 
 
@@ -157,7 +159,8 @@ def async_numeric_state(hass: HomeAssistant, entity: Union[None, str, State],
                         below: Optional[float] = None,
                         above: Optional[float] = None,
                         value_template: Optional[Template] = None,
-                        variables: TemplateVarsType = None) -> bool:
+                        variables: TemplateVarsType = None,
+                        attribute: Optional[str] = None) -> bool:
     """Test a numeric state condition."""
     if isinstance(entity, str):
         entity = hass.states.get(entity)
@@ -165,31 +168,50 @@ def async_numeric_state(hass: HomeAssistant, entity: Union[None, str, State],
     if entity is None:
         return False
 
-    if value_template is None:
-        value = entity.state
-    else:
+    fvalue = async_numeric_value(entity, value_template, variables, attribute)
+
+    return fvalue is not None and numeric_in_range(fvalue, below, above)
+
+
+def async_numeric_value(entity: State,
+                        value_template: Optional[Template] = None,
+                        variables: TemplateVarsType = None,
+                        attribute: Optional[str] = None) -> Optional[float]:
+    """Return the numeric value of a state, attribute or template.
+
+    Returns None if there is no value or it is not a number.
+    """
+    if value_template is not None:
         variables = dict(variables or {})
         variables['state'] = entity
         try:
             value = value_template.async_render(variables)
         except TemplateError as ex:
             _LOGGER.error("Template error: %s", ex)
-            return False
+            return None
+    elif attribute is not None:
+        value = entity.attributes.get(attribute)
+    else:
+        value = entity.state
 
-    if value in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-        return False
+    if value is None or value in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return None
 
     try:
-        fvalue = float(value)
-    except ValueError:
+        return float(value)
+    except (TypeError, ValueError):
         _LOGGER.warning("Value cannot be processed as a number: %s "
                         "(Offending entity: %s)", entity, value)
-        return False
+        return None
+
 
-    if below is not None and fvalue >= below:
+def numeric_in_range(value: float, below: Optional[float] = None,
+                     above: Optional[float] = None) -> bool:
+    """Test if a value is below and above the limits that are set."""
+    if below is not None and value >= below:
         return False
 
-    if above is not None and fvalue <= above:
+    if above is not None and value <= above:
         return False
 
     return True
@@ -205,15 +227,31 @@ def async_numeric_state_from_config(config: ConfigType,
     below = config.get(CONF_BELOW)
     above = config.get(CONF_ABOVE)
     value_template = config.get(CONF_VALUE_TEMPLATE)
+    attribute = config.get(CONF_ATTRIBUTE)
+    # The last state that was tested and its result. States are replaced
+    # when they change, so an identical state has the same result. This
+    # does not hold for templates, which can depend on anything.
+    last_test = (None, False)  # type: Tuple[Optional[State], bool]
 
     def if_numeric_state(hass: HomeAssistant,
                          variables: TemplateVarsType = None) -> bool:
         """Test numeric state condition."""
+        nonlocal last_test
+
         if value_template is not None:
             value_template.hass = hass
+            return async_numeric_state(
+                hass, entity_id, below, above, value_template, variables)
+
+        entity = hass.states.get(entity_id)
+        if entity is None:
+            return False
+
+        if entity is not last_test[0]:
+            last_test = (entity, async_numeric_state(
+                hass, entity, below, above, attribute=attribute))
 
-        return async_numeric_state(
-            hass, entity_id, below, above, value_template, variables)
+        return last_test[1]
 
     return if_numeric_state
 
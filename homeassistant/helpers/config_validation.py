@@ -19,7 +19,7 @@ from homeassistant.const import (
     CONF_ALIAS, CONF_ENTITY_ID, CONF_VALUE_TEMPLATE, WEEKDAYS,
     CONF_CONDITION, CONF_BELOW, CONF_ABOVE, CONF_TIMEOUT, SUN_EVENT_SUNSET,
     SUN_EVENT_SUNRISE, CONF_UNIT_SYSTEM_IMPERIAL, CONF_UNIT_SYSTEM_METRIC,
-    ENTITY_MATCH_ALL, CONF_ENTITY_NAMESPACE, __version__)
+    ENTITY_MATCH_ALL, CONF_ENTITY_NAMESPACE, CONF_ATTRIBUTE, __version__)
 from homeassistant.core import valid_entity_id, split_entity_id
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import template as template_helper
@@ -738,7 +738,8 @@ NUMERIC_STATE_CONDITION_SCHEMA = vol.All(vol.Schema({
     vol.Required(CONF_ENTITY_ID): entity_id,
     CONF_BELOW: vol.Coerce(float),
     CONF_ABOVE: vol.Coerce(float),
-    vol.Optional(CONF_VALUE_TEMPLATE): template,
+    vol.Exclusive(CONF_ATTRIBUTE, 'value'): string,
+    vol.Exclusive(CONF_VALUE_TEMPLATE, 'value'): template,
 }), has_at_least_one_key(CONF_BELOW, CONF_ABOVE))
 
 STATE_CONDITION_SCHEMA = vol.All(vol.Schema({
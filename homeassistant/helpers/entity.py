@@ -9,10 +9,12 @@ from homeassistant.const import (
     ATTR_ASSUMED_STATE, ATTR_FRIENDLY_NAME, ATTR_HIDDEN, ATTR_ICON,
     ATTR_UNIT_OF_MEASUREMENT, DEVICE_DEFAULT_NAME, STATE_OFF, STATE_ON,
     STATE_UNAVAILABLE, STATE_UNKNOWN, TEMP_CELSIUS, TEMP_FAHRENHEIT,
-    ATTR_ENTITY_PICTURE, ATTR_SUPPORTED_FEATURES, ATTR_DEVICE_CLASS)
+    ATTR_ENTITY_PICTURE, ATTR_SUPPORTED_FEATURES, ATTR_DEVICE_CLASS,
+    ATTR_MIN_STATE_INTERVAL, ATTR_RESTORED, ATTR_STATE_THRESHOLD)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.exceptions import NoEntitySpecifiedError
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.util import ensure_unique_string, slugify
 from homeassistant.util.async_ import run_callback_threadsafe
 from homeassistant.util import dt as dt_util
@@ -48,7 +50,9 @@ def async_generate_entity_id(entity_id_format: str, name: Optional[str],
         if hass is None:
             raise ValueError("Missing required parameter currentids or hass")
 
-        current_ids = hass.states.async_entity_ids()
+        # Restored states are taken over by the entity that is added
+        current_ids = [state.entity_id for state in hass.states.async_all()
+                       if not state.attributes.get(ATTR_RESTORED)]
     name = (name or DEVICE_DEFAULT_NAME).lower()
 
     return ensure_unique_string(
@@ -88,6 +92,11 @@ class Entity:
     _context = None
     _context_set = None
 
+    # Last state written and the state held back by the write limits
+    _state_written = None
+    _state_write_pending = None
+    _state_write_unsub = None
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -297,8 +306,15 @@ class Entity:
                             type(self), end - start)
 
         # Overwrite properties that have been set in the config file.
+        write_limits = None
         if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+            customize = self.hass.data[DATA_CUSTOMIZE].get(self.entity_id)
+            if (ATTR_MIN_STATE_INTERVAL in customize or
+                    ATTR_STATE_THRESHOLD in customize):
+                customize = dict(customize)
+                write_limits = (customize.pop(ATTR_MIN_STATE_INTERVAL, None),
+                                customize.pop(ATTR_STATE_THRESHOLD, None))
+            attr.update(customize)
 
         # Convert temperature if we detect one
         try:
@@ -314,6 +330,70 @@ class Entity:
             # Could not convert state to float
             pass
 
+        if write_limits is not None:
+            if self._async_hold_state_write(state, attr, *write_limits):
+                return
+            self._state_written = (dt_util.utcnow(), state, attr)
+
+        self._async_set_state(state, attr)
+
+    @callback
+    def _async_hold_state_write(self, state, attr, min_interval, threshold):
+        """Return if a state write should be held back by the limits.
+
+        A state within the threshold of the last written state, with the same
+        attributes, is not written at all. Writes within the minimum interval
+        of the last write are coalesced and the latest one is written when
+        the interval has passed.
+        """
+        if self._state_written is None:
+            return False
+
+        last_time, last_state, last_attr = self._state_written
+
+        if threshold is not None and attr == last_attr:
+            try:
+                if abs(float(state) - float(last_state)) < threshold:
+                    self._async_cancel_state_write()
+                    return True
+            except ValueError:
+                pass
+
+        if min_interval is not None and \
+                dt_util.utcnow() - last_time < min_interval:
+            self._state_write_pending = (state, attr)
+            if self._state_write_unsub is None:
+                self._state_write_unsub = async_track_point_in_utc_time(
+                    self.hass, self._async_flush_state_write,
+                    last_time + min_interval)
+            return True
+
+        self._async_cancel_state_write()
+        return False
+
+    @callback
+    def _async_flush_state_write(self, _now):
+        """Write the state that was held back by the minimum interval."""
+        self._state_write_unsub = None
+        pending = self._state_write_pending
+        self._state_write_pending = None
+
+        if pending is not None:
+            self._state_written = (dt_util.utcnow(),) + pending
+            self._async_set_state(*pending)
+
+    @callback
+    def _async_cancel_state_write(self):
+        """Cancel writing a state that was held back."""
+        self._state_write_pending = None
+
+        if self._state_write_unsub is not None:
+            self._state_write_unsub()
+            self._state_write_unsub = None
+
+    @callback
+    def _async_set_state(self, state, attr):
+        """Set the state in the state machine."""
         if (self._context is not None and
                 dt_util.utcnow() - self._context_set >
                 self.context_recent_time):
@@ -374,7 +454,10 @@ class Entity:
             if hasattr(self, 'async_update'):
                 await self.async_update()
             elif hasattr(self, 'update'):
-                await self.hass.async_add_executor_job(self.update)
+                # Use the pool of the integration if one has been created
+                await self.hass.async_add_executor_job(
+                    self.update, pool=(self.platform.platform_name
+                                       if self.platform else None))
         finally:
             self._update_staged = False
             if warning:
@@ -397,6 +480,7 @@ class Entity:
             while self._on_remove:
                 self._on_remove.pop()()
 
+        self._async_cancel_state_write()
         self.hass.states.async_remove(self.entity_id)
 
     @callback
@@ -268,9 +268,12 @@ class EntityComponent:
             if entity_id in platform.entities:
                 await platform.async_remove_entity(entity_id)
 
-    async def async_prepare_reload(self):
+    async def async_prepare_reload(self, *, skip_reset=False):
         """Prepare reloading this entity component.
 
+        Entities are removed unless skip_reset is set, in which case the
+        caller is responsible for removing the entities that changed.
+
         This method must be run in the event loop.
         """
         try:
@@ -283,12 +286,13 @@ class EntityComponent:
         integration = await async_get_integration(self.hass, self.domain)
 
         conf = await conf_util.async_process_component_config(
-            self.hass, conf, integration)
+            self.hass, conf, integration, memoize=True)
 
         if conf is None:
             return None
 
-        await self._async_reset()
+        if not skip_reset:
+            await self._async_reset()
         return conf
 
     def _async_init_entity_platform(self, platform_type, platform,
@@ -1,17 +1,178 @@
 """Class to manage the entities for a single platform."""
 import asyncio
+from datetime import timedelta
+import heapq
+from itertools import count
+import zlib
 
-from homeassistant.const import DEVICE_DEFAULT_NAME
+from homeassistant.const import (
+    ATTR_NOW, ATTR_RESTORED, DEVICE_DEFAULT_NAME, EVENT_TIME_CHANGED)
 from homeassistant.core import callback, valid_entity_id, split_entity_id
 from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
 from homeassistant.util.async_ import (
     run_callback_threadsafe, run_coroutine_threadsafe)
+import homeassistant.util.dt as dt_util
 
-from .event import async_track_time_interval, async_call_later
+from .event import async_call_later
+from .update_coordinator import DataUpdateCoordinator
 
 SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 60
 PLATFORM_NOT_READY_RETRIES = 10
+# Polling lag of a platform is logged as a warning at most this often
+POLLING_LAG_WARNING_INTERVAL = timedelta(minutes=10)
+
+DATA_POLLING_SCHEDULER = 'entity_platform_polling_scheduler'
+
+
+def _should_poll(entity):
+    """Return if the platform has to poll the entity.
+
+    Entities bound to a data update coordinator are refreshed by it.
+    """
+    return entity.should_poll and not isinstance(
+        getattr(entity, 'coordinator', None), DataUpdateCoordinator)
+
+
+def _first_poll_due(entity_id, interval, now):
+    """Return the first time an entity is due after timestamp now.
+
+    The entity id determines a fixed offset within the interval, so the
+    entities of all platforms are spread evenly over their scan interval.
+    """
+    offset = zlib.crc32(entity_id.encode()) % max(int(interval * 1000), 1) \
+        / 1000
+    return now - (now - offset) % interval + interval
+
+
+class _PollEntry:
+    """An entity scheduled to be polled."""
+
+    __slots__ = ('platform', 'entity', 'due', 'task', 'behind', 'cancelled')
+
+    def __init__(self, platform, entity, due):
+        """Initialize the poll entry."""
+        self.platform = platform
+        self.entity = entity
+        self.due = due
+        # Update task while it is running
+        self.task = None
+        # Due time of an update that had to wait for the running one
+        self.behind = None
+        self.cancelled = False
+
+
+class PollingScheduler:
+    """Poll the entities of all platforms from a single timer.
+
+    All entities are scheduled, and whether an entity should be polled is
+    checked each time it is due, so should_poll can change while the entity
+    is added. Updates of an entity never overlap. If an update is still
+    running when the next one is due, the next update starts as soon as it
+    finishes and the delay is reported as the polling lag of the platform.
+    """
+
+    def __init__(self, hass):
+        """Initialize the polling scheduler."""
+        self.hass = hass
+        self._queue = []
+        self._counter = count()
+        self._active = 0
+        self._unsub_time = None
+
+    @callback
+    def async_schedule(self, platform, entity):
+        """Start polling an entity of a platform.
+
+        Returns a function to stop polling it.
+        """
+        entry = _PollEntry(platform, entity, _first_poll_due(
+            entity.entity_id, platform.scan_interval.total_seconds(),
+            dt_util.utcnow().timestamp()))
+        heapq.heappush(self._queue, (entry.due, next(self._counter), entry))
+        self._active += 1
+
+        if self._unsub_time is None:
+            self._unsub_time = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed)
+
+        @callback
+        def async_cancel():
+            """Stop polling the entity."""
+            if entry.cancelled:
+                return
+            entry.cancelled = True
+            self._active -= 1
+
+            if not self._active:
+                self._queue.clear()
+                self._unsub_time()
+                self._unsub_time = None
+
+        return async_cancel
+
+    @callback
+    def _async_time_changed(self, event):
+        """Start the updates that are due."""
+        now = event.data[ATTR_NOW].timestamp()
+        queue = self._queue
+
+        while queue and queue[0][0] <= now:
+            entry = heapq.heappop(queue)[2]
+            if entry.cancelled:
+                continue
+
+            due = entry.due
+            interval = entry.platform.scan_interval.total_seconds()
+            # Intervals that were missed completely are not caught up on
+            entry.due = due + ((now - due) // interval + 1) * interval
+            heapq.heappush(queue, (entry.due, next(self._counter), entry))
+
+            if entry.task is None:
+                if _should_poll(entry.entity):
+                    self._async_start_update(entry)
+            elif entry.behind is None:
+                entry.behind = due
+
+    @callback
+    def _async_start_update(self, entry):
+        """Start the update of a poll entry."""
+        entry.task = self.hass.async_create_task(self._async_update(entry))
+
+    async def _async_update(self, entry):
+        """Update an entity and start an update it was behind on."""
+        entity = entry.entity
+
+        try:
+            await entity.async_update_ha_state(True)
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            raise
+        except Exception:  # pylint: disable=broad-except
+            entry.platform.logger.exception(
+                "Error updating %s", entity.entity_id)
+        finally:
+            entry.task = None
+
+        if entry.behind is None or entry.cancelled:
+            return
+
+        lag = timedelta(
+            seconds=dt_util.utcnow().timestamp() - entry.behind)
+        entry.behind = None
+        entry.platform.async_report_polling_lag(lag)
+        self._async_start_update(entry)
+
+
+@callback
+def async_get_polling_scheduler(hass):
+    """Return the polling scheduler shared by all entity platforms."""
+    scheduler = hass.data.get(DATA_POLLING_SCHEDULER)
+
+    if scheduler is None:
+        scheduler = hass.data[DATA_POLLING_SCHEDULER] = \
+            PollingScheduler(hass)
+
+    return scheduler
 
 
 class EntityPlatform:
@@ -41,11 +202,12 @@ class EntityPlatform:
         self.config_entry = None
         self.entities = {}
         self._tasks = []
-        # Method to cancel the state change listener
-        self._async_unsub_polling = None
+        # How late the last update of an entity started, when the update
+        # before it overran the scan interval
+        self.polling_lag = timedelta(0)
+        self._polling_lag_warned = None
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup = None
-        self._process_updates = asyncio.Lock(loop=hass.loop)
 
         # Platform is None for the EntityComponent "catch-all" EntityPlatform
         # which powers entity_component.add_entities
@@ -221,15 +383,6 @@ class EntityPlatform:
         await asyncio.wait(tasks, loop=self.hass.loop)
         self.async_entities_added_callback()
 
-        if self._async_unsub_polling is not None or \
-           not any(entity.should_poll for entity
-                   in self.entities.values()):
-            return
-
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass, self._update_entity_states, self.scan_interval
-        )
-
     async def _async_add_entity(self, entity, update_before_add,
                                 entity_registry, device_registry):
         """Add an entity to the platform."""
@@ -347,9 +500,12 @@ class EntityPlatform:
         if not valid_entity_id(entity.entity_id):
             raise HomeAssistantError(
                 'Invalid entity id: {}'.format(entity.entity_id))
+        # Placeholder states of entities that are not set up yet are taken
+        # over by the entity.
+        existing = self.hass.states.get(entity.entity_id)
         if (entity.entity_id in self.entities or
-                entity.entity_id in self.hass.states.async_entity_ids(
-                    self.domain)):
+                (existing is not None and existing.domain == self.domain and
+                 not existing.attributes.get(ATTR_RESTORED))):
             msg = 'Entity id already exists: {}'.format(entity.entity_id)
             if entity.unique_id is not None:
                 msg += '. Platform {} does not generate unique IDs'.format(
@@ -360,6 +516,9 @@ class EntityPlatform:
         self.entities[entity_id] = entity
         entity.async_on_remove(lambda: self.entities.pop(entity_id))
 
+        entity.async_on_remove(async_get_polling_scheduler(
+            self.hass).async_schedule(self, entity))
+
         await entity.async_added_to_hass()
 
         await entity.async_update_ha_state()
@@ -381,42 +540,27 @@ class EntityPlatform:
 
         await asyncio.wait(tasks, loop=self.hass.loop)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
     async def async_remove_entity(self, entity_id):
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
 
-        # Clean up polling job if no longer needed
-        if (self._async_unsub_polling is not None and
-                not any(entity.should_poll for entity
-                        in self.entities.values())):
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
-    async def _update_entity_states(self, now):
-        """Update the states of all the polling entities.
-
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
+    @callback
+    def async_report_polling_lag(self, lag):
+        """Report that an entity update started late.
 
         This method must be run in the event loop.
         """
-        if self._process_updates.locked():
-            self.logger.warning(
-                "Updating %s %s took longer than the scheduled update "
-                "interval %s", self.platform_name, self.domain,
-                self.scan_interval)
-            return
+        self.polling_lag = lag
 
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
+        now = dt_util.utcnow()
+        if self._polling_lag_warned is not None and \
+                now - self._polling_lag_warned < POLLING_LAG_WARNING_INTERVAL:
+            log = self.logger.debug
+        else:
+            log = self.logger.warning
+            self._polling_lag_warned = now
 
-            if tasks:
-                await asyncio.wait(tasks, loop=self.hass.loop)
+        log("Updating %s %s took longer than the scheduled update "
+            "interval %s, the next update started %.1f seconds late",
+            self.platform_name, self.domain, self.scan_interval,
+            lag.total_seconds())
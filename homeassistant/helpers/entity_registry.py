@@ -16,6 +16,7 @@ import weakref
 
 import attr
 
+from homeassistant.const import ATTR_RESTORED
 from homeassistant.core import callback, split_entity_id, valid_entity_id
 from homeassistant.loader import bind_hass
 from homeassistant.util import ensure_unique_string, slugify
@@ -109,11 +110,16 @@ class EntityRegistry:
         """Generate an entity ID that does not conflict.
 
         Conflicts checked against registered and currently existing entities.
+        Restored states are not conflicts, they are taken over by the entity
+        that is added.
         """
+        states = self.hass.states
         return ensure_unique_string(
             '{}.{}'.format(domain, slugify(suggested_object_id)),
             chain(self.entities.keys(),
-                  self.hass.states.async_entity_ids(domain),
+                  (entity_id for entity_id in states.async_entity_ids(domain)
+                   if not states.get(entity_id).attributes.get(
+                       ATTR_RESTORED)),
                   known_object_ids if known_object_ids else [])
         )
 
@@ -1,16 +1,22 @@
 """Helpers for listening to events."""
 from datetime import timedelta
 import functools as ft
+import logging
 
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.sun import get_astral_event_next
-from ..core import HomeAssistant, callback
+from ..core import HomeAssistant, HassJob, callback
 from ..const import (
     ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL,
     SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET)
 from ..util import dt as dt_util
 from ..util.async_ import run_callback_threadsafe
 
+TRACK_STATE_CHANGE_CALLBACKS = 'track_state_change_callbacks'
+TRACK_STATE_CHANGE_LISTENER = 'track_state_change_listener'
+
+_LOGGER = logging.getLogger(__name__)
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -50,6 +56,7 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
 
     Must be run within the event loop.
     """
+    job = HassJob(action)
     match_from_state = _process_state_match(from_state)
     match_to_state = _process_state_match(to_state)
 
@@ -64,10 +71,6 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
     @callback
     def state_change_listener(event):
         """Handle specific state changes."""
-        if entity_ids != MATCH_ALL and \
-           event.data.get('entity_id') not in entity_ids:
-            return
-
         old_state = event.data.get('old_state')
         if old_state is not None:
             old_state = old_state.state
@@ -77,20 +80,82 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
             new_state = new_state.state
 
         if match_from_state(old_state) and match_to_state(new_state):
-            hass.async_run_job(action, event.data.get('entity_id'),
-                               event.data.get('old_state'),
-                               event.data.get('new_state'))
+            hass.async_run_hass_job(job, event.data.get('entity_id'),
+                                    event.data.get('old_state'),
+                                    event.data.get('new_state'))
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    if entity_ids == MATCH_ALL:
+        return hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_listener)
+
+    return _async_dispatch_state_change(
+        hass, entity_ids, state_change_listener)
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
 
 
+@callback
+def _async_dispatch_state_change(hass, entity_ids, action):
+    """Call action with the state changed events of entity_ids.
+
+    All trackers share a single state changed listener that looks up the
+    trackers of the changed entity, instead of every tracker being called
+    for every state change.
+    """
+    entity_ids = frozenset(entity_ids)
+    entity_callbacks = hass.data.get(TRACK_STATE_CHANGE_CALLBACKS)
+
+    if entity_callbacks is None:
+        entity_callbacks = hass.data[TRACK_STATE_CHANGE_CALLBACKS] = {}
+
+    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
+        @callback
+        def state_change_dispatcher(event):
+            """Dispatch a state change to the trackers of the entity."""
+            actions = entity_callbacks.get(event.data.get('entity_id'))
+
+            if actions is None:
+                return
+
+            for state_action in list(actions):
+                try:
+                    state_action(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error while processing state changed "
+                                      "for %s", event.data.get('entity_id'))
+
+        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_dispatcher)
+
+    for entity_id in entity_ids:
+        entity_callbacks.setdefault(entity_id, []).append(action)
+
+    @callback
+    def remove_listener():
+        """Remove state change listener."""
+        for entity_id in entity_ids:
+            actions = entity_callbacks.get(entity_id)
+
+            if actions is None or action not in actions:
+                continue
+
+            actions.remove(action)
+            if not actions:
+                del entity_callbacks[entity_id]
+
+        if not entity_callbacks and \
+                TRACK_STATE_CHANGE_LISTENER in hass.data:
+            hass.data.pop(TRACK_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
+
+
 @callback
 @bind_hass
 def async_track_template(hass, template, action, variables=None):
     """Add a listener that track state changes with template condition."""
+    job = HassJob(action)
     from . import condition
 
     # Local variable to keep track of if the action has already been triggered
@@ -105,7 +170,7 @@ def async_track_template(hass, template, action, variables=None):
         # Check to see if template returns true
         if template_result and not already_triggered:
             already_triggered = True
-            hass.async_run_job(action, entity_id, from_s, to_s)
+            hass.async_run_hass_job(job, entity_id, from_s, to_s)
         elif not template_result:
             already_triggered = False
 
@@ -126,6 +191,7 @@ def async_track_same_state(hass, period, action, async_check_same_func,
     If async_check_func is None it use the state of orig_value.
     Without entity_ids we track all state changes.
     """
+    job = HassJob(action)
     async_remove_state_for_cancel = None
     async_remove_state_for_listener = None
 
@@ -147,7 +213,7 @@ def async_track_same_state(hass, period, action, async_check_same_func,
         nonlocal async_remove_state_for_listener
         async_remove_state_for_listener = None
         clear_listener()
-        hass.async_run_job(action)
+        hass.async_run_hass_job(job)
 
     @callback
     def state_for_cancel_listener(entity, from_state, to_state):
@@ -171,12 +237,13 @@ track_same_state = threaded_listener_factory(async_track_same_state)
 @bind_hass
 def async_track_point_in_time(hass, action, point_in_time):
     """Add a listener that fires once after a specific point in time."""
+    job = HassJob(action)
     utc_point_in_time = dt_util.as_utc(point_in_time)
 
     @callback
     def utc_converter(utc_now):
         """Convert passed in UTC now to local now."""
-        hass.async_run_job(action, dt_util.as_local(utc_now))
+        hass.async_run_hass_job(job, dt_util.as_local(utc_now))
 
     return async_track_point_in_utc_time(hass, utc_converter,
                                          utc_point_in_time)
@@ -189,6 +256,7 @@ track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 @bind_hass
 def async_track_point_in_utc_time(hass, action, point_in_time):
     """Add a listener that fires once after a specific point in UTC time."""
+    job = HassJob(action)
     # Ensure point_in_time is UTC
     point_in_time = dt_util.as_utc(point_in_time)
 
@@ -208,7 +276,7 @@ def async_track_point_in_utc_time(hass, action, point_in_time):
         point_in_time_listener.run = True
         async_unsub()
 
-        hass.async_run_job(action, now)
+        hass.async_run_hass_job(job, now)
 
     async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED,
                                         point_in_time_listener)
@@ -232,10 +300,33 @@ call_later = threaded_listener_factory(
     async_call_later)
 
 
+@callback
+@bind_hass
+def async_call_at(hass, point_in_time, action):
+    """Call action at point_in_time using a timer of the event loop.
+
+    Unlike async_track_point_in_utc_time this does not listen to the time
+    changed events, so there is no cost while waiting.
+    """
+    job = HassJob(action)
+    delay = (dt_util.as_utc(point_in_time) - dt_util.utcnow()).total_seconds()
+    handle = hass.loop.call_later(
+        max(delay, 0), _async_run_timer, hass, job, point_in_time)
+
+    return handle.cancel
+
+
+@callback
+def _async_run_timer(hass, job, point_in_time):
+    """Run the job of a timer scheduled by async_call_at."""
+    hass.async_run_hass_job(job, dt_util.as_utc(point_in_time))
+
+
 @callback
 @bind_hass
 def async_track_time_interval(hass, action, interval):
     """Add a listener that fires repetitively at every timedelta interval."""
+    job = HassJob(action)
     remove = None
 
     def next_interval():
@@ -248,7 +339,7 @@ def async_track_time_interval(hass, action, interval):
         nonlocal remove
         remove = async_track_point_in_utc_time(
             hass, interval_listener, next_interval())
-        hass.async_run_job(action, now)
+        hass.async_run_hass_job(job, now)
 
     remove = async_track_point_in_utc_time(
         hass, interval_listener, next_interval())
@@ -267,6 +358,7 @@ track_time_interval = threaded_listener_factory(async_track_time_interval)
 @bind_hass
 def async_track_sunrise(hass, action, offset=None):
     """Add a listener that will fire a specified offset from sunrise daily."""
+    job = HassJob(action)
     remove = None
 
     @callback
@@ -276,7 +368,7 @@ def async_track_sunrise(hass, action, offset=None):
         remove = async_track_point_in_utc_time(
             hass, sunrise_automation_listener, get_astral_event_next(
                 hass, SUN_EVENT_SUNRISE, offset=offset))
-        hass.async_run_job(action)
+        hass.async_run_hass_job(job)
 
     remove = async_track_point_in_utc_time(
         hass, sunrise_automation_listener, get_astral_event_next(
@@ -296,6 +388,7 @@ track_sunrise = threaded_listener_factory(async_track_sunrise)
 @bind_hass
 def async_track_sunset(hass, action, offset=None):
     """Add a listener that will fire a specified offset from sunset daily."""
+    job = HassJob(action)
     remove = None
 
     @callback
@@ -305,7 +398,7 @@ def async_track_sunset(hass, action, offset=None):
         remove = async_track_point_in_utc_time(
             hass, sunset_automation_listener, get_astral_event_next(
                 hass, SUN_EVENT_SUNSET, offset=offset))
-        hass.async_run_job(action)
+        hass.async_run_hass_job(job)
 
     remove = async_track_point_in_utc_time(
         hass, sunset_automation_listener, get_astral_event_next(
@@ -327,13 +420,14 @@ def async_track_utc_time_change(hass, action,
                                 hour=None, minute=None, second=None,
                                 local=False):
     """Add a listener that will fire if time matches a pattern."""
+    job = HassJob(action)
     # We do not have to wrap the function with time pattern matching logic
     # if no pattern given
     if all(val is None for val in (hour, minute, second)):
         @callback
         def time_change_listener(event):
             """Fire every time event that comes in."""
-            hass.async_run_job(action, event.data[ATTR_NOW])
+            hass.async_run_hass_job(job, event.data[ATTR_NOW])
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
@@ -370,7 +464,8 @@ def async_track_utc_time_change(hass, action,
         last_now = now
 
         if next_time <= now:
-            hass.async_run_job(action, dt_util.as_local(now) if local else now)
+            hass.async_run_hass_job(
+                job, dt_util.as_local(now) if local else now)
             calculate_next(now + timedelta(seconds=1))
 
     # We can't use async_track_point_in_utc_time here because it would
@@ -1,19 +1,22 @@
 """Support for restoring entity states on startup."""
 import asyncio
+import json
 import logging
+import os
 from datetime import timedelta, datetime
-from typing import Any, Dict, List, Set, Optional  # noqa  pylint_disable=unused-import
+from typing import (  # noqa  pylint_disable=unused-import
+    Any, Dict, List, Set, Optional, Tuple)
 
 from homeassistant.core import (
-    HomeAssistant, callback, State, CoreState, valid_entity_id)
+    POOL_CORE, HomeAssistant, callback, State, CoreState, valid_entity_id)
 from homeassistant.const import (
-    EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP)
+    ATTR_RESTORED, EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP)
 import homeassistant.util.dt as dt_util
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.json import JSONEncoder
-from homeassistant.helpers.storage import Store  # noqa  pylint_disable=unused-import
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 
 DATA_RESTORE_STATE_TASK = 'restore_state_task'
 
@@ -21,6 +24,12 @@ _LOGGER = logging.getLogger(__name__)
 
 STORAGE_KEY = 'core.restore_state'
 STORAGE_VERSION = 1
+# Stored states are kept with the generation of the journal that extends them
+STATES_STORAGE_VERSION = 2
+# Stored states that changed since they were last written to the store
+JOURNAL_KEY = 'core.restore_state.journal'
+# Snapshot of the state machine written at shutdown to seed the next start
+SNAPSHOT_STORAGE_KEY = 'core.state_snapshot'
 
 # How long between periodically saving the current states to disk
 STATE_DUMP_INTERVAL = timedelta(minutes=15)
@@ -28,6 +37,10 @@ STATE_DUMP_INTERVAL = timedelta(minutes=15)
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# How long at most between writing all stored states, which refreshes the
+# last seen time of unchanged states
+STATE_COMPACT_INTERVAL = timedelta(days=1)
+
 
 class StoredState:
     """Object to represent a stored state."""
@@ -37,6 +50,11 @@ class StoredState:
         self.state = state
         self.last_seen = last_seen
 
+    @property
+    def entity_id(self) -> str:
+        """Return the entity id of the stored state."""
+        return self.state.entity_id
+
     def as_dict(self) -> Dict:
         """Return a dict representation of the stored state."""
         return {
@@ -55,6 +73,123 @@ class StoredState:
         return cls(State.from_dict(json_dict['state']), last_seen)
 
 
+class LazyStoredState(StoredState):
+    """Stored state from the previous run that is parsed on first access.
+
+    Most stored states are never restored, or are restored long after
+    startup. Keeping the raw dict avoids parsing them all while loading and
+    allows writing them back unchanged.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, json_dict: Dict) -> None:
+        """Initialize a new lazy stored state."""
+        self._json_dict = json_dict
+        self._state = None  # type: Optional[State]
+        self._last_seen = None  # type: Optional[datetime]
+
+    @property
+    def state(self) -> State:  # type: ignore
+        """Return the stored state."""
+        if self._state is None:
+            self._state = State.from_dict(self._json_dict['state'])
+        return self._state
+
+    @property
+    def last_seen(self) -> datetime:  # type: ignore
+        """Return when the entity was last seen."""
+        if self._last_seen is None:
+            last_seen = self._json_dict['last_seen']
+
+            if isinstance(last_seen, str):
+                last_seen = dt_util.parse_datetime(last_seen)
+
+            self._last_seen = last_seen
+        return self._last_seen
+
+    @property
+    def entity_id(self) -> str:
+        """Return the entity id without parsing the stored state."""
+        return self._json_dict['state']['entity_id']
+
+    def as_dict(self) -> Dict:
+        """Return the dict this stored state was loaded from."""
+        return self._json_dict
+
+
+class RestoreStateStore(Store):
+    """Store of all stored states and the generation of their journal."""
+
+    async def _async_migrate_func(self, old_version, old_data):
+        """Migrate the plain list of stored states of version 1."""
+        return {'generation': 0, 'states': old_data}
+
+
+class StateJournal:
+    """Append only log of the stored states that changed between dumps.
+
+    Each line is the JSON record of one stored state that changed or was
+    removed. Records of another generation than the store are outdated.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the journal."""
+        self.hass = hass
+        self.key = key
+
+    @property
+    def path(self) -> str:
+        """Return the path of the journal."""
+        return self.hass.config.path(STORAGE_DIR, self.key)
+
+    async def async_load(self) -> List[Dict]:
+        """Load the records of the journal."""
+        return await self.hass.async_add_executor_job(
+            self._read, pool=POOL_CORE)
+
+    async def async_append(self, records: List[Dict]) -> None:
+        """Append records to the journal."""
+        await self.hass.async_add_executor_job(
+            self._append, records, pool=POOL_CORE)
+
+    async def async_clear(self) -> None:
+        """Remove all records of the journal."""
+        await self.hass.async_add_executor_job(
+            self._clear, pool=POOL_CORE)
+
+    def _read(self) -> List[Dict]:
+        """Read the records of the journal."""
+        records = []
+        try:
+            with open(self.path, encoding='utf-8') as fil:
+                for line in fil:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # The last record is cut off if writing it failed
+                        _LOGGER.warning("Skipping invalid record in %s",
+                                        self.key)
+        except FileNotFoundError:
+            pass
+        return records
+
+    def _append(self, records: List[Dict]) -> None:
+        """Write records at the end of the journal."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lines = ''.join(
+            json.dumps(record, separators=(',', ':'), cls=JSONEncoder) + '\n'
+            for record in records)
+        with open(self.path, 'a', encoding='utf-8') as fil:
+            fil.write(lines)
+
+    def _clear(self) -> None:
+        """Remove the journal."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
 class RestoreStateData():
     """Helper class for managing the helper saved data."""
 
@@ -70,19 +205,20 @@ class RestoreStateData():
                 data = cls(hass)
 
                 try:
-                    stored_states = await data.store.async_load()
+                    stored = await data.store.async_load()
                 except HomeAssistantError as exc:
                     _LOGGER.error("Error loading last states", exc_info=exc)
-                    stored_states = None
+                    stored = None
 
-                if stored_states is None:
+                if stored is None:
                     _LOGGER.debug('Not creating cache - no saved states found')
                     data.last_states = {}
                 else:
                     data.last_states = {
-                        item['state']['entity_id']: StoredState.from_dict(item)
-                        for item in stored_states
+                        item['state']['entity_id']: LazyStoredState(item)
+                        for item in stored['states']
                         if valid_entity_id(item['state']['entity_id'])}
+                    await data.async_replay_journal(stored['generation'])
                     _LOGGER.debug(
                         'Created cache with %s', list(data.last_states))
 
@@ -102,11 +238,24 @@ class RestoreStateData():
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the restore state data class."""
         self.hass = hass  # type: HomeAssistant
-        self.store = Store(
-            hass, STORAGE_VERSION, STORAGE_KEY,
-            encoder=JSONEncoder)  # type: Store
+        self.store = RestoreStateStore(
+            hass, STATES_STORAGE_VERSION, STORAGE_KEY,
+            encoder=JSONEncoder, compact=True)  # type: Store
+        self.journal = StateJournal(hass, JOURNAL_KEY)
+        self.snapshot_store = Store(
+            hass, STORAGE_VERSION, SNAPSHOT_STORAGE_KEY,
+            encoder=JSONEncoder, compact=True)  # type: Store
         self.last_states = {}  # type: Dict[str, StoredState]
         self.entity_ids = set()  # type: Set[str]
+        # Serialized states by entity id, reused while the state is unchanged
+        self._state_dicts = {}  # type: Dict[str, Tuple[State, Dict]]
+        # What the last dump was made of by entity id, to find the changes
+        self._dumped = {}  # type: Dict[str, Any]
+        self._dump_lock = asyncio.Lock(loop=hass.loop)
+        # Generation of the store, the journal records extend it
+        self._generation = 0
+        self._journal_size = 0
+        self._compacted_at = None  # type: Optional[datetime]
 
     def async_get_stored_states(self) -> List[StoredState]:
         """Get the set of states which should be stored.
@@ -115,13 +264,24 @@ class RestoreStateData():
         stored states from the previous run, which have not been created as
         entities on this run, and have not expired.
         """
+        current_states, previous_states = self._async_split_stored_states()
+        return current_states + previous_states
+
+    @callback
+    def _async_split_stored_states(
+            self) -> Tuple[List[StoredState], List[StoredState]]:
+        """Get the states to store of this run and of previous runs."""
         now = dt_util.utcnow()
         all_states = self.hass.states.async_all()
-        current_entity_ids = set(state.entity_id for state in all_states)
+        # Placeholder states don't replace the stored state of the entity
+        current_entity_ids = set(
+            state.entity_id for state in all_states
+            if not state.attributes.get(ATTR_RESTORED))
 
         # Start with the currently registered states
-        stored_states = [StoredState(state, now) for state in all_states
-                         if state.entity_id in self.entity_ids]
+        current_states = [StoredState(state, now) for state in all_states
+                          if state.entity_id in self.entity_ids]
+        previous_states = []
 
         expiration_time = now - STATE_EXPIRATION
 
@@ -134,19 +294,194 @@ class RestoreStateData():
             if stored_state.last_seen < expiration_time:
                 continue
 
-            stored_states.append(stored_state)
+            previous_states.append(stored_state)
+
+        return current_states, previous_states
+
+    async def async_replay_journal(self, generation: int) -> None:
+        """Apply the journal records of a generation to the last states."""
+        self._generation = generation
+
+        try:
+            records = await self.journal.async_load()
+        except OSError as exc:
+            _LOGGER.error("Error loading changed states", exc_info=exc)
+            return
+
+        for record in records:
+            if record.get('generation') != generation:
+                continue
+
+            entity_id = record['entity_id']
+            if record['stored'] is None:
+                self.last_states.pop(entity_id, None)
+            elif valid_entity_id(entity_id):
+                self.last_states[entity_id] = LazyStoredState(
+                    record['stored'])
 
-        return stored_states
+    async def async_dump_states(self, force: bool = False) -> None:
+        """Save the current state machine to storage.
 
-    async def async_dump_states(self) -> None:
-        """Save the current state machine to storage."""
+        Only the stored states that changed since the last dump are appended
+        to the journal. All stored states are written to the store instead,
+        and the journal is cleared, when forced, when the journal would hold
+        more records than there are stored states, or once a day.
+        """
+        async with self._dump_lock:
+            current_states, previous_states = \
+                self._async_split_stored_states()
+            # States are immutable, so identity tells if anything changed
+            dumped = {
+                stored_state.entity_id: stored_state.state
+                for stored_state in current_states}  # type: Dict[str, Any]
+            for stored_state in previous_states:
+                dumped[stored_state.entity_id] = stored_state
+
+            changed = [entity_id for entity_id, dumped_state in dumped.items()
+                       if self._dumped.get(entity_id) is not dumped_state]
+            removed = [entity_id for entity_id in self._dumped
+                       if entity_id not in dumped]
+
+            if not force and not changed and not removed:
+                _LOGGER.debug("Skipping dump, no states changed")
+                return
+
+            # Only keep the serialized states of current entities
+            state_dicts = {}  # type: Dict[str, Tuple[State, Dict]]
+            stored_dicts = {
+                stored_state.entity_id:
+                self._async_state_dict(stored_state, state_dicts)
+                for stored_state in current_states}
+            for stored_state in previous_states:
+                stored_dicts[stored_state.entity_id] = stored_state.as_dict()
+            self._state_dicts = state_dicts
+
+            now = dt_util.utcnow()
+            if force or self._compacted_at is None or \
+                    now - self._compacted_at >= STATE_COMPACT_INTERVAL or \
+                    self._journal_size + len(changed) + len(removed) > \
+                    len(dumped):
+                written = await self._async_write_states(
+                    list(stored_dicts.values()), now)
+            else:
+                written = await self._async_append_journal([
+                    {
+                        'generation': self._generation,
+                        'entity_id': entity_id,
+                        'stored': stored_dicts.get(entity_id),
+                    }
+                    for entity_id in changed + removed])
+
+            if written:
+                self._dumped = dumped
+
+    async def _async_write_states(self, stored_dicts: List[Dict],
+                                  now: datetime) -> bool:
+        """Write all stored states to the store and clear the journal."""
         _LOGGER.debug("Dumping states")
+        generation = self._generation + 1
+
         try:
-            await self.store.async_save([
-                stored_state.as_dict()
-                for stored_state in self.async_get_stored_states()])
+            await self.store.async_save({
+                'generation': generation,
+                'states': stored_dicts,
+            })
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
+            return False
+
+        # Records left in the journal belong to the previous generation
+        self._generation = generation
+        self._journal_size = 0
+        self._compacted_at = now
+
+        try:
+            await self.journal.async_clear()
+        except OSError as exc:
+            _LOGGER.error("Error clearing changed states", exc_info=exc)
+
+        return True
+
+    async def _async_append_journal(self, records: List[Dict]) -> bool:
+        """Append the records of changed states to the journal."""
+        _LOGGER.debug("Dumping %s changed states", len(records))
+
+        try:
+            await self.journal.async_append(records)
+        except OSError as exc:
+            _LOGGER.error("Error saving changed states", exc_info=exc)
+            return False
+
+        self._journal_size += len(records)
+        return True
+
+    async def async_dump_snapshot(self) -> None:
+        """Save the state machine to seed it on the next start."""
+        _LOGGER.debug("Dumping state snapshot")
+        try:
+            await self.snapshot_store.async_save([
+                {
+                    'entity_id': state.entity_id,
+                    'state': state.state,
+                    'attributes': dict(state.attributes),
+                    'last_changed': state.last_changed,
+                }
+                for state in self.hass.states.async_all()
+                if not state.attributes.get(ATTR_RESTORED)])
+        except HomeAssistantError as exc:
+            _LOGGER.error("Error saving state snapshot", exc_info=exc)
+
+    async def async_restore_snapshot(self) -> None:
+        """Seed the state machine with the snapshot of the last run.
+
+        The states are flagged as restored until they are set again. The
+        snapshot is cleared, so it is not used again after a crash.
+        """
+        try:
+            snapshot = await self.snapshot_store.async_load()
+        except HomeAssistantError as exc:
+            _LOGGER.error("Error loading state snapshot", exc_info=exc)
+            return
+
+        if not snapshot:
+            return
+
+        for item in snapshot:
+            try:
+                state = State.from_dict(item)
+            except HomeAssistantError:
+                continue
+            if state is None:
+                continue
+
+            attributes = dict(state.attributes)
+            attributes[ATTR_RESTORED] = True
+            self.hass.states.async_restore(State(
+                state.entity_id, state.state, attributes, state.last_changed))
+
+        _LOGGER.debug("Restored %s states from snapshot", len(snapshot))
+        self.hass.async_create_task(self.snapshot_store.async_save([]))
+
+    @callback
+    def _async_state_dict(
+            self, stored_state: StoredState,
+            state_dicts: Dict[str, Tuple[State, Dict]]) -> Dict:
+        """Return the dict of a current state, reusing unchanged states.
+
+        The serialized state is added to state_dicts for the next dump.
+        """
+        state = stored_state.state
+        cached = self._state_dicts.get(state.entity_id)
+
+        if cached is None or cached[0] is not state:
+            cached = (state, state.as_dict())
+
+        state_dicts[state.entity_id] = cached
+
+        return {
+            'state': cached[1],
+            'last_seen': stored_state.last_seen,
+        }
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
@@ -161,10 +496,13 @@ class RestoreStateData():
             self.hass, lambda *_: self.hass.async_create_task(
                 self.async_dump_states()), STATE_DUMP_INTERVAL)
 
-        # Dump states when stopping hass
+        # Dump states when stopping hass, this also refreshes last_seen
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, lambda *_: self.hass.async_create_task(
+                self.async_dump_states(force=True)))
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_STOP, lambda *_: self.hass.async_create_task(
-                self.async_dump_states()))
+                self.async_dump_snapshot()))
 
     @callback
     def async_restore_entity_added(self, entity_id: str) -> None:
@@ -1,20 +1,21 @@
 """Helpers to execute scripts."""
 
 import logging
-from contextlib import suppress
 from itertools import islice
-from typing import Optional, Sequence
+from time import monotonic
+from typing import (  # noqa: F401 pylint: disable=unused-import
+    Any, Dict, List, Optional, Sequence)
 
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant, Context, callback
-from homeassistant.const import CONF_CONDITION, CONF_TIMEOUT
+from homeassistant.core import (
+    CALLBACK_TYPE, HomeAssistant, Context, callback)
+from homeassistant.const import CONF_CONDITION, CONF_MODE, CONF_TIMEOUT
 from homeassistant import exceptions
 from homeassistant.helpers import (
     service, condition, template as template,
     config_validation as cv)
-from homeassistant.helpers.event import (
-    async_track_point_in_utc_time, async_track_template)
+from homeassistant.helpers.event import async_call_at, async_track_template
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as date_util
 from homeassistant.util.async_ import (
@@ -32,6 +33,22 @@ CONF_EVENT_DATA_TEMPLATE = 'event_data_template'
 CONF_DELAY = 'delay'
 CONF_WAIT_TEMPLATE = 'wait_template'
 CONF_CONTINUE = 'continue_on_timeout'
+CONF_MAX = 'max'
+
+# Running the script again continues a run that waits at a delay
+RUN_MODE_LEGACY = 'legacy'
+# Runs wait for the previous run to finish
+RUN_MODE_QUEUED = 'queued'
+# Runs are executed at the same time
+RUN_MODE_PARALLEL = 'parallel'
+RUN_MODES = [RUN_MODE_LEGACY, RUN_MODE_QUEUED, RUN_MODE_PARALLEL]
+
+DEFAULT_MAX_RUNS = 10
+
+SCRIPT_MODE_SCHEMA = {
+    vol.Optional(CONF_MODE, default=RUN_MODE_LEGACY): vol.In(RUN_MODES),
+    vol.Optional(CONF_MAX, default=DEFAULT_MAX_RUNS): cv.positive_int,
+}
 
 
 ACTION_DELAY = 'delay'
@@ -73,24 +90,89 @@ class _SuspendScript(Exception):
     """Throw if script needs to suspend."""
 
 
+class _ScriptRun:
+    """A single run of a script."""
+
+    def __init__(self, variables: Optional[Sequence],
+                 context: Optional[Context]) -> None:
+        """Initialize the run."""
+        self.variables = variables
+        self.context = context
+        self.cur = 0
+        self.stopped = False
+        self.last_action = None  # type: Optional[str]
+        # Duration of every step that was executed
+        self.steps = []  # type: List[Dict[str, Any]]
+        self._listeners = []  # type: List[CALLBACK_TYPE]
+        self._step = 0
+        self._step_start = None  # type: Optional[float]
+
+    @callback
+    def async_start_step(self, step: int) -> None:
+        """Start timing a step."""
+        self._step = step
+        self._step_start = monotonic()
+
+    @callback
+    def async_end_step(self) -> None:
+        """Record the duration of the current step."""
+        if self._step_start is None:
+            return
+
+        self.steps.append({
+            'step': self._step + 1,
+            'action': self.last_action,
+            'duration': monotonic() - self._step_start,
+        })
+        self._step_start = None
+
+    @property
+    def suspended(self) -> bool:
+        """Return if the run waits for a delay or template."""
+        return bool(self._listeners)
+
+    @callback
+    def async_add_listener(self, remove: CALLBACK_TYPE) -> None:
+        """Keep track of a listener the run waits for."""
+        self._listeners.append(remove)
+
+    @callback
+    def async_remove_listeners(self) -> None:
+        """Remove the listeners the run waits for."""
+        for remove in self._listeners:
+            remove()
+        self._listeners.clear()
+
+
 class Script():
     """Representation of a script."""
 
     def __init__(self, hass: HomeAssistant, sequence, name: str = None,
-                 change_listener=None) -> None:
-        """Initialize the script."""
+                 change_listener=None, run_mode: str = RUN_MODE_LEGACY,
+                 max_runs: int = DEFAULT_MAX_RUNS) -> None:
+        """Initialize the script.
+
+        In the legacy run mode, running the script while it waits at a
+        delay or wait template continues with the next step. Running it
+        while a step is executed starts another run. The other run modes
+        allow up to max_runs runs to be running or queued.
+        """
         self.hass = hass
         self.sequence = sequence
         template.attach(hass, self.sequence)
         self.name = name
+        self.run_mode = run_mode
+        self.max_runs = max_runs
         self._change_listener = change_listener
-        self._cur = -1
+        self._runs = []  # type: List[_ScriptRun]
+        self._queue = []  # type: List[_ScriptRun]
         self._exception_step = None
         self.last_action = None
         self.last_triggered = None
+        # Step durations of the last run that finished
+        self.last_run_steps = []  # type: List[Dict[str, Any]]
         self.can_cancel = any(CONF_DELAY in action or CONF_WAIT_TEMPLATE
                               in action for action in self.sequence)
-        self._async_listener = []
         self._template_cache = {}
         self._config_cache = {}
         self._actions = {
@@ -104,7 +186,12 @@ class Script():
     @property
     def is_running(self) -> bool:
         """Return true if script is on."""
-        return self._cur != -1
+        return bool(self._runs)
+
+    @property
+    def runs(self) -> int:
+        """Return the number of runs that are running or queued."""
+        return len(self._runs) + len(self._queue)
 
     def run(self, variables=None, context=None):
         """Run script."""
@@ -115,40 +202,98 @@ class Script():
                         context: Optional[Context] = None) -> None:
         """Run script.
 
+        Returns once the run finished or waits for a delay or template,
+        the rest of the run continues in the background.
+
         This method is a coroutine.
         """
         self.last_triggered = date_util.utcnow()
-        if self._cur == -1:
-            self._log('Running script')
-            self._cur = 0
 
-        # Unregister callback if we were in a delay or wait but turn on is
-        # called again. In that case we just continue execution.
-        self._async_remove_listener()
+        if self.run_mode == RUN_MODE_LEGACY:
+            # Continue a run that is waiting with the new variables. A run
+            # that is executing a step is left alone, a new run is started.
+            for run in self._runs:
+                if run.suspended:
+                    run.async_remove_listeners()
+                    run.variables = variables
+                    run.context = context
+                    await self._async_run_steps(run)
+                    return
+
+        if self.runs >= self.max_runs:
+            _LOGGER.warning("Script %s already has %s runs, not running it "
+                            "again", self.name, self.runs)
+            return
+
+        run = _ScriptRun(variables, context)
 
-        for cur, action in islice(enumerate(self.sequence), self._cur, None):
+        if self.run_mode == RUN_MODE_QUEUED and self._runs:
+            self._queue.append(run)
+            return
+
+        self._runs.append(run)
+        self._log('Running script')
+        await self._async_run_steps(run)
+
+    async def _async_run_steps(self, run: _ScriptRun) -> None:
+        """Execute the steps of a run from the current step."""
+        if run.stopped:
+            return
+
+        # Waiting at a delay or template was the previous step
+        run.async_end_step()
+
+        for cur, action in islice(enumerate(self.sequence), run.cur, None):
+            run.async_start_step(cur)
             try:
-                await self._handle_action(action, variables, context)
+                await self._handle_action(run, action)
             except _SuspendScript:
                 # Store next step to take and notify change listeners
-                self._cur = cur + 1
+                run.cur = cur + 1
                 if self._change_listener:
                     self.hass.async_add_job(self._change_listener)
                 return
             except _StopScript:
+                run.async_end_step()
                 break
             except Exception:
                 # Store the step that had an exception
                 self._exception_step = cur
-                # Set script to not running
-                self._cur = -1
-                self.last_action = None
+                self._async_end_run(run)
                 # Pass exception on.
                 raise
 
-        # Set script to not-running.
-        self._cur = -1
-        self.last_action = None
+            run.async_end_step()
+
+            if run.stopped:
+                return
+
+        self._async_end_run(run)
+
+    @callback
+    def _async_resume(self, run: _ScriptRun) -> None:
+        """Continue a run that waited for a delay or template."""
+        run.async_remove_listeners()
+        self.hass.async_create_task(self._async_run_steps(run))
+
+    @callback
+    def _async_end_run(self, run: _ScriptRun) -> None:
+        """Clean up a run that finished or was stopped."""
+        run.async_remove_listeners()
+        if run not in self._runs:
+            return
+
+        self._runs.remove(run)
+        self.last_run_steps = run.steps
+
+        if self._queue:
+            next_run = self._queue.pop(0)
+            self._runs.append(next_run)
+            self._log('Running script')
+            self.hass.async_create_task(self._async_run_steps(next_run))
+        elif not self._runs:
+            self.last_action = None
+
         if self._change_listener:
             self.hass.async_add_job(self._change_listener)
 
@@ -157,14 +302,20 @@ class Script():
         run_callback_threadsafe(self.hass.loop, self.async_stop).result()
 
     def async_stop(self) -> None:
-        """Stop running script."""
-        if self._cur == -1:
+        """Stop all runs and drop the queued runs."""
+        if not self._runs:
             return
 
-        self._cur = -1
-        self._async_remove_listener()
-        if self._change_listener:
-            self.hass.async_add_job(self._change_listener)
+        self._queue.clear()
+
+        for run in list(self._runs):
+            self._async_stop_run(run)
+
+    @callback
+    def _async_stop_run(self, run: _ScriptRun) -> None:
+        """Stop a single run."""
+        run.stopped = True
+        self._async_end_run(run)
 
     @callback
     def async_log_exception(self, logger, message_base, exception):
@@ -204,26 +355,18 @@ class Script():
         meth("%s. %s for %s at pos %s: %s",
              message_base, error_desc, action_type, step + 1, error)
 
-    async def _handle_action(self, action, variables, context):
+    @callback
+    def _async_set_last_action(self, run, last_action):
+        """Set the action that is being executed."""
+        run.last_action = self.last_action = last_action
+        self._log("Executing step %s" % last_action)
+
+    async def _handle_action(self, run, action):
         """Handle an action."""
-        await self._actions[_determine_action(action)](
-            action, variables, context)
+        await self._actions[_determine_action(action)](run, action)
 
-    async def _async_delay(self, action, variables, context):
+    async def _async_delay(self, run, action):
         """Handle delay."""
-        # Call ourselves in the future to continue work
-        unsub = None
-
-        @callback
-        def async_script_delay(now):
-            """Handle delay."""
-            # pylint: disable=cell-var-from-loop
-            with suppress(ValueError):
-                self._async_listener.remove(unsub)
-
-            self.hass.async_create_task(
-                self.async_run(variables, context))
-
         delay = action[CONF_DELAY]
 
         try:
@@ -231,90 +374,89 @@ class Script():
                 delay = vol.All(
                     cv.time_period,
                     cv.positive_timedelta)(
-                        delay.async_render(variables))
+                        delay.async_render(run.variables))
             elif isinstance(delay, dict):
                 delay_data = {}
                 delay_data.update(
-                    template.render_complex(delay, variables))
+                    template.render_complex(delay, run.variables))
                 delay = cv.time_period(delay_data)
         except (exceptions.TemplateError, vol.Invalid) as ex:
             _LOGGER.error("Error rendering '%s' delay template: %s",
                           self.name, ex)
             raise _StopScript
 
-        self.last_action = action.get(
-            CONF_ALIAS, 'delay {}'.format(delay))
-        self._log("Executing step %s" % self.last_action)
+        self._async_set_last_action(
+            run, action.get(CONF_ALIAS, 'delay {}'.format(delay)))
 
-        unsub = async_track_point_in_utc_time(
-            self.hass, async_script_delay,
-            date_util.utcnow() + delay
-        )
-        self._async_listener.append(unsub)
+        # Call ourselves in the future to continue work
+        @callback
+        def async_script_delay(now):
+            """Handle delay."""
+            self._async_resume(run)
+
+        run.async_add_listener(async_call_at(
+            self.hass, date_util.utcnow() + delay, async_script_delay))
         raise _SuspendScript
 
-    async def _async_wait_template(self, action, variables, context):
+    async def _async_wait_template(self, run, action):
         """Handle a wait template."""
         # Call ourselves in the future to continue work
         wait_template = action[CONF_WAIT_TEMPLATE]
         wait_template.hass = self.hass
 
-        self.last_action = action.get(CONF_ALIAS, 'wait template')
-        self._log("Executing step %s" % self.last_action)
+        self._async_set_last_action(
+            run, action.get(CONF_ALIAS, 'wait template'))
 
         # check if condition already okay
         if condition.async_template(
-                self.hass, wait_template, variables):
+                self.hass, wait_template, run.variables):
             return
 
         @callback
         def async_script_wait(entity_id, from_s, to_s):
             """Handle script after template condition is true."""
-            self._async_remove_listener()
-            self.hass.async_create_task(
-                self.async_run(variables, context))
+            self._async_resume(run)
 
-        self._async_listener.append(async_track_template(
-            self.hass, wait_template, async_script_wait, variables))
+        run.async_add_listener(async_track_template(
+            self.hass, wait_template, async_script_wait, run.variables))
 
         if CONF_TIMEOUT in action:
             self._async_set_timeout(
-                action, variables, context,
-                action.get(CONF_CONTINUE, True))
+                run, action, action.get(CONF_CONTINUE, True))
 
         raise _SuspendScript
 
-    async def _async_call_service(self, action, variables, context):
+    async def _async_call_service(self, run, action):
         """Call the service specified in the action.
 
         This method is a coroutine.
         """
-        self.last_action = action.get(CONF_ALIAS, 'call service')
-        self._log("Executing step %s" % self.last_action)
+        self._async_set_last_action(
+            run, action.get(CONF_ALIAS, 'call service'))
         await service.async_call_from_config(
             self.hass, action,
             blocking=True,
-            variables=variables,
+            variables=run.variables,
             validate_config=False,
-            context=context
+            context=run.context
         )
 
-    async def _async_fire_event(self, action, variables, context):
+    async def _async_fire_event(self, run, action):
         """Fire an event."""
-        self.last_action = action.get(CONF_ALIAS, action[CONF_EVENT])
-        self._log("Executing step %s" % self.last_action)
+        self._async_set_last_action(
+            run, action.get(CONF_ALIAS, action[CONF_EVENT]))
         event_data = dict(action.get(CONF_EVENT_DATA, {}))
         if CONF_EVENT_DATA_TEMPLATE in action:
             try:
                 event_data.update(template.render_complex(
-                    action[CONF_EVENT_DATA_TEMPLATE], variables))
+                    action[CONF_EVENT_DATA_TEMPLATE], run.variables))
             except exceptions.TemplateError as ex:
                 _LOGGER.error('Error rendering event data template: %s', ex)
 
         self.hass.bus.async_fire(action[CONF_EVENT],
-                                 event_data, context=context)
+                                 event_data, context=run.context)
 
-    async def _async_check_condition(self, action, variables, context):
+    async def _async_check_condition(self, run, action):
         """Test if condition is matching."""
         config_cache_key = frozenset((k, str(v)) for k, v in action.items())
         config = self._config_cache.get(config_cache_key)
@@ -322,45 +464,31 @@ class Script():
             config = condition.async_from_config(action, False)
             self._config_cache[config_cache_key] = config
 
-        self.last_action = action.get(CONF_ALIAS, action[CONF_CONDITION])
-        check = config(self.hass, variables)
-        self._log("Test condition {}: {}".format(self.last_action, check))
+        run.last_action = self.last_action = action.get(
+            CONF_ALIAS, action[CONF_CONDITION])
+        check = config(self.hass, run.variables)
+        self._log("Test condition {}: {}".format(run.last_action, check))
 
         if not check:
             raise _StopScript
 
-    def _async_set_timeout(self, action, variables, context,
-                           continue_on_timeout):
+    def _async_set_timeout(self, run, action, continue_on_timeout):
         """Schedule a timeout to abort or continue script."""
         timeout = action[CONF_TIMEOUT]
-        unsub = None
 
         @callback
         def async_script_timeout(now):
             """Call after timeout is retrieve."""
-            with suppress(ValueError):
-                self._async_listener.remove(unsub)
-
             # Check if we want to continue to execute
             # the script after the timeout
             if continue_on_timeout:
-                self.hass.async_create_task(
-                    self.async_run(variables, context))
+                self._async_resume(run)
             else:
                 self._log("Timeout reached, abort script.")
-                self.async_stop()
-
-        unsub = async_track_point_in_utc_time(
-            self.hass, async_script_timeout,
-            date_util.utcnow() + timeout
-        )
-        self._async_listener.append(unsub)
+                self._async_stop_run(run)
 
-    def _async_remove_listener(self):
-        """Remove point in time listener, if any."""
-        for unsub in self._async_listener:
-            unsub()
-        self._async_listener.clear()
+        run.async_add_listener(async_call_at(
+            self.hass, date_util.utcnow() + timeout, async_script_timeout))
 
     def _log(self, msg):
         """Logger helper."""
@@ -272,10 +272,8 @@ async def entity_service_call(hass, platforms, func, call, service_name='',
             if target_all_entities:
                 platforms_entities.append(list(platform.entities.values()))
             else:
-                platforms_entities.append([
-                    entity for entity in platform.entities.values()
-                    if entity.entity_id in entity_ids
-                ])
+                platforms_entities.append(
+                    _get_platform_entities(platform, entity_ids))
 
     elif target_all_entities:
         # If we target all entities, we will select all entities the user
@@ -287,11 +285,9 @@ async def entity_service_call(hass, platforms, func, call, service_name='',
 
     else:
         for platform in platforms:
-            platform_entities = []
-            for entity in platform.entities.values():
-                if entity.entity_id not in entity_ids:
-                    continue
+            platform_entities = _get_platform_entities(platform, entity_ids)
 
+            for entity in platform_entities:
                 if not entity_perms(entity.entity_id, POLICY_CONTROL):
                     raise Unauthorized(
                         context=call.context,
@@ -299,8 +295,6 @@ async def entity_service_call(hass, platforms, func, call, service_name='',
                         permission=POLICY_CONTROL
                     )
 
-                platform_entities.append(entity)
-
             platforms_entities.append(platform_entities)
 
     tasks = [
@@ -316,6 +310,22 @@ async def entity_service_call(hass, platforms, func, call, service_name='',
             future.result()  # pop exception if have
 
 
+def _get_platform_entities(platform, entity_ids):
+    """Return the entities of a platform that are in entity_ids.
+
+    Platforms index their entities by entity ID, so a call that targets a
+    few entities does not need to go over every entity of the platform.
+    """
+    entities = platform.entities
+
+    if len(entity_ids) < len(entities):
+        return [entities[entity_id] for entity_id in entity_ids
+                if entity_id in entities]
+
+    return [entity for entity_id, entity in entities.items()
+            if entity_id in entity_ids]
+
+
 async def _handle_service_platform_call(func, data, entities, context,
                                         required_features):
     """Handle a function call."""
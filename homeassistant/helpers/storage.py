@@ -1,17 +1,20 @@
 """Helper to help store data."""
 import asyncio
+from collections import OrderedDict
 from json import JSONEncoder
 import logging
 import os
-from typing import Dict, List, Optional, Callable, Union
+from typing import (  # noqa: F401 pylint: disable=unused-import
+    Any, Dict, List, Optional, Callable, Tuple, Union)
 
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import callback
+from homeassistant.core import POOL_CORE, callback
 from homeassistant.loader import bind_hass
 from homeassistant.util import json as json_util
 from homeassistant.helpers.event import async_call_later
 
 STORAGE_DIR = '.storage'
+DATA_STORAGE_WRITER = 'storage_writer'
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -43,21 +46,118 @@ async def async_migrator(hass, old_path, store, *,
     return config
 
 
+@callback
+def async_get_writer(hass) -> 'StorageWriter':
+    """Return the writer that writes the stores to disk."""
+    writer = hass.data.get(DATA_STORAGE_WRITER)
+    if writer is None:
+        writer = hass.data[DATA_STORAGE_WRITER] = StorageWriter(hass)
+    return writer
+
+
+class StorageWriter:
+    """Write the data of stores to disk in batches.
+
+    All stores that have data to write are written by a single executor job.
+    Data that is saved while a batch is being written is written in the next
+    batch. Saving a store again before it is written only writes the last
+    data.
+    """
+
+    def __init__(self, hass) -> None:
+        """Initialize the storage writer."""
+        self.hass = hass
+        # Path -> store, data to write and future that is done when written
+        self._pending = OrderedDict(
+        )  # type: Dict[str, Tuple[Store, Dict, asyncio.Future]]
+        self._flush_task = None  # type: Optional[asyncio.Task]
+        self._stats = {}  # type: Dict[str, Dict[str, int]]
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return the number of writes and bytes written per store."""
+        return {key: dict(stats) for key, stats in self._stats.items()}
+
+    async def async_write(self, store: 'Store', data: Dict) -> None:
+        """Write the data of a store in the next batch."""
+        pending = self._pending.get(store.path)
+        if pending is None:
+            future = self.hass.loop.create_future()
+        else:
+            future = pending[2]
+        self._pending[store.path] = (store, data, future)
+
+        if self._flush_task is None:
+            self._flush_task = self.hass.async_create_task(self._async_flush())
+
+        await asyncio.shield(future)
+
+    async def _async_flush(self) -> None:
+        """Write batches until there is nothing left to write."""
+        try:
+            while self._pending:
+                # Let stores that are saved in the same iteration join
+                await asyncio.sleep(0)
+                batch = list(self._pending.values())
+                self._pending = OrderedDict()
+
+                try:
+                    written = await self.hass.async_add_executor_job(
+                        self._write_batch, [(store, data)
+                                            for store, data, _ in batch],
+                        pool=POOL_CORE)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error writing stores")
+                    written = [None] * len(batch)
+
+                for (store, _, future), size in zip(batch, written):
+                    if isinstance(size, int):
+                        stats = self._stats.setdefault(
+                            store.key, {'writes': 0, 'bytes': 0})
+                        stats['writes'] += 1
+                        stats['bytes'] += size
+                    if not future.done():
+                        future.set_result(None)
+        finally:
+            self._flush_task = None
+
+    @staticmethod
+    def _write_batch(batch: List[Tuple['Store', Dict]]) -> List[Any]:
+        """Write the data of the stores and return the bytes written."""
+        written = []  # type: List[Any]
+        for store, data in batch:
+            try:
+                written.append(store._write_data(  # pylint: disable=W0212
+                    store.path, data))
+            except (json_util.SerializationError, json_util.WriteError,
+                    OSError) as err:
+                _LOGGER.error(
+                    'Error writing config for %s: %s', store.key, err)
+                written.append(None)
+        return written
+
+
 @bind_hass
 class Store:
     """Class to help storing data."""
 
     def __init__(self, hass, version: int, key: str, private: bool = False, *,
-                 encoder: JSONEncoder = None):
-        """Initialize storage class."""
+                 encoder: JSONEncoder = None, compact: bool = False,
+                 fsync: bool = False):
+        """Initialize storage class.
+
+        Compact stores are written without indentation. With fsync, the data
+        is flushed to disk before the file is replaced.
+        """
         self.version = version
         self.key = key
         self.hass = hass
         self._private = private
+        self._compact = compact
+        self._fsync = fsync
         self._data = None
         self._unsub_delay_listener = None
         self._unsub_stop_listener = None
-        self._write_lock = asyncio.Lock(loop=hass.loop)
         self._load_task = None
         self._encoder = encoder
 
@@ -91,7 +191,7 @@ class Store:
                 data['data'] = data.pop('data_func')()
         else:
             data = await self.hass.async_add_executor_job(
-                json_util.load_json, self.path)
+                json_util.load_json, self.path, pool=POOL_CORE)
 
             if data == {}:
                 return None
@@ -177,20 +277,17 @@ class Store:
 
         self._data = None
 
-        async with self._write_lock:
-            try:
-                await self.hass.async_add_executor_job(
-                    self._write_data, self.path, data)
-            except (json_util.SerializationError, json_util.WriteError) as err:
-                _LOGGER.error('Error writing config for %s: %s', self.key, err)
+        await async_get_writer(self.hass).async_write(self, data)
 
-    def _write_data(self, path: str, data: Dict):
-        """Write the data."""
+    def _write_data(self, path: str, data: Dict) -> int:
+        """Write the data and return the number of bytes written."""
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug('Writing data for %s', self.key)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        return json_util.save_json(
+            path, data, self._private, encoder=self._encoder,
+            compact=self._compact, fsync=self._fsync)
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
@@ -1,5 +1,6 @@
 """Template helper methods for rendering strings with Home Assistant data."""
 from datetime import datetime
+from functools import lru_cache
 import json
 import logging
 import math
@@ -36,6 +37,9 @@ _RE_GET_ENTITIES = re.compile(
 )
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{")
 
+# Number of distinct template sources to keep the compiled code of
+COMPILE_CACHE_SIZE = 1024
+
 
 @bind_hass
 def attach(hass, obj):
@@ -108,7 +112,7 @@ class Template:
             return
 
         try:
-            self._compiled_code = ENV.compile(self.template)
+            self._compiled_code = _compile(self.template)
         except jinja2.exceptions.TemplateSyntaxError as err:
             raise TemplateError(err)
 
@@ -696,3 +700,9 @@ ENV.globals['utcnow'] = dt_util.utcnow
 ENV.globals['as_timestamp'] = forgiving_as_timestamp
 ENV.globals['relative_time'] = dt_util.get_age
 ENV.globals['strptime'] = strptime
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile(source):
+    """Compile a template source, reusing the code of equal templates."""
+    return ENV.compile(source)
@@ -0,0 +1,185 @@
+"""Helpers to coordinate the polling of a data source shared by entities."""
+import asyncio
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Callable, List, Optional
+
+from homeassistant.core import (
+    CALLBACK_TYPE, HassJob, HassJobType, HomeAssistant, callback)
+from homeassistant.exceptions import HomeAssistantError
+
+from .entity import Entity
+from .event import async_call_later
+
+# Failing refreshes double the interval, up to this many times the interval
+MAX_BACKOFF_FACTOR = 16
+
+
+class UpdateFailed(HomeAssistantError):
+    """Raised by an update method when fetching the data failed."""
+
+
+class DataUpdateCoordinator:
+    """Fetch data for multiple entities from a single source.
+
+    The source is refreshed once per update interval for as long as there
+    are listeners. Refreshes requested while one is in progress join the
+    running refresh instead of hitting the source again.
+    """
+
+    def __init__(self, hass: HomeAssistant, logger: logging.Logger, *,
+                 name: str, update_interval: timedelta,
+                 update_method: Callable[[], Any]) -> None:
+        """Initialize the coordinator.
+
+        update_method is a coroutine function or a function that will be run
+        in the executor. It returns the new data or raises UpdateFailed.
+        """
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.update_interval = update_interval
+        self.data = None  # type: Any
+        self.last_update_success = True
+
+        self._job = HassJob(update_method)
+        self._listeners = []  # type: List[CALLBACK_TYPE]
+        self._failures = 0
+        self._unsub_refresh = None  # type: Optional[CALLBACK_TYPE]
+        self._refresh_task = None  # type: Optional[asyncio.Task]
+
+    @callback
+    def async_add_listener(
+            self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for data updates and start polling for the first listener.
+
+        Returns a function to remove the listener.
+        """
+        schedule_refresh = not self._listeners
+
+        self._listeners.append(update_callback)
+
+        if schedule_refresh:
+            self._schedule_refresh()
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the update listener."""
+            self.async_remove_listener(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_remove_listener(self, update_callback: CALLBACK_TYPE) -> None:
+        """Remove a data update listener and stop polling without any."""
+        self._listeners.remove(update_callback)
+
+        if not self._listeners and self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh, backing off after failures."""
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+
+        interval = self.update_interval * min(
+            2 ** self._failures, MAX_BACKOFF_FACTOR)
+        self._unsub_refresh = async_call_later(
+            self.hass, interval.total_seconds(), self._handle_refresh_interval)
+
+    async def _handle_refresh_interval(self, _now: datetime) -> None:
+        """Handle a refresh interval occurrence."""
+        self._unsub_refresh = None
+        await self.async_refresh()
+
+    async def async_refresh(self) -> None:
+        """Refresh the data, joining a refresh that is already running."""
+        if self._refresh_task is None:
+            self._refresh_task = self.hass.async_create_task(
+                self._async_refresh())
+
+        # Shield the refresh so a cancelled caller does not cancel it for
+        # the other callers waiting on it.
+        await asyncio.shield(self._refresh_task)
+
+    async def _async_refresh(self) -> None:
+        """Fetch new data and notify the listeners."""
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+        try:
+            if self._job.job_type == HassJobType.Coroutinefunction:
+                self.data = await self._job.target()
+            else:
+                self.data = await self.hass.async_add_executor_job(
+                    self._job.target)
+
+        except UpdateFailed as err:
+            if self.last_update_success:
+                self.logger.error(
+                    "Error fetching %s data: %s", self.name, err)
+            self.last_update_success = False
+            self._failures += 1
+
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception(
+                "Unexpected error fetching %s data", self.name)
+            self.last_update_success = False
+            self._failures += 1
+
+        else:
+            if not self.last_update_success:
+                self.logger.info("Fetching %s data recovered", self.name)
+            self.last_update_success = True
+            self._failures = 0
+
+        finally:
+            self._refresh_task = None
+
+        if self._listeners:
+            self._schedule_refresh()
+
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+class CoordinatorEntity(Entity):
+    """An entity whose state is fetched by a DataUpdateCoordinator.
+
+    The entity platform does not poll these entities. They are written to the
+    state machine every time the coordinator refreshed its data.
+    """
+
+    def __init__(self, coordinator: DataUpdateCoordinator) -> None:
+        """Initialize the entity."""
+        self.coordinator = coordinator
+
+    @property
+    def should_poll(self) -> bool:
+        """No need to poll. The coordinator notifies of updates."""
+        return False
+
+    @property
+    def available(self) -> bool:
+        """Return if the last refresh of the coordinator succeeded."""
+        return self.coordinator.last_update_success
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for data updates of the coordinator."""
+        self.async_on_remove(self.coordinator.async_add_listener(
+            self._handle_coordinator_update))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self.async_write_ha_state()
+
+    async def async_update(self) -> None:
+        """Refresh the data of the coordinator.
+
+        Only used by the generic entity update service.
+        """
+        await self.coordinator.async_refresh()
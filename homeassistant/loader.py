@@ -11,8 +11,10 @@ import json
 import logging
 import pathlib
 import sys
+from time import monotonic
 from types import ModuleType
 from typing import (
+    Iterable,
     Optional,
     Set,
     TYPE_CHECKING,
@@ -39,6 +41,11 @@ _LOGGER = logging.getLogger(__name__)
 
 DATA_COMPONENTS = 'components'
 DATA_INTEGRATIONS = 'integrations'
+DATA_MANIFEST_INDEX = 'integration_manifests'
+DATA_IMPORT_TIMES = 'integration_import_times'
+MANIFEST_INDEX_KEY = 'core.manifest_index'
+MANIFEST_INDEX_VERSION = 1
+MANIFEST_INDEX_SAVE_DELAY = 10
 PACKAGE_CUSTOM_COMPONENTS = 'custom_components'
 PACKAGE_BUILTIN = 'homeassistant.components'
 LOOKUP_PATHS = [PACKAGE_CUSTOM_COMPONENTS, PACKAGE_BUILTIN]
@@ -121,13 +128,15 @@ class Integration:
         self.after_dependencies = manifest.get(
             'after_dependencies')  # type: Optional[List[str]]
         self.requirements = manifest['requirements']  # type: List[str]
+        self.setup_after_start = manifest.get(
+            'setup_after_start', False)  # type: bool
         _LOGGER.info("Loaded %s from %s", self.domain, pkg_path)
 
     def get_component(self) -> ModuleType:
         """Return the component."""
         cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
         if self.domain not in cache:
-            cache[self.domain] = importlib.import_module(self.pkg_path)
+            cache[self.domain] = _import_module(self.hass, self.pkg_path)
         return cache[self.domain]  # type: ignore
 
     def get_platform(self, platform_name: str) -> ModuleType:
@@ -135,11 +144,35 @@ class Integration:
         cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
         full_name = "{}.{}".format(self.domain, platform_name)
         if full_name not in cache:
-            cache[full_name] = importlib.import_module(
-                "{}.{}".format(self.pkg_path, platform_name)
+            cache[full_name] = _import_module(
+                self.hass, "{}.{}".format(self.pkg_path, platform_name)
             )
         return cache[full_name]  # type: ignore
 
+    async def async_preload(self, platforms: Iterable[str] = ()) -> None:
+        """Import the component and platforms in the import pool.
+
+        Errors are ignored, they are reported when setting up the component
+        or platform imports the module again.
+        """
+        from homeassistant.core import POOL_IMPORT
+
+        cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
+        modules = [(self.domain, self.pkg_path)]
+        modules.extend(
+            ("{}.{}".format(self.domain, platform_name),
+             "{}.{}".format(self.pkg_path, platform_name))
+            for platform_name in platforms)
+
+        for cache_key, module_name in modules:
+            if cache_key in cache:
+                continue
+            try:
+                cache[cache_key] = await self.hass.async_add_executor_job(
+                    _import_module, self.hass, module_name, pool=POOL_IMPORT)
+            except Exception:  # pylint: disable=broad-except
+                return
+
     def __repr__(self) -> str:
         """Text representation of class."""
         return "<Integration {}: {}>".format(self.domain, self.pkg_path)
@@ -170,8 +203,29 @@ async def async_get_integration(hass: 'HomeAssistant', domain: str)\
     if int_or_evt is not _UNDEF:
         return cast(Integration, int_or_evt)
 
+    index = await async_get_manifest_index(hass)
+
+    # Another caller may have started resolving it while we waited
+    if domain in cache:
+        return await async_get_integration(hass, domain)
+
     event = cache[domain] = asyncio.Event()
 
+    for index_key, package in (('custom', PACKAGE_CUSTOM_COMPONENTS),
+                               ('builtin', PACKAGE_BUILTIN)):
+        entry = index[index_key].get(domain)
+        if entry is None:
+            continue
+        if package == PACKAGE_CUSTOM_COMPONENTS:
+            _LOGGER.warning(CUSTOM_WARNING, domain)
+        integration = Integration(
+            hass, "{}.{}".format(package, domain),
+            pathlib.Path(entry['path']), entry['manifest'])
+        cache[domain] = integration
+        event.set()
+        return integration
+
+    # Custom integrations added after the index was built
     try:
         import custom_components
         integration = await hass.async_add_executor_job(
@@ -187,17 +241,6 @@ async def async_get_integration(hass: 'HomeAssistant', domain: str)\
         # Import error if "custom_components" doesn't exist
         pass
 
-    from homeassistant import components
-
-    integration = await hass.async_add_executor_job(
-        Integration.resolve_from_root, hass, components, domain
-    )
-
-    if integration is not None:
-        cache[domain] = integration
-        event.set()
-        return integration
-
     integration = Integration.resolve_legacy(hass, domain)
     if integration is not None:
         cache[domain] = integration
@@ -213,6 +256,130 @@ async def async_get_integration(hass: 'HomeAssistant', domain: str)\
     return integration
 
 
+async def async_get_manifest_index(hass: 'HomeAssistant') \
+        -> Dict[str, Any]:
+    """Return the manifests of the custom and built-in integrations.
+
+    The index is stored, and on start only the manifests that moved or
+    changed since they were stored are read again. A new version of Home
+    Assistant reads all built-in manifests.
+    """
+    task = hass.data.get(DATA_MANIFEST_INDEX)
+    if task is None:
+        task = hass.data[DATA_MANIFEST_INDEX] = hass.async_create_task(
+            _async_load_manifest_index(hass))
+    return cast(Dict[str, Any], await task)
+
+
+async def _async_load_manifest_index(hass: 'HomeAssistant') \
+        -> Dict[str, Any]:
+    """Load the stored manifest index and refresh what changed."""
+    from homeassistant import components
+    from homeassistant.const import __version__
+    from homeassistant.exceptions import HomeAssistantError
+    from homeassistant.helpers.storage import Store
+
+    store = Store(hass, MANIFEST_INDEX_VERSION, MANIFEST_INDEX_KEY,
+                  compact=True)
+    stored = {}  # type: Dict[str, Any]
+    cached_builtin = cached_custom = {}  # type: Dict[str, Dict]
+    try:
+        stored = await store.async_load() or {}
+        if stored:
+            if stored['ha_version'] == __version__:
+                cached_builtin = dict(stored['builtin'])
+            cached_custom = dict(stored['custom'])
+    except (HomeAssistantError, KeyError, TypeError, ValueError) as err:
+        _LOGGER.error("Error loading the manifest index, rebuilding it: %r",
+                      err)
+
+    builtin = await hass.async_add_executor_job(
+        _scan_manifests, components, cached_builtin)
+
+    try:
+        import custom_components
+        custom = await hass.async_add_executor_job(
+            _scan_manifests, custom_components, cached_custom)
+    except ImportError:
+        # Import error if "custom_components" doesn't exist
+        custom = {}
+
+    index = {
+        'ha_version': __version__,
+        'builtin': builtin,
+        'custom': custom,
+    }
+
+    if index != stored:
+        store.async_delay_save(lambda: index, MANIFEST_INDEX_SAVE_DELAY)
+
+    return index
+
+
+def _scan_manifests(root_module: ModuleType,
+                    cached: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Read the manifests of all integrations in a root module.
+
+    Manifests that did not change since they were cached are reused.
+    """
+    manifests = {}  # type: Dict[str, Dict]
+
+    for base in root_module.__path__:  # type: ignore
+        try:
+            paths = sorted(pathlib.Path(base).iterdir())
+        except OSError:
+            continue
+
+        for path in paths:
+            if path.name in manifests:
+                continue
+
+            manifest_path = path / 'manifest.json'
+            try:
+                mtime = manifest_path.stat().st_mtime
+            except OSError:
+                continue
+
+            entry = cached.get(path.name)
+            if (isinstance(entry, dict) and 'manifest' in entry and
+                    entry.get('path') == str(path) and
+                    entry.get('mtime') == mtime):
+                manifests[path.name] = entry
+                continue
+
+            try:
+                manifest = json.loads(manifest_path.read_text())
+            except ValueError as err:
+                _LOGGER.error("Error parsing manifest.json file at %s: %s",
+                              manifest_path, err)
+                continue
+
+            manifests[path.name] = {
+                'path': str(path),
+                'mtime': mtime,
+                'manifest': manifest,
+            }
+
+    return manifests
+
+
+def _import_module(hass: 'HomeAssistant', name: str) -> ModuleType:
+    """Import a module and record how long the import took.
+
+    Like python -X importtime, the time includes importing the modules it
+    depends on that were not imported yet.
+    """
+    if name in sys.modules:
+        # Goes through the import lock in case another thread is still
+        # importing it.
+        return importlib.import_module(name)
+
+    start = monotonic()
+    module = importlib.import_module(name)
+    hass.data.setdefault(DATA_IMPORT_TIMES, {})[name] = monotonic() - start
+    return module
+
+
 class LoaderError(Exception):
     """Loader base error."""
 
@@ -4,17 +4,23 @@ from functools import partial
 import logging
 import os
 import sys
-from typing import Any, Dict, List, Optional
+from typing import (  # noqa: F401 pylint: disable=unused-import
+    Any, Dict, List, Optional, Set)
 from urllib.parse import urlparse
 
 import pkg_resources
 
 import homeassistant.util.package as pkg_util
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
 
 DATA_PIP_LOCK = 'pip_lock'
 DATA_PKG_CACHE = 'pkg_cache'
 CONSTRAINT_FILE = 'package_constraints.txt'
+STORAGE_KEY = 'core.requirements'
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -28,21 +34,27 @@ async def async_process_requirements(hass: HomeAssistant, name: str,
     if pip_lock is None:
         pip_lock = hass.data[DATA_PIP_LOCK] = asyncio.Lock(loop=hass.loop)
 
-    pkg_cache = hass.data.get(DATA_PKG_CACHE)
-    if pkg_cache is None:
-        pkg_cache = hass.data[DATA_PKG_CACHE] = PackageLoadable(hass)
+    pkg_cache = _async_get_pkg_cache(hass)
+
+    missing = []
+    for req in requirements:
+        if not await pkg_cache.loadable(req):
+            missing.append(req)
+
+    if not missing:
+        return True
 
     pip_install = partial(pkg_util.install_package,
                           **pip_kwargs(hass.config.config_dir))
 
+    # pip is not safe to run concurrently on the same target, and other
+    # integrations may have installed the same package while we waited.
     async with pip_lock:
-        for req in requirements:
+        for req in missing:
             if await pkg_cache.loadable(req):
                 continue
 
-            ret = await hass.async_add_executor_job(pip_install, req)
-
-            if not ret:
+            if not await hass.async_add_executor_job(pip_install, req):
                 _LOGGER.error("Not initializing %s because could not install "
                               "requirement %s", name, req)
                 return False
@@ -50,6 +62,30 @@ async def async_process_requirements(hass: HomeAssistant, name: str,
     return True
 
 
+async def async_requirements_met(hass: HomeAssistant,
+                                 requirements: List[str]) -> bool:
+    """Return if all requirements are met, without installing any.
+
+    This method is a coroutine.
+    """
+    pkg_cache = _async_get_pkg_cache(hass)
+
+    for req in requirements:
+        if not await pkg_cache.loadable(req):
+            return False
+
+    return True
+
+
+@callback
+def _async_get_pkg_cache(hass: HomeAssistant) -> 'PackageLoadable':
+    """Return the package cache."""
+    pkg_cache = hass.data.get(DATA_PKG_CACHE)
+    if pkg_cache is None:
+        pkg_cache = hass.data[DATA_PKG_CACHE] = PackageLoadable(hass)
+    return pkg_cache
+
+
 def pip_kwargs(config_dir: Optional[str]) -> Dict[str, Any]:
     """Return keyword arguments for PIP install."""
     kwargs = {
@@ -60,13 +96,76 @@ def pip_kwargs(config_dir: Optional[str]) -> Dict[str, Any]:
     return kwargs
 
 
+def _sys_path_fingerprint() -> List[List[Any]]:
+    """Return the modification times of the folders on the Python path.
+
+    Installing, upgrading or removing a package adds or removes its
+    dist-info folder, which changes the modification time of the folder it
+    was installed in.
+    """
+    fingerprint = []
+    for path in sys.path:
+        try:
+            fingerprint.append([path, os.stat(path).st_mtime])
+        except OSError:
+            fingerprint.append([path, None])
+    return fingerprint
+
+
 class PackageLoadable:
-    """Class to check if a package is loadable, with built-in cache."""
+    """Class to check if a package is loadable, with built-in cache.
+
+    Requirements that were met are stored, together with a fingerprint of
+    the Python path. While the fingerprint doesn't change, they are met
+    without looking for the installed packages again.
+    """
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the PackageLoadable class."""
         self.dist_cache = {}  # type: Dict[str, pkg_resources.Distribution]
         self.hass = hass
+        self._fingerprint = None  # type: Optional[List[List[Any]]]
+        self._satisfied = set()  # type: Set[str]
+        self._store = None  # type: Optional[Store]
+        self._load_task = None  # type: Optional[asyncio.Future]
+
+    async def _async_load(self) -> None:
+        """Load the requirements that were met for the current packages."""
+        self._fingerprint = await self.hass.async_add_executor_job(
+            _sys_path_fingerprint)
+
+        if self.hass.config.config_dir is None:
+            return
+
+        self._store = Store(self.hass, STORAGE_VERSION, STORAGE_KEY,
+                            compact=True)
+        try:
+            data = await self._store.async_load()
+            if data is not None and data['fingerprint'] == self._fingerprint:
+                self._satisfied.update(data['satisfied'])
+        except (HomeAssistantError, KeyError, TypeError) as err:
+            # The packages are looked up again and the store is rewritten
+            _LOGGER.error("Error loading the met requirements: %r", err)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to store."""
+        return {
+            'fingerprint': self._fingerprint,
+            'satisfied': sorted(self._satisfied),
+        }
+
+    @callback
+    def _async_meets(self, package: str, req: pkg_resources.Requirement,
+                     dist: pkg_resources.Distribution) -> bool:
+        """Return if a distribution meets the requirement and remember it."""
+        if dist not in req:
+            return False
+
+        self._satisfied.add(package)
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return True
 
     async def loadable(self, package: str) -> bool:
         """Check if a package is what will be loaded when we import it.
@@ -74,6 +173,13 @@ class PackageLoadable:
         Returns True when the requirement is met.
         Returns False when the package is not installed or doesn't meet req.
         """
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+        if package in self._satisfied:
+            return True
+
         dist_cache = self.dist_cache
 
         try:
@@ -87,7 +193,7 @@ class PackageLoadable:
         dist = dist_cache.get(req_proj_name)
 
         if dist is not None:
-            return dist in req
+            return self._async_meets(package, req, dist)
 
         for path in sys.path:
             # We read the whole mount point as we're already here
@@ -96,7 +202,7 @@ class PackageLoadable:
 
             dist = dist_cache.get(req_proj_name)
             if dist is not None:
-                return dist in req
+                return self._async_meets(package, req, dist)
 
         return False
 
@@ -1,6 +1,7 @@
 """Script to run benchmarks."""
 import argparse
 import asyncio
+from collections import deque
 from contextlib import suppress
 from datetime import datetime
 import logging
@@ -8,8 +9,9 @@ from timeit import default_timer as timer
 
 from homeassistant import core
 from homeassistant.const import (
-    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
+    ATTR_ENTITY_ID, ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
 from homeassistant.util import dt as dt_util
+from homeassistant.util.rolling import RollingStatistics
 
 BENCHMARKS = {}
 
@@ -141,6 +143,69 @@ async def async_million_state_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def async_100k_service_calls(hass):
+    """Call a service with a light.turn_on like schema 100k times."""
+    import voluptuous as vol
+    from homeassistant.helpers import config_validation as cv
+
+    count = 0
+    event = asyncio.Event(loop=hass.loop)
+
+    @core.callback
+    def handler(_):
+        """Handle service call."""
+        nonlocal count
+        count += 1
+
+        if count == 10**5:
+            event.set()
+
+    hass.services.async_register('light', 'turn_on', handler, vol.Schema({
+        vol.Optional(ATTR_ENTITY_ID): cv.comp_entity_ids,
+        vol.Optional('transition'): cv.positive_int,
+        vol.Optional('brightness'): vol.All(
+            vol.Coerce(int), vol.Clamp(min=0, max=255)),
+        vol.Optional('rgb_color'): vol.All(
+            vol.ExactSequence((cv.byte, cv.byte, cv.byte)),
+            vol.Coerce(tuple)),
+    }))
+    service_data = {
+        ATTR_ENTITY_ID: ['light.kitchen', 'light.living_room'],
+        'brightness': '180',
+        'transition': 2,
+    }
+
+    start = timer()
+
+    for _ in range(10**5):
+        await hass.services.async_call('light', 'turn_on', service_data)
+
+    await event.wait()
+
+    return timer() - start
+
+
+@benchmark
+async def rolling_statistics_100k_window(hass):
+    """Slide a 100k sample window and read its statistics per sample."""
+    size = 10**5
+    window = deque()
+    stats = RollingStatistics()
+
+    start = timer()
+
+    for i in range(2 * size):
+        if len(window) == size:
+            stats.remove(window.popleft())
+        value = float((i * 7919) % size)
+        window.append(value)
+        stats.add(value)
+        _ = stats.mean, stats.median, stats.stdev, stats.min, stats.max
+
+    return timer() - start
+
+
 @benchmark
 @asyncio.coroutine
 def logbook_filtering_state(hass):
@@ -0,0 +1,80 @@
+"""Executor pool with queue depth and wait time statistics."""
+from concurrent.futures import Future, ThreadPoolExecutor
+import sys
+import threading
+from time import monotonic
+from typing import (  # noqa: F401 pylint: disable=unused-import
+    Any, Callable, Dict, Optional, TypeVar)
+
+T = TypeVar('T')  # pylint: disable=invalid-name
+
+
+class ExecutorPool(ThreadPoolExecutor):
+    """A named thread pool that keeps track of how busy it is."""
+
+    def __init__(self, name: str,
+                 max_workers: Optional[int] = None) -> None:
+        """Initialize the executor pool."""
+        executor_opts = {'max_workers': max_workers}  # type: Dict[str, Any]
+        if sys.version_info[:2] >= (3, 6):
+            executor_opts['thread_name_prefix'] = '{}Worker'.format(name)
+
+        super().__init__(**executor_opts)
+        self.name = name
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def max_workers(self) -> int:
+        """Return the maximum number of worker threads."""
+        return self._max_workers  # type: ignore
+
+    # pylint: disable=arguments-differ
+    def submit(self, fn: Callable[..., T],  # type: ignore
+               *args: Any, **kwargs: Any) -> Future:
+        """Submit a job to the pool and record when it was queued."""
+        queued_at = monotonic()
+
+        def run_job() -> T:
+            """Run the job and update the statistics."""
+            wait = monotonic() - queued_at
+            with self._stats_lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait += wait
+                if wait > self._max_wait:
+                    self._max_wait = wait
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._stats_lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        with self._stats_lock:
+            self._queued += 1
+        try:
+            return super().submit(run_job)
+        except RuntimeError:
+            with self._stats_lock:
+                self._queued -= 1
+            raise
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the current statistics of the pool."""
+        with self._stats_lock:
+            started = self._completed + self._running
+            return {
+                'max_workers': self.max_workers,
+                'queued': self._queued,
+                'running': self._running,
+                'completed': self._completed,
+                'average_wait': (self._total_wait / started
+                                 if started else 0.0),
+                'max_wait': self._max_wait,
+            }
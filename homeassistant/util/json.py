@@ -42,23 +42,42 @@ def load_json(filename: str, default: Union[List, Dict, None] = None) \
 
 def save_json(filename: str, data: Union[List, Dict],
               private: bool = False, *,
-              encoder: Optional[json.JSONEncoder] = None) -> None:
+              encoder: Optional[json.JSONEncoder] = None,
+              compact: bool = False, fsync: bool = False) -> int:
     """Save JSON data to a file.
 
-    Returns True on success.
+    The data is written to a temporary file that replaces the file. With
+    fsync, the data is on disk before the file is replaced.
+
+    Returns the number of bytes written.
     """
     tmp_filename = ""
     tmp_path = os.path.split(filename)[0]
     try:
-        json_data = json.dumps(data, sort_keys=True, indent=4, cls=encoder)
+        if compact:
+            json_data = json.dumps(data, separators=(',', ':'), cls=encoder)
+        else:
+            json_data = json.dumps(data, sort_keys=True, indent=4,
+                                   cls=encoder)
+        encoded = json_data.encode('utf-8')
         # Modern versions of Python tempfile create this file with mode 0o600
-        with tempfile.NamedTemporaryFile(mode="w", encoding='utf-8',
-                                         dir=tmp_path, delete=False) as fdesc:
-            fdesc.write(json_data)
+        with tempfile.NamedTemporaryFile(mode="wb", dir=tmp_path,
+                                         delete=False) as fdesc:
+            fdesc.write(encoded)
             tmp_filename = fdesc.name
+            if fsync:
+                fdesc.flush()
+                os.fsync(fdesc.fileno())
         if not private:
             os.chmod(tmp_filename, 0o644)
         os.replace(tmp_filename, filename)
+        if fsync and os.name == 'posix':
+            # Make the rename itself durable
+            dir_fd = os.open(tmp_path or '.', os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
     except TypeError as error:
         _LOGGER.exception('Failed to serialize to JSON: %s',
                           filename)
@@ -75,3 +94,5 @@ def save_json(filename: str, data: Union[List, Dict],
                 # If we are cleaning up then something else went wrong, so
                 # we should suppress likely follow-on errors in the cleanup
                 _LOGGER.error("JSON replacement cleanup failed: %s", err)
+
+    return len(encoded)
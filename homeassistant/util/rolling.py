@@ -0,0 +1,118 @@
+"""Rolling window statistics that avoid rescanning the whole window."""
+from bisect import bisect_left, insort
+import math
+from typing import List, Optional  # noqa: F401 pylint: disable=unused-import
+
+
+class RollingStatistics:
+    """Keep count, total, mean, variance, median, min and max of a window.
+
+    The caller owns the ordering of the window and tells this object which
+    values enter (add) and leave (remove) it. Sum and variance are updated
+    incrementally (Welford), a sorted copy of the values serves median, min
+    and max lookups. To keep floating point drift in check, the running sums
+    are recomputed exactly once every window length of removals.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty window."""
+        self._sorted = []  # type: List[float]
+        self._total = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._removals = 0
+
+    def __len__(self) -> int:
+        """Return the number of values in the window."""
+        return len(self._sorted)
+
+    def add(self, value: float) -> None:
+        """Add a value to the window."""
+        insort(self._sorted, value)
+        self._total += value
+        delta = value - self._mean
+        self._mean += delta / len(self._sorted)
+        self._m2 += delta * (value - self._mean)
+
+    def remove(self, value: float) -> None:
+        """Remove a value that was previously added to the window."""
+        index = bisect_left(self._sorted, value)
+        if index == len(self._sorted) or self._sorted[index] != value:
+            raise ValueError('{} is not in the window'.format(value))
+        del self._sorted[index]
+
+        count = len(self._sorted)
+        if not count:
+            self.clear()
+            return
+
+        self._total -= value
+        delta = value - self._mean
+        self._mean -= delta / count
+        self._m2 -= delta * (value - self._mean)
+
+        self._removals += 1
+        if self._removals >= count:
+            self._resync()
+
+    def clear(self) -> None:
+        """Remove all values from the window."""
+        self._sorted.clear()
+        self._total = self._mean = self._m2 = 0.0
+        self._removals = 0
+
+    def _resync(self) -> None:
+        """Recompute the running sums exactly from the stored values."""
+        self._total = math.fsum(self._sorted)
+        self._mean = self._total / len(self._sorted)
+        self._m2 = math.fsum((value - self._mean) ** 2
+                             for value in self._sorted)
+        self._removals = 0
+
+    @property
+    def total(self) -> float:
+        """Return the sum of the window."""
+        return self._total
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the mean, None if the window is empty."""
+        if not self._sorted:
+            return None
+        return self._mean
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Return the sample variance, None for less than two values."""
+        if len(self._sorted) < 2:
+            return None
+        return max(self._m2, 0.0) / (len(self._sorted) - 1)
+
+    @property
+    def stdev(self) -> Optional[float]:
+        """Return the sample standard deviation."""
+        variance = self.variance
+        if variance is None:
+            return None
+        return math.sqrt(variance)
+
+    @property
+    def median(self) -> Optional[float]:
+        """Return the median, None if the window is empty."""
+        count = len(self._sorted)
+        if not count:
+            return None
+        middle = count // 2
+        if count % 2:
+            return self._sorted[middle]
+        return (self._sorted[middle - 1] + self._sorted[middle]) / 2
+
+    @property
+    def min(self) -> Optional[float]:
+        """Return the smallest value, None if the window is empty."""
+        return self._sorted[0] if self._sorted else None
+
+    @property
+    def max(self) -> Optional[float]:
+        """Return the largest value, None if the window is empty."""
+        return self._sorted[-1] if self._sorted else None
@@ -4,7 +4,8 @@ import os
 import sys
 import fnmatch
 from collections import OrderedDict
-from typing import Union, List, Dict, Iterator, overload, TypeVar
+from typing import (  # noqa: F401 pylint: disable=unused-import
+    Any, Union, List, Dict, Iterator, Optional, Set, overload, TypeVar)
 
 import yaml
 try:
@@ -18,12 +19,27 @@ except ImportError:
     credstash = None
 
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.json import load_json, save_json
 
 _LOGGER = logging.getLogger(__name__)
 _SECRET_NAMESPACE = 'homeassistant'
 SECRET_YAML = 'secrets.yaml'
 __SECRET_CACHE = {}  # type: Dict[str, JSON_TYPE]
 
+# Bump when the layout of the cached node trees changes
+PARSED_CACHE_VERSION = 1
+
+# Composing is the expensive part of loading, so the composed node tree of
+# every file is cached by path and invalidated on a new mtime or size. Tags
+# are constructed on every load, so includes, secrets and environment
+# variables are always resolved from their current sources.
+__PARSED_CACHE = {}  # type: Dict[str, List[Any]]
+__PARSED_CACHE_USED = set()  # type: Set[str]
+__PARSED_CACHE_STATE = {'dirty': False, 'loaded': None}  # type: Dict[str, Any]
+
+# The C implementation composes the same nodes and marks a lot faster
+_ComposeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 JSON_TYPE = Union[List, Dict, str]  # pylint: disable=invalid-name
 DICT_T = TypeVar('DICT_T', bound=Dict)  # pylint: disable=invalid-name
 
@@ -89,10 +105,10 @@ def _add_reference(obj, loader: SafeLineLoader,  # type: ignore # noqa: F811
 def load_yaml(fname: str) -> JSON_TYPE:
     """Load a YAML file."""
     try:
-        with open(fname, encoding='utf-8') as conf_file:
-            # If configuration file is empty YAML returns None
-            # We convert that to an empty dict
-            return yaml.load(conf_file, Loader=SafeLineLoader) or OrderedDict()
+        node = _compose_file(fname)
+        # If configuration file is empty YAML returns None
+        # We convert that to an empty dict
+        return _construct(fname, node) or OrderedDict()
     except yaml.YAMLError as exc:
         _LOGGER.error(str(exc))
         raise HomeAssistantError(exc)
@@ -101,6 +117,136 @@ def load_yaml(fname: str) -> JSON_TYPE:
         raise HomeAssistantError(exc)
 
 
+def _compose_file(fname: str) -> Optional[yaml.nodes.Node]:
+    """Return the composed node tree of a file, from the cache if valid."""
+    with open(fname, encoding='utf-8') as conf_file:
+        try:
+            stat = os.fstat(conf_file.fileno())
+            key = [stat.st_mtime_ns, stat.st_size]  # type: Optional[List[int]]
+        except (OSError, AttributeError):
+            key = None
+
+        cached = __PARSED_CACHE.get(fname)
+        if key is not None and cached is not None and cached[:2] == key:
+            __PARSED_CACHE_USED.add(fname)
+            return _tree_to_node(fname, cached[2])
+
+        loader = _ComposeLoader(conf_file)
+        try:
+            node = loader.get_single_node()
+        finally:
+            loader.dispose()
+
+    if key is not None:
+        try:
+            tree = _node_to_tree(node, set())
+        except ValueError:
+            # Recursive aliases can't be stored
+            return node
+        __PARSED_CACHE[fname] = key + [tree]
+        __PARSED_CACHE_USED.add(fname)
+        __PARSED_CACHE_STATE['dirty'] = True
+
+    return node
+
+
+def _construct(fname: str, node: Optional[yaml.nodes.Node]) -> JSON_TYPE:
+    """Construct the Python objects of a composed node tree."""
+    if node is None:
+        return None
+    loader = SafeLineLoader('')
+    loader.name = fname
+    try:
+        return loader.construct_document(node)
+    finally:
+        loader.dispose()
+
+
+def _node_to_tree(node: Optional[yaml.nodes.Node], parents: Set[int]) -> Any:
+    """Convert a composed node to lists that can be stored as JSON."""
+    if node is None:
+        return None
+    line = node.start_mark.line
+    if isinstance(node, yaml.ScalarNode):
+        return ['s', node.tag, node.value, line]
+    if id(node) in parents:
+        raise ValueError("Recursive node")
+    parents.add(id(node))
+    try:
+        if isinstance(node, yaml.SequenceNode):
+            return ['q', node.tag, [_node_to_tree(item, parents)
+                                    for item in node.value], line]
+        return ['m', node.tag, [[_node_to_tree(key, parents),
+                                 _node_to_tree(value, parents)]
+                                for key, value in node.value], line]
+    finally:
+        parents.remove(id(node))
+
+
+def _tree_to_node(fname: str, tree: Any) -> Optional[yaml.nodes.Node]:
+    """Rebuild a composed node from its cached representation."""
+    if tree is None:
+        return None
+    kind, tag, value, line = tree
+    mark = yaml.Mark(fname, 0, line, 0, None, None)
+    if kind == 's':
+        return yaml.ScalarNode(tag, value, mark, mark)
+    if kind == 'q':
+        return yaml.SequenceNode(tag, [_tree_to_node(fname, item)
+                                       for item in value], mark, mark)
+    return yaml.MappingNode(tag, [(_tree_to_node(fname, key),
+                                   _tree_to_node(fname, val))
+                                  for key, val in value], mark, mark)
+
+
+def load_parsed_cache(path: str) -> None:
+    """Load the parsed YAML cache from a previous run."""
+    if __PARSED_CACHE_STATE['loaded'] == path:
+        return
+    __PARSED_CACHE_STATE['loaded'] = path
+
+    try:
+        data = load_json(path)
+    except HomeAssistantError:
+        return
+
+    if data.get('version') != PARSED_CACHE_VERSION:
+        return
+
+    for fname, cached in data.get('files', {}).items():
+        __PARSED_CACHE.setdefault(fname, cached)
+
+
+def save_parsed_cache(path: str) -> None:
+    """Store the parsed YAML of the files that were loaded in this run.
+
+    Only stores to the path the cache was loaded from on startup.
+    """
+    if (__PARSED_CACHE_STATE['loaded'] != path or
+            not __PARSED_CACHE_STATE['dirty']):
+        return
+    __PARSED_CACHE_STATE['dirty'] = False
+
+    files = {fname: __PARSED_CACHE[fname]
+             for fname in list(__PARSED_CACHE_USED)
+             if fname in __PARSED_CACHE}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        save_json(path, {
+            'version': PARSED_CACHE_VERSION,
+            'files': files,
+        }, private=True)
+    except (OSError, HomeAssistantError) as err:
+        _LOGGER.warning("Unable to store parsed YAML cache: %s", err)
+
+
+def clear_parsed_cache() -> None:
+    """Clear the parsed YAML cache."""
+    __PARSED_CACHE.clear()
+    __PARSED_CACHE_USED.clear()
+    __PARSED_CACHE_STATE.update(dirty=False, loaded=None)
+
+
 def dump(_dict: dict) -> str:
     """Dump YAML to a string and remove null."""
     return yaml.safe_dump(
@@ -213,14 +359,14 @@ def _ordered_dict(loader: SafeLineLoader,
         try:
             hash(key)
         except TypeError:
-            fname = getattr(loader.stream, 'name', '')
+            fname = loader.name
             raise yaml.MarkedYAMLError(
                 context="invalid key: \"{}\"".format(key),
                 context_mark=yaml.Mark(fname, 0, line, -1, None, None)
             )
 
         if key in seen:
-            fname = getattr(loader.stream, 'name', '')
+            fname = loader.name
             _LOGGER.error(
                 'YAML file %s contains duplicate key "%s". '
                 'Check lines %d and %d.', fname, key, seen[key], line)
@@ -14,6 +14,7 @@ MANIFEST_SCHEMA = vol.Schema({
     vol.Required('requirements'): [str],
     vol.Required('dependencies'): [str],
     vol.Optional('after_dependencies'): [str],
+    vol.Optional('setup_after_start'): bool,
     vol.Required('codeowners'): [str],
 })
 
@@ -12,6 +12,7 @@ from collections import OrderedDict
 from contextlib import contextmanager
 from datetime import timedelta
 from io import StringIO
+from types import ModuleType
 from unittest.mock import MagicMock, Mock, patch
 
 import homeassistant.util.dt as date_util
@@ -27,10 +28,11 @@ from homeassistant.config import async_process_component_config
 from homeassistant.const import (
     ATTR_DISCOVERED, ATTR_SERVICE, DEVICE_DEFAULT_NAME,
     EVENT_HOMEASSISTANT_CLOSE, EVENT_PLATFORM_DISCOVERED, EVENT_STATE_CHANGED,
-    EVENT_TIME_CHANGED, SERVER_PORT, STATE_ON, STATE_OFF)
+    EVENT_TIME_CHANGED, SERVER_PORT, STATE_ON, STATE_OFF, __version__)
 from homeassistant.helpers import (
     area_registry, device_registry, entity, entity_platform, entity_registry,
-    intent, restore_state, storage)
+    event, intent, restore_state, storage)
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
 from homeassistant.util.unit_system import METRIC_SYSTEM
 from homeassistant.util.async_ import (
@@ -40,6 +42,7 @@ from homeassistant.util.async_ import (
 _TEST_INSTANCE_PORT = SERVER_PORT
 _LOGGER = logging.getLogger(__name__)
 INSTANCES = []
+_MANIFEST_INDEX = {}
 CLIENT_ID = 'https://example.com/app'
 CLIENT_REDIRECT_URI = 'https://example.com/app/callback'
 
@@ -137,11 +140,11 @@ async def async_test_home_assistant(loop):
             return mock_coro(target(*args))
         return orig_async_add_job(target, *args)
 
-    def async_add_executor_job(target, *args):
+    def async_add_executor_job(target, *args, pool=None):
         """Add executor job."""
         if isinstance(target, Mock):
             return mock_coro(target(*args))
-        return orig_async_add_executor_job(target, *args)
+        return orig_async_add_executor_job(target, *args, pool=pool)
 
     def async_create_task(coroutine):
         """Create task."""
@@ -155,6 +158,7 @@ async def async_test_home_assistant(loop):
 
     hass.config.location_name = 'test home'
     hass.config.config_dir = get_test_config_dir()
+    hass.data[loader.DATA_MANIFEST_INDEX] = _mock_manifest_index(loop)
     hass.config.latitude = 32.87336
     hass.config.longitude = -117.22743
     hass.config.elevation = 0
@@ -190,6 +194,24 @@ async def async_test_home_assistant(loop):
     return hass
 
 
+def _mock_manifest_index(loop):
+    """Return the manifest index, only scanning the manifests once."""
+    if not _MANIFEST_INDEX:
+        from homeassistant import components
+        custom_components = ModuleType(loader.PACKAGE_CUSTOM_COMPONENTS)
+        custom_components.__path__ = [
+            get_test_config_dir(loader.PACKAGE_CUSTOM_COMPONENTS)]
+        _MANIFEST_INDEX.update({
+            'ha_version': __version__,
+            'builtin': loader._scan_manifests(components, {}),
+            'custom': loader._scan_manifests(custom_components, {}),
+        })
+
+    future = loop.create_future()
+    future.set_result(_MANIFEST_INDEX)
+    return future
+
+
 def get_test_instance_port():
     """Return unused port for running test instance.
 
@@ -258,6 +280,16 @@ def async_fire_time_changed(hass, time):
     hass.bus.async_fire(EVENT_TIME_CHANGED, {'now': date_util.as_utc(time)})
 
 
+@ha.callback
+def async_call_at_on_time_changed(hass, point_in_time, action):
+    """Call action once the time changed event of point_in_time is fired.
+
+    Replaces helpers.event.async_call_at in tests, so the tests move time
+    ahead with async_fire_time_changed instead of the event loop timers.
+    """
+    return event.async_track_point_in_utc_time(hass, action, point_in_time)
+
+
 fire_time_changed = threadsafe_callback_factory(async_fire_time_changed)
 
 
@@ -898,13 +930,34 @@ def mock_storage(data=None):
         """Mock version of write data."""
         _LOGGER.info('Writing data to %s: %s', store.key, data_to_write)
         # To ensure that the data can be serialized
-        data[store.key] = json.loads(json.dumps(
-            data_to_write, cls=store._encoder))
+        serialized = json.dumps(data_to_write, cls=store._encoder)
+        data[store.key] = json.loads(serialized)
+        return len(serialized)
+
+    def mock_read_journal(journal):
+        """Mock version of reading a journal."""
+        return data.get(journal.key, [])
+
+    def mock_append_journal(journal, records):
+        """Mock version of appending to a journal."""
+        _LOGGER.info('Appending records to %s: %s', journal.key, records)
+        serialized = json.dumps(records, cls=JSONEncoder)
+        data.setdefault(journal.key, []).extend(json.loads(serialized))
+
+    def mock_clear_journal(journal):
+        """Mock version of clearing a journal."""
+        data.pop(journal.key, None)
 
     with patch('homeassistant.helpers.storage.Store._async_load',
                side_effect=mock_async_load, autospec=True), \
         patch('homeassistant.helpers.storage.Store._write_data',
-              side_effect=mock_write_data, autospec=True):
+              side_effect=mock_write_data, autospec=True), \
+        patch('homeassistant.helpers.restore_state.StateJournal._read',
+              side_effect=mock_read_journal, autospec=True), \
+        patch('homeassistant.helpers.restore_state.StateJournal._append',
+              side_effect=mock_append_journal, autospec=True), \
+        patch('homeassistant.helpers.restore_state.StateJournal._clear',
+              side_effect=mock_clear_journal, autospec=True):
         yield data
 
 
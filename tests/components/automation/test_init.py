@@ -12,6 +12,7 @@ from homeassistant.const import (
     ATTR_NAME, ATTR_ENTITY_ID, STATE_ON, STATE_OFF,
     EVENT_HOMEASSISTANT_START, EVENT_AUTOMATION_TRIGGERED)
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_component import DATA_INSTANCES
 import homeassistant.util.dt as dt_util
 
 from tests.common import (
@@ -537,6 +538,59 @@ async def test_reload_config_service(hass, calls):
     assert calls[1].data.get('event') == 'test_event2'
 
 
+async def test_reload_keeps_unchanged_automations(hass, calls):
+    """Test reloading only recreates the automations that changed."""
+    hello = {
+        'alias': 'hello',
+        'trigger': {
+            'platform': 'event',
+            'event_type': 'test_event',
+        },
+        'action': {
+            'service': 'test.automation',
+        }
+    }
+    bye = {
+        'alias': 'bye',
+        'trigger': {
+            'platform': 'event',
+            'event_type': 'test_event2',
+        },
+        'action': {
+            'service': 'test.automation',
+        }
+    }
+    assert await async_setup_component(hass, automation.DOMAIN, {
+        automation.DOMAIN: [hello, bye]
+    })
+    component = hass.data[DATA_INSTANCES][automation.DOMAIN]
+    hello_entity = component.get_entity('automation.hello')
+    bye_entity = component.get_entity('automation.bye')
+
+    changed_bye = dict(bye, trigger={
+        'platform': 'event',
+        'event_type': 'test_event3',
+    })
+    with patch('homeassistant.config.load_yaml_config_file', autospec=True,
+               return_value={automation.DOMAIN: [hello, changed_bye]}):
+        with patch('homeassistant.config.find_config_file',
+                   return_value=''):
+            await common.async_reload(hass)
+            await hass.async_block_till_done()
+
+    assert component.get_entity('automation.hello') is hello_entity
+    assert component.get_entity('automation.bye') is not bye_entity
+    listeners = hass.bus.async_listeners()
+    assert listeners.get('test_event') == 1
+    assert listeners.get('test_event2') is None
+    assert listeners.get('test_event3') == 1
+
+    hass.bus.async_fire('test_event')
+    hass.bus.async_fire('test_event3')
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
 async def test_reload_config_when_invalid_config(hass, calls):
     """Test the reload config service handling invalid config."""
     with assert_setup_component(1, automation.DOMAIN):
@@ -894,3 +948,37 @@ async def test_automation_with_error_in_script(hass, caplog):
     hass.bus.async_fire('test_event')
     await hass.async_block_till_done()
     assert 'Service test.automation not found' in caplog.text
+
+
+async def test_automation_condition_stats(hass):
+    """Test automations keep track of evaluating their conditions."""
+    assert await async_setup_component(hass, automation.DOMAIN, {
+        automation.DOMAIN: {
+            'alias': 'hello',
+            'trigger': {
+                'platform': 'event',
+                'event_type': 'test_event',
+            },
+            'condition': {
+                'condition': 'template',
+                'value_template': '{{ trigger.event.data.pass }}',
+            },
+            'action': {
+                'event': 'automation_passed',
+            }
+        }
+    })
+
+    hass.bus.async_fire('test_event', {'pass': True})
+    hass.bus.async_fire('test_event', {'pass': False})
+    await hass.async_block_till_done()
+
+    entity = hass.data['entity_components'][automation.DOMAIN].get_entity(
+        'automation.hello')
+    stats = entity.condition_stats
+    assert stats['evaluated'] == 2
+    assert stats['passed'] == 1
+    assert stats['max_time'] <= stats['total_time']
+
+    info = await hass.data['system_health']['info'][automation.DOMAIN](hass)
+    assert info == {'automation.hello': stats}
@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import patch
 
 import homeassistant.components.automation as automation
+from homeassistant.const import ATTR_RESTORED
 from homeassistant.core import Context
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
@@ -906,3 +907,114 @@ async def test_wait_template_with_trigger(hass, calls):
     assert 1 == len(calls)
     assert 'numeric_state - test.entity - 12' == \
         calls[0].data['some']
+
+
+async def test_if_fires_on_attribute_change_below(hass, calls):
+    """Test the firing on an attribute and skipping unrelated changes."""
+    assert await async_setup_component(hass, automation.DOMAIN, {
+        automation.DOMAIN: {
+            'trigger': {
+                'platform': 'numeric_state',
+                'entity_id': 'test.entity',
+                'attribute': 'battery',
+                'below': 10,
+            },
+            'action': {
+                'service': 'test.automation'
+            }
+        }
+    })
+    hass.states.async_set('test.entity', 'on', {'battery': 9})
+    await hass.async_block_till_done()
+    assert 1 == len(calls)
+
+    with patch('homeassistant.helpers.condition.async_numeric_value') \
+            as mock_value:
+        hass.states.async_set('test.entity', 'off', {'battery': 9})
+        await hass.async_block_till_done()
+    assert len(mock_value.mock_calls) == 0
+
+    hass.states.async_set('test.entity', 'off', {'battery': 11})
+    await hass.async_block_till_done()
+    hass.states.async_set('test.entity', 'off', {'battery': 8})
+    await hass.async_block_till_done()
+    assert 2 == len(calls)
+
+
+async def test_if_fires_with_hysteresis(hass, calls):
+    """Test a flapping value only fires again after leaving the band."""
+    assert await async_setup_component(hass, automation.DOMAIN, {
+        automation.DOMAIN: {
+            'trigger': {
+                'platform': 'numeric_state',
+                'entity_id': 'test.entity',
+                'above': 10,
+                'hysteresis': 2,
+            },
+            'action': {
+                'service': 'test.automation'
+            }
+        }
+    })
+    for value in (11, 9, 11, 8.5, 10.5):
+        hass.states.async_set('test.entity', value)
+        await hass.async_block_till_done()
+    assert 1 == len(calls)
+
+    hass.states.async_set('test.entity', 8)
+    await hass.async_block_till_done()
+    hass.states.async_set('test.entity', 11)
+    await hass.async_block_till_done()
+    assert 2 == len(calls)
+
+
+async def test_if_fails_setup_with_attribute_and_template(hass, calls):
+    """Test an attribute can't be combined with a value template."""
+    with assert_setup_component(0, automation.DOMAIN):
+        assert await async_setup_component(hass, automation.DOMAIN, {
+            automation.DOMAIN: {
+                'trigger': {
+                    'platform': 'numeric_state',
+                    'entity_id': 'test.entity',
+                    'attribute': 'battery',
+                    'value_template': '{{ state.state }}',
+                    'below': 10,
+                },
+                'action': {
+                    'service': 'test.automation'
+                }
+            }
+        })
+
+
+async def test_if_not_fires_on_placeholder_replaced(hass, calls):
+    """Test the state replacing a placeholder does not fire."""
+    hass.states.async_set('test.entity', 'unavailable', {
+        ATTR_RESTORED: True})
+    assert await async_setup_component(hass, automation.DOMAIN, {
+        automation.DOMAIN: {
+            'trigger': {
+                'platform': 'numeric_state',
+                'entity_id': 'test.entity',
+                'below': 10,
+            },
+            'action': {
+                'service': 'test.automation'
+            }
+        }
+    })
+
+    hass.states.async_set('test.entity', 9)
+    await hass.async_block_till_done()
+    assert 0 == len(calls)
+
+    # Still below, so it does not fire
+    hass.states.async_set('test.entity', 8)
+    await hass.async_block_till_done()
+    assert 0 == len(calls)
+
+    hass.states.async_set('test.entity', 12)
+    await hass.async_block_till_done()
+    hass.states.async_set('test.entity', 9)
+    await hass.async_block_till_done()
+    assert 1 == len(calls)
@@ -4,6 +4,7 @@ from datetime import timedelta
 import pytest
 from unittest.mock import patch
 
+from homeassistant.const import ATTR_RESTORED
 from homeassistant.core import Context
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
@@ -648,3 +649,38 @@ async def test_wait_template_with_trigger(hass, calls):
     assert 1 == len(calls)
     assert 'state - test.entity - hello - world' == \
         calls[0].data['some']
+
+
+async def test_if_not_fires_on_placeholder_replaced(hass, calls):
+    """Test the state replacing a placeholder does not fire."""
+    hass.states.async_set('test.entity', 'unavailable', {
+        ATTR_RESTORED: True})
+    assert await async_setup_component(hass, automation.DOMAIN, {
+        automation.DOMAIN: {
+            'trigger': {
+                'platform': 'state',
+                'entity_id': 'test.entity',
+                'to': 'on',
+            },
+            'action': {
+                'service': 'test.automation'
+            }
+        }
+    })
+
+    hass.states.async_set('test.entity', 'on')
+    await hass.async_block_till_done()
+    assert 0 == len(calls)
+
+    hass.states.async_set('test.entity', 'off')
+    await hass.async_block_till_done()
+    hass.states.async_set('test.entity', 'on')
+    await hass.async_block_till_done()
+    assert 1 == len(calls)
+
+    # A real unavailable state still fires
+    hass.states.async_set('test.entity', 'unavailable')
+    await hass.async_block_till_done()
+    hass.states.async_set('test.entity', 'on')
+    await hass.async_block_till_done()
+    assert 2 == len(calls)
@@ -11,6 +11,7 @@ import forecastio
 
 from homeassistant.components.darksky import sensor as darksky
 from homeassistant.setup import setup_component
+from homeassistant.util.async_ import run_coroutine_threadsafe
 
 from tests.common import (load_fixture, get_test_home_assistant,
                           MockDependency)
@@ -74,22 +75,12 @@ def load_forecastMock(key, lat, lon,
 class TestDarkSkySetup(unittest.TestCase):
     """Test the Dark Sky platform."""
 
-    def add_entities(self, new_entities, update_before_add=False):
-        """Mock add entities."""
-        if update_before_add:
-            for entity in new_entities:
-                entity.update()
-
-        for entity in new_entities:
-            self.entities.append(entity)
-
     def setUp(self):
         """Initialize values for this testcase class."""
         self.hass = get_test_home_assistant()
         self.key = 'foo'
         self.lat = self.hass.config.latitude = 37.8267
         self.lon = self.hass.config.longitude = -122.423
-        self.entities = []
 
     def tearDown(self):  # pylint: disable=invalid-name
         """Stop everything that was started."""
@@ -142,12 +133,13 @@ class TestDarkSkySetup(unittest.TestCase):
         msg = '400 Client Error: Bad Request for url: {}'.format(url)
         mock_get_forecast.side_effect = HTTPError(msg,)
 
-        response = darksky.setup_platform(
+        add_entities = MagicMock()
+        run_coroutine_threadsafe(darksky.async_setup_platform(
             self.hass,
             VALID_CONFIG_MINIMAL['sensor'],
-            MagicMock()
-        )
-        assert not response
+            add_entities
+        ), self.hass.loop).result()
+        assert not add_entities.called
 
     @requests_mock.Mocker()
     @patch('forecastio.api.get_forecast', wraps=forecastio.api.get_forecast)
@@ -3,6 +3,8 @@ from datetime import timedelta
 import unittest
 from unittest.mock import patch
 
+import pytest
+
 from homeassistant.components.filter.sensor import (
     LowPassFilter, OutlierFilter, ThrottleFilter, TimeSMAFilter,
     RangeFilter, TimeThrottleFilter)
@@ -127,6 +129,19 @@ class TestFilterSensor(unittest.TestCase):
             filtered = filt.filter_state(state)
         assert 22 == filtered.state
 
+    def test_outlier_nan(self):
+        """Test the outlier filter rejects states that are not finite."""
+        filt = OutlierFilter(window_size=3,
+                             precision=2,
+                             entity=None,
+                             radius=4.0)
+        for value in ('nan', 'inf'):
+            with pytest.raises(ValueError):
+                filt.filter_state(ha.State('sensor.test_monitored', value))
+        for state in self.values:
+            filtered = filt.filter_state(state)
+        assert 21 == filtered.state
+
     def test_initial_outlier(self):
         """Test issue #13363."""
         filt = OutlierFilter(window_size=3,
@@ -215,3 +230,23 @@ class TestFilterSensor(unittest.TestCase):
         for state in self.values:
             filtered = filt.filter_state(state)
         assert 21.5 == filtered.state
+
+    def test_time_sma_resync(self):
+        """Test the time_sma running sum does not drift."""
+        filt = TimeSMAFilter(window_size=timedelta(minutes=2),
+                             precision=None,
+                             entity=None,
+                             type='last')
+        timestamp = dt_util.utcnow()
+        for index in range(1000):
+            value = 0.1 if index % 2 else 1e6
+            filt.filter_state(ha.State('sensor.test_monitored', value,
+                                       last_updated=timestamp))
+            timestamp += timedelta(seconds=1)
+
+        assert filt._area == pytest.approx(60 * 1e6 + 59 * 0.1, abs=1e-9)
+
+        filt.filter_state(ha.State('sensor.test_monitored', 1,
+                                   last_updated=timestamp + timedelta(
+                                       minutes=5)))
+        assert filt._area == 0
@@ -10,6 +10,7 @@ from homeassistant.const import (
     STATE_ON, STATE_OFF, STATE_HOME, STATE_UNKNOWN, ATTR_ICON, ATTR_HIDDEN,
     ATTR_ASSUMED_STATE, STATE_NOT_HOME, ATTR_FRIENDLY_NAME)
 import homeassistant.components.group as group
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 
 from tests.common import get_test_home_assistant, assert_setup_component
 from tests.components.group import common
@@ -382,7 +383,10 @@ class TestComponentsGroup(unittest.TestCase):
         assert sorted(self.hass.states.entity_ids()) == \
             ['group.all_tests', 'group.empty_group', 'group.second_group',
              'group.test_group']
-        assert self.hass.bus.listeners['state_changed'] == 3
+        assert sorted(
+            self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == \
+            ['hello.world', 'light.bowl', 'sensor.happy', 'test.one',
+             'test.two']
 
         with patch('homeassistant.config.load_yaml_config_file', return_value={
             'group': {
@@ -398,7 +402,85 @@ class TestComponentsGroup(unittest.TestCase):
 
         assert sorted(self.hass.states.entity_ids()) == \
             ['group.all_tests', 'group.hello']
-        assert self.hass.bus.listeners['state_changed'] == 2
+        assert sorted(
+            self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == \
+            ['light.bowl', 'test.one', 'test.two']
+        assert [len(callbacks) for callbacks in
+                self.hass.data[TRACK_STATE_CHANGE_CALLBACKS].values()] == \
+            [1, 1, 1]
+
+    def test_reloading_keeps_unchanged_groups(self):
+        """Test reloading only recreates the groups that changed."""
+        assert setup_component(self.hass, 'group', {'group': {
+            'test_group': 'hello.world,sensor.happy',
+            'second_group': 'light.bowl',
+        }})
+        component = self.hass.data[group.DOMAIN]
+        test_group = component.get_entity('group.test_group')
+        second_group = component.get_entity('group.second_group')
+
+        conf = {'group': {
+            'test_group': 'hello.world,sensor.happy',
+            'second_group': 'light.bowl,light.ceiling',
+        }}
+        with patch('homeassistant.config.load_yaml_config_file',
+                   return_value=conf):
+            with patch('homeassistant.config.find_config_file',
+                       return_value=''):
+                common.reload(self.hass)
+                self.hass.block_till_done()
+
+        assert component.get_entity('group.test_group') is test_group
+        assert component.get_entity('group.second_group') is not second_group
+        assert self.hass.states.get('group.second_group').attributes[
+            'entity_id'] == ('light.bowl', 'light.ceiling')
+
+    def test_reloading_keeps_group_order(self):
+        """Test a group created again on reload keeps its order."""
+        conf = OrderedDict()
+        conf['first_group'] = 'light.one'
+        conf['middle_group'] = 'light.two'
+        conf['last_group'] = 'light.three'
+        assert setup_component(self.hass, 'group', {'group': conf})
+
+        def orders():
+            return {
+                state.entity_id: state.attributes['order']
+                for state in self.hass.states.all()}
+
+        before = orders()
+        assert sorted(before.values()) == [0, 1, 2]
+
+        conf = OrderedDict(conf)
+        conf['middle_group'] = 'light.two,light.four'
+        conf['new_group'] = 'light.five'
+        with patch('homeassistant.config.load_yaml_config_file',
+                   return_value={'group': conf}):
+            with patch('homeassistant.config.find_config_file',
+                       return_value=''):
+                common.reload(self.hass)
+                self.hass.block_till_done()
+
+        after = orders()
+        assert after['group.middle_group'] == before['group.middle_group']
+        assert after['group.new_group'] == 3
+        assert sorted(after.values()) == [0, 1, 2, 3]
+
+        # Reordering the config reorders the groups
+        conf = OrderedDict(reversed(list(conf.items())))
+        with patch('homeassistant.config.load_yaml_config_file',
+                   return_value={'group': conf}):
+            with patch('homeassistant.config.find_config_file',
+                       return_value=''):
+                common.reload(self.hass)
+                self.hass.block_till_done()
+
+        assert orders() == {
+            'group.new_group': 0,
+            'group.last_group': 1,
+            'group.middle_group': 2,
+            'group.first_group': 3,
+        }
 
     def test_changing_group_visibility(self):
         """Test that a group can be hidden and shown."""
@@ -458,6 +540,38 @@ def test_service_group_services(hass):
     assert hass.services.has_service('group', group.SERVICE_REMOVE)
 
 
+async def test_expand_entity_ids_cache(hass):
+    """Test expanded groups are cached until group members change."""
+    assert await async_setup_component(hass, 'group', {'group': {}})
+
+    hass.states.async_set('group.inner', 'on', {
+        'entity_id': ['light.test_1', 'light.test_2']})
+    hass.states.async_set('group.outer', 'on', {
+        'entity_id': ['group.inner', 'switch.test_1', 'group.outer']})
+    await hass.async_block_till_done()
+
+    assert group.expand_entity_ids(hass, ['group.outer']) == [
+        'light.test_1', 'light.test_2', 'switch.test_1']
+    assert 'group.outer' in hass.data[group.DATA_EXPAND_CACHE]
+
+    # A state change that keeps the members keeps the cache
+    hass.states.async_set('group.inner', 'off', {
+        'entity_id': ['light.test_1', 'light.test_2']})
+    await hass.async_block_till_done()
+    assert 'group.outer' in hass.data[group.DATA_EXPAND_CACHE]
+
+    hass.states.async_set('group.inner', 'off', {
+        'entity_id': ['light.test_3']})
+    await hass.async_block_till_done()
+    assert group.expand_entity_ids(hass, ['group.outer']) == [
+        'light.test_3', 'switch.test_1']
+
+    hass.states.async_remove('group.inner')
+    await hass.async_block_till_done()
+    assert group.expand_entity_ids(hass, ['group.outer']) == [
+        'switch.test_1']
+
+
 # pylint: disable=invalid-name
 @asyncio.coroutine
 def test_service_group_set_group_remove_group(hass):
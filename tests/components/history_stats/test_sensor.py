@@ -142,6 +142,88 @@ class TestHistoryStatsSensor(unittest.TestCase):
         assert sensor3.state == 2
         assert sensor4.state == 50
 
+    def test_measure_incremental(self):
+        """Test the recorder is only queried again if the period moves."""
+        start_time = dt_util.utcnow().replace(microsecond=0) - \
+            timedelta(minutes=60)
+        t0 = start_time + timedelta(minutes=20)
+        t1 = t0 + timedelta(minutes=10)
+
+        # Start     t0        t1        End
+        # |--20min--|--10min--|--30min--|
+        # |---off---|---on----|---off---|
+
+        fake_states = {
+            'binary_sensor.test_id': [
+                ha.State('binary_sensor.test_id', 'on', last_changed=t0),
+            ]
+        }
+
+        start = Template(
+            '{{ %d }}' % dt_util.as_timestamp(start_time), self.hass)
+        end = Template('{{ now() }}', self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, 'binary_sensor.test_id', 'on', start, end, None,
+            'count', 'Test')
+
+        with patch('homeassistant.components.history.'
+                   'state_changes_during_period',
+                   return_value=fake_states) as mock_changes, \
+                patch('homeassistant.components.history.get_state',
+                      return_value=None):
+            sensor.update()
+            assert mock_changes.call_count == 1
+            assert sensor.count == 1
+            assert round(sensor.value, 1) == 0.7
+
+            sensor._pending_changes.append((t1.timestamp(), False))
+            sensor.update()
+
+        assert mock_changes.call_count == 1
+        assert sensor.count == 1
+        assert round(sensor.value, 2) == 0.17
+
+    def test_changes_after_period_end(self):
+        """Test changes after the end are kept until the period ends."""
+        start_time = dt_util.utcnow().replace(microsecond=0) - \
+            timedelta(minutes=60)
+        t0 = start_time + timedelta(minutes=20)
+        later = dt_util.utcnow() + timedelta(minutes=5)
+
+        fake_states = {
+            'binary_sensor.test_id': [
+                ha.State('binary_sensor.test_id', 'on', last_changed=t0),
+            ]
+        }
+
+        start = Template(
+            '{{ %d }}' % dt_util.as_timestamp(start_time), self.hass)
+        sensor = HistoryStatsSensor(
+            self.hass, 'binary_sensor.test_id', 'on', start,
+            Template('{{ now() }}', self.hass), None, 'count', 'Test')
+
+        with patch('homeassistant.components.history.'
+                   'state_changes_during_period',
+                   return_value=fake_states), \
+                patch('homeassistant.components.history.get_state',
+                      return_value=None):
+            sensor.update()
+            # A change that arrived while the recorder was queried
+            sensor._pending_changes.append((later.timestamp(), False))
+            sensor.update()
+
+            assert sensor.count == 1
+            assert list(sensor._pending_changes) == [
+                (later.timestamp(), False)]
+
+            # The end of the period is in the past
+            sensor._end = Template('{{ %d }}' % dt_util.as_timestamp(
+                start_time + timedelta(minutes=30)), self.hass)
+            sensor.update()
+
+        assert not sensor._pending_changes
+
     def test_wrong_date(self):
         """Test when start or end value is not a timestamp or a date."""
         good = Template('{{ now() }}', self.hass)
@@ -0,0 +1,85 @@
+"""Test static file handling of the HTTP component."""
+import gzip
+import mimetypes
+
+from aiohttp import web
+import pytest
+
+from homeassistant.components.http.static import CachingStaticResource
+
+
+@pytest.fixture
+def static_client(loop, aiohttp_client, tmpdir):
+    """Return a client for a static resource serving a temporary folder."""
+    tmpdir.join('app.js').write('console.log("app");')
+    tmpdir.join('app.js.gz').write_binary(
+        gzip.compress(b'console.log("app");'))
+    tmpdir.join('app.js.br').write_binary(b'brotli')
+    tmpdir.join('plain.txt').write('plain')
+
+    app = web.Application()
+    app.router.register_resource(
+        CachingStaticResource('/static', str(tmpdir)))
+    return loop.run_until_complete(aiohttp_client(app, auto_decompress=False))
+
+
+async def test_precompressed_variants(static_client):
+    """Test the best precompressed variant the client accepts is served."""
+    resp = await static_client.get(
+        '/static/app.js', headers={'Accept-Encoding': 'gzip, deflate, br'})
+    assert resp.status == 200
+    assert resp.headers['Content-Encoding'] == 'br'
+    assert resp.headers['Content-Type'] == \
+        mimetypes.guess_type('app.js')[0]
+    assert resp.headers['Vary'] == 'Accept-Encoding'
+    assert 'max-age' in resp.headers['Cache-Control']
+
+    resp = await static_client.get(
+        '/static/app.js', headers={'Accept-Encoding': 'gzip, br;q=0'})
+    assert resp.status == 200
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(await resp.read()) == b'console.log("app");'
+
+    resp = await static_client.get(
+        '/static/app.js', headers={'Accept-Encoding': 'identity'})
+    assert resp.status == 200
+    assert 'Content-Encoding' not in resp.headers
+    assert await resp.text() == 'console.log("app");'
+
+    resp = await static_client.get(
+        '/static/plain.txt', headers={'Accept-Encoding': 'gzip, br'})
+    assert resp.status == 200
+    assert 'Content-Encoding' not in resp.headers
+    assert 'Vary' not in resp.headers
+    assert await resp.text() == 'plain'
+
+
+async def test_etag_not_modified(static_client):
+    """Test requests with a matching ETag get a 304."""
+    resp = await static_client.get(
+        '/static/app.js', headers={'Accept-Encoding': 'gzip'})
+    etag = resp.headers['ETag']
+
+    resp = await static_client.get('/static/app.js', headers={
+        'Accept-Encoding': 'gzip',
+        'If-None-Match': '"other", {}'.format(etag),
+    })
+    assert resp.status == 304
+    assert resp.headers['ETag'] == etag
+
+    # The ETag of the gzip variant doesn't match the brotli variant
+    resp = await static_client.get('/static/app.js', headers={
+        'Accept-Encoding': 'br',
+        'If-None-Match': etag,
+    })
+    assert resp.status == 200
+    assert resp.headers['ETag'] != etag
+
+
+async def test_not_found(static_client):
+    """Test missing files and paths outside the folder are not found."""
+    resp = await static_client.get('/static/missing.js')
+    assert resp.status == 404
+
+    resp = await static_client.get('/static/../secret.txt')
+    assert resp.status == 404
@@ -5,11 +5,13 @@ from homeassistant.core import callback
 from homeassistant.const import ATTR_ENTITY_PICTURE
 from homeassistant.setup import setup_component
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.components.camera import Image
 import homeassistant.components.http as http
 import homeassistant.components.image_processing as ip
 
 from tests.common import (
-    get_test_home_assistant, get_test_instance_port, assert_setup_component)
+    get_test_home_assistant, get_test_instance_port, assert_setup_component,
+    mock_coro)
 from tests.components.image_processing import common
 
 
@@ -297,3 +299,32 @@ class TestImageProcessingFace:
         assert event_data[0]['gender'] == 'male'
         assert event_data[0]['entity_id'] == \
             'image_processing.demo_face'
+
+
+async def test_processing_time_attributes(hass):
+    """Test the processing time of the last frame is exposed."""
+    entity = ip.ImageProcessingEntity()
+    entity.hass = hass
+    entity.entity_id = 'image_processing.test'
+    processed = []
+
+    async def mock_process_image(image):
+        """Process the image."""
+        processed.append(image)
+
+    entity.async_process_image = mock_process_image
+    assert entity.state_attributes is None
+
+    with patch('homeassistant.components.camera.async_get_image',
+               return_value=mock_coro(Image('image/jpeg', b'Test'))), \
+            patch('homeassistant.components.image_processing.monotonic',
+                  side_effect=[10, 10.25]):
+        await entity.async_update()
+
+    assert processed == [b'Test']
+    assert entity.frames_processed == 1
+    assert entity.processing_time == 0.25
+    assert entity.state_attributes == {
+        ip.ATTR_PROCESSING_TIME: 0.25,
+        ip.ATTR_PROCESSING_FPS: 4.0,
+    }
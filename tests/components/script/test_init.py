@@ -9,6 +9,7 @@ from homeassistant.const import (
     ATTR_ENTITY_ID, ATTR_NAME, SERVICE_RELOAD, SERVICE_TOGGLE,
     SERVICE_TURN_OFF, SERVICE_TURN_ON, EVENT_SCRIPT_STARTED)
 from homeassistant.core import Context, callback, split_entity_id
+from homeassistant.helpers.entity_component import DATA_INSTANCES
 from homeassistant.loader import bind_hass
 from homeassistant.setup import setup_component, async_setup_component
 
@@ -257,6 +258,37 @@ class TestScriptComponent(unittest.TestCase):
         assert self.hass.services.has_service(script.DOMAIN, 'test2')
 
 
+async def test_reload_keeps_unchanged_scripts(hass):
+    """Test reloading only recreates the scripts that changed."""
+    sequence = [{'delay': {'seconds': 5}}]
+    assert await async_setup_component(hass, 'script', {
+        'script': {
+            'test': {'sequence': sequence},
+            'test2': {'sequence': sequence},
+        }
+    })
+    component = hass.data[DATA_INSTANCES][script.DOMAIN]
+    test = component.get_entity(ENTITY_ID)
+    test2 = component.get_entity('script.test2')
+
+    with patch('homeassistant.config.load_yaml_config_file', return_value={
+            'script': {
+                'test': {'sequence': sequence},
+                'test2': {'alias': 'Changed', 'sequence': sequence},
+            }}):
+        with patch('homeassistant.config.find_config_file',
+                   return_value=''):
+            await hass.services.async_call(
+                script.DOMAIN, SERVICE_RELOAD, blocking=True)
+            await hass.async_block_till_done()
+
+    assert component.get_entity(ENTITY_ID) is test
+    assert component.get_entity('script.test2') is not test2
+    assert hass.states.get('script.test2').name == 'Changed'
+    assert hass.services.has_service(script.DOMAIN, 'test')
+    assert hass.services.has_service(script.DOMAIN, 'test2')
+
+
 async def test_shared_context(hass):
     """Test that the shared context is passed down the chain."""
     event = 'test_event'
@@ -300,3 +332,34 @@ async def test_shared_context(hass):
     state = hass.states.get('script.test')
     assert state is not None
     assert state.context == context
+
+
+async def test_run_mode_parallel(hass):
+    """Test a parallel script can be started while it is running."""
+    events = []
+
+    @callback
+    def record_event(event):
+        events.append(event)
+
+    hass.bus.async_listen('test_event', record_event)
+
+    assert await async_setup_component(hass, 'script', {
+        'script': {
+            'test': {
+                'mode': 'parallel',
+                'max': 2,
+                'sequence': [
+                    {'event': 'test_event'},
+                    {'delay': {'seconds': 5}},
+                ]
+            }
+        }
+    })
+
+    for _ in range(3):
+        await hass.services.async_call(DOMAIN, 'test', blocking=True)
+        await hass.async_block_till_done()
+
+    assert script.is_on(hass, ENTITY_ID)
+    assert len(events) == 2
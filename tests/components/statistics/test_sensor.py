@@ -1,16 +1,18 @@
 """The test for the statistics sensor platform."""
+from contextlib import contextmanager
 import unittest
 import statistics
 
 import pytest
 
 from homeassistant.setup import setup_component
-from homeassistant.components.statistics.sensor import StatisticsSensor
+from homeassistant.components.statistics.sensor import (
+    StatisticsSensor, _load_records)
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT, TEMP_CELSIUS, STATE_UNKNOWN)
 from homeassistant.util import dt as dt_util
 from tests.common import get_test_home_assistant
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from datetime import datetime, timedelta
 from tests.common import init_recorder_component
 from homeassistant.components import recorder
@@ -121,6 +123,29 @@ class TestStatisticsSensor(unittest.TestCase):
         assert 3.8 == state.attributes.get('min_value')
         assert 14 == state.attributes.get('max_value')
 
+    def test_non_finite_states(self):
+        """Test that states that are not finite are not added."""
+        assert setup_component(self.hass, 'sensor', {
+            'sensor': {
+                'platform': 'statistics',
+                'name': 'test',
+                'entity_id': 'sensor.test_monitored',
+            }
+        })
+
+        self.hass.start()
+        self.hass.block_till_done()
+
+        for value in ['nan', 'inf', '-inf'] + self.values:
+            self.hass.states.set('sensor.test_monitored', value,
+                                 {ATTR_UNIT_OF_MEASUREMENT: TEMP_CELSIUS})
+            self.hass.block_till_done()
+
+        state = self.hass.states.get('sensor.test_mean')
+
+        assert str(self.mean) == state.state
+        assert self.count == state.attributes.get('count')
+
     def test_sampling_size_1(self):
         """Test validity of stats requiring only one sample."""
         assert setup_component(self.hass, 'sensor', {
@@ -322,3 +347,61 @@ class TestStatisticsSensor(unittest.TestCase):
         # now in mock_data['return_time'].
         assert mock_data['return_time'] == state.attributes.get('max_age') +\
             timedelta(hours=1)
+
+
+async def test_initialize_from_records(hass):
+    """Test only the latest records within max_age are used."""
+    now = dt_util.utcnow()
+    sensor = StatisticsSensor(
+        'sensor.test_monitored', 'test', 2, timedelta(hours=3), 2)
+    sensor.hass = hass
+    sensor.entity_id = 'sensor.test_mean'
+
+    records = [
+        ('1', now - timedelta(hours=4)),
+        ('2', now - timedelta(hours=2)),
+        ('unknown', now - timedelta(hours=1, minutes=30)),
+        ('3', now - timedelta(hours=1)),
+        ('4', now),
+    ]
+
+    with patch.object(sensor, 'async_schedule_update_ha_state') as mock_upd:
+        sensor.async_initialize_from_records(records)
+
+    assert list(sensor.states) == [3.0, 4.0]
+    assert list(sensor.ages) == [now - timedelta(hours=1), now]
+    assert mock_upd.called
+
+
+def test_load_records_sorted(hass):
+    """Test the records of every entity are sorted oldest first."""
+    now = dt_util.utcnow()
+    rows = [
+        ('sensor.one', '2', now - timedelta(minutes=1)),
+        ('sensor.two', '5', now),
+        ('sensor.one', '3', now),
+        ('sensor.two', '4', now - timedelta(minutes=1)),
+        ('sensor.one', '1', now - timedelta(minutes=2)),
+    ]
+    session = MagicMock()
+    session.execute.return_value = rows
+
+    @contextmanager
+    def mock_session_scope(hass):
+        yield session
+
+    with patch('homeassistant.components.statistics.sensor.session_scope',
+               mock_session_scope), \
+            patch('sqlalchemy.union_all'):
+        records = _load_records(hass, {
+            'sensor.one': (3, None),
+            'sensor.two': (2, None),
+        })
+
+    assert records == {
+        'sensor.one': [('1', now - timedelta(minutes=2)),
+                       ('2', now - timedelta(minutes=1)),
+                       ('3', now)],
+        'sensor.two': [('4', now - timedelta(minutes=1)),
+                       ('5', now)],
+    }
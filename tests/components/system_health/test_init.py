@@ -4,6 +4,7 @@ from unittest.mock import Mock
 
 import pytest
 
+from homeassistant.loader import DATA_IMPORT_TIMES
 from homeassistant.setup import async_setup_component
 
 from tests.common import mock_coro
@@ -31,9 +32,11 @@ async def test_info_endpoint_return_info(hass, hass_ws_client,
     assert resp['success']
     data = resp['result']
 
-    assert len(data) == 1
-    data = data['homeassistant']
-    assert data == {'hello': True}
+    assert len(data) == 4
+    assert data['homeassistant'] == {'hello': True}
+    assert data['executor_pools'].keys() == {
+        'Sync', 'Core', 'History', 'Import'}
+    assert data['executor_pools']['Core']['max_workers'] == 4
 
 
 async def test_info_endpoint_register_callback(hass, hass_ws_client,
@@ -54,7 +57,7 @@ async def test_info_endpoint_register_callback(hass, hass_ws_client,
     assert resp['success']
     data = resp['result']
 
-    assert len(data) == 2
+    assert len(data) == 5
     data = data['lovelace']
     assert data == {'storage': 'YAML'}
 
@@ -77,7 +80,7 @@ async def test_info_endpoint_register_callback_timeout(hass, hass_ws_client,
     assert resp['success']
     data = resp['result']
 
-    assert len(data) == 2
+    assert len(data) == 5
     data = data['lovelace']
     assert data == {'error': 'Fetching info timed out'}
 
@@ -100,6 +103,43 @@ async def test_info_endpoint_register_callback_exc(hass, hass_ws_client,
     assert resp['success']
     data = resp['result']
 
-    assert len(data) == 2
+    assert len(data) == 5
     data = data['lovelace']
     assert data == {'error': 'TEST ERROR'}
+
+
+async def test_info_endpoint_imports(hass, hass_ws_client, mock_system_info):
+    """Test the slowest integration imports are reported."""
+    hass.data[DATA_IMPORT_TIMES] = {
+        'homeassistant.components.fast': 0.0011,
+        'homeassistant.components.slow': 1.5,
+    }
+    assert await async_setup_component(hass, 'system_health', {})
+    client = await hass_ws_client(hass)
+
+    resp = await client.send_json({
+        'id': 6,
+        'type': 'system_health/info',
+    })
+    resp = await client.receive_json()
+    assert resp['success']
+    assert list(resp['result']['imports'].items()) == [
+        ('homeassistant.components.slow', 1.5),
+        ('homeassistant.components.fast', 0.001),
+    ]
+
+
+async def test_info_endpoint_storage(hass, hass_ws_client, mock_system_info):
+    """Test the bytes written per store are reported."""
+    assert await async_setup_component(hass, 'system_health', {})
+    store = hass.helpers.storage.Store(1, 'test_store')
+    await store.async_save({'hello': 'world'})
+    client = await hass_ws_client(hass)
+
+    resp = await client.send_json({
+        'id': 6,
+        'type': 'system_health/info',
+    })
+    resp = await client.receive_json()
+    assert resp['success']
+    assert resp['result']['storage']['test_store']['writes'] == 1
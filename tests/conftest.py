@@ -14,8 +14,8 @@ from homeassistant.auth.const import GROUP_ID_ADMIN, GROUP_ID_READ_ONLY
 from homeassistant.auth.providers import legacy_api_password, homeassistant
 
 from tests.common import (
-    async_test_home_assistant, INSTANCES, mock_coro,
-    mock_storage as mock_storage, MockUser, CLIENT_ID)
+    async_call_at_on_time_changed, async_test_home_assistant, INSTANCES,
+    mock_coro, mock_storage as mock_storage, MockUser, CLIENT_ID)
 from tests.test_util.aiohttp import mock_aiohttp_client
 
 if os.environ.get('UVLOOP') == '1':
@@ -60,6 +60,16 @@ def verify_cleanup():
                     "({}), aborting test run".format(count))
 
 
+@pytest.fixture(autouse=True)
+def mock_call_at():
+    """Run the timers of async_call_at on the time fired by the tests."""
+    with patch('homeassistant.helpers.event.async_call_at',
+               side_effect=async_call_at_on_time_changed), \
+            patch('homeassistant.helpers.script.async_call_at',
+                  side_effect=async_call_at_on_time_changed):
+        yield
+
+
 @pytest.fixture
 def hass_storage():
     """Fixture to mock storage."""
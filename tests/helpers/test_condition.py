@@ -164,3 +164,26 @@ class TestConditionHelper:
             self.hass.states.set('sensor.temperature', 'unknown')
             assert not test(self.hass)
             assert len(logwarn.mock_calls) == 0
+
+    def test_numeric_state_attribute(self):
+        """Test numeric_state of an attribute only tests changed states."""
+        test = condition.from_config({
+            'condition': 'numeric_state',
+            'entity_id': 'sensor.temperature',
+            'attribute': 'battery',
+            'below': 20
+        })
+
+        self.hass.states.set('sensor.temperature', 21, {'battery': 10})
+        assert test(self.hass)
+
+        with patch('homeassistant.helpers.condition.async_numeric_value') \
+                as mock_value:
+            assert test(self.hass)
+            assert len(mock_value.mock_calls) == 0
+
+        self.hass.states.set('sensor.temperature', 21, {'battery': 30})
+        assert not test(self.hass)
+
+        self.hass.states.set('sensor.temperature', 21)
+        assert not test(self.hass)
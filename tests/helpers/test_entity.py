@@ -9,11 +9,15 @@ import pytest
 
 import homeassistant.helpers.entity as entity
 from homeassistant.core import Context
-from homeassistant.const import ATTR_HIDDEN, ATTR_DEVICE_CLASS
+from homeassistant.const import (
+    ATTR_HIDDEN, ATTR_DEVICE_CLASS, ATTR_MIN_STATE_INTERVAL, ATTR_RESTORED,
+    ATTR_STATE_THRESHOLD)
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.helpers.entity_values import EntityValues
 
-from tests.common import get_test_home_assistant
+import homeassistant.util.dt as dt_util
+
+from tests.common import get_test_home_assistant, async_fire_time_changed
 
 
 def test_generate_entity_id_requires_hass_or_ids():
@@ -34,6 +38,17 @@ def test_generate_entity_id_given_keys():
             'test.another_entity']) == 'test.overwrite_hidden_true'
 
 
+async def test_async_generate_entity_id_restored_state(hass):
+    """Test generating an entity id takes over restored states."""
+    hass.states.async_set('test.restored', 'on', {ATTR_RESTORED: True})
+    hass.states.async_set('test.existing', 'on')
+
+    assert entity.async_generate_entity_id(
+        'test.{}', 'restored', hass=hass) == 'test.restored'
+    assert entity.async_generate_entity_id(
+        'test.{}', 'existing', hass=hass) == 'test.existing_2'
+
+
 def test_async_update_support(hass):
     """Test async update getting called."""
     sync_update = []
@@ -497,3 +512,69 @@ async def test_set_context_expired(hass):
     assert hass.states.get('hello.world').context != context
     assert ent._context is None
     assert ent._context_set is None
+
+
+async def test_state_threshold(hass):
+    """Test states within the threshold of the last write are dropped."""
+    hass.data[DATA_CUSTOMIZE] = EntityValues({
+        'sensor.power': {ATTR_STATE_THRESHOLD: 1.0}})
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = 'sensor.power'
+
+    for value, expected in ((10, '10'), (10.5, '10'), (10.9, '10'),
+                            (11.2, '11.2'), ('unknown', 'unknown')):
+        with patch.object(entity.Entity, 'state', value):
+            ent.async_write_ha_state()
+        state = hass.states.get('sensor.power')
+        assert state.state == expected
+        assert ATTR_STATE_THRESHOLD not in state.attributes
+
+
+async def test_min_state_interval(hass):
+    """Test writes within the minimum interval are coalesced."""
+    hass.data[DATA_CUSTOMIZE] = EntityValues({
+        'sensor.power': {ATTR_MIN_STATE_INTERVAL: timedelta(seconds=10)}})
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = 'sensor.power'
+    states = []
+    hass.bus.async_listen(
+        'state_changed', lambda event: states.append(
+            event.data['new_state'].state))
+
+    now = dt_util.utcnow()
+    with patch('homeassistant.util.dt.utcnow', return_value=now):
+        for value in (1, 2, 3):
+            with patch.object(entity.Entity, 'state', value):
+                ent.async_write_ha_state()
+    await hass.async_block_till_done()
+
+    assert states == ['1']
+    assert ATTR_MIN_STATE_INTERVAL not in \
+        hass.states.get('sensor.power').attributes
+
+    # Trailing edge writes the latest state
+    async_fire_time_changed(hass, now + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert states == ['1', '3']
+
+
+async def test_min_state_interval_cancelled_on_remove(hass):
+    """Test a held back state is not written after removal."""
+    hass.data[DATA_CUSTOMIZE] = EntityValues({
+        'sensor.power': {ATTR_MIN_STATE_INTERVAL: timedelta(seconds=10)}})
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = 'sensor.power'
+
+    now = dt_util.utcnow()
+    with patch('homeassistant.util.dt.utcnow', return_value=now):
+        for value in (1, 2):
+            with patch.object(entity.Entity, 'state', value):
+                ent.async_write_ha_state()
+
+    await ent.async_remove()
+    async_fire_time_changed(hass, now + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert hass.states.get('sensor.power') is None
@@ -143,7 +143,7 @@ class TestHelpersEntityComponent(unittest.TestCase):
             mock_setup.call_args[0]
 
     @patch('homeassistant.helpers.entity_platform.'
-           'async_track_time_interval')
+           'PollingScheduler.async_schedule')
     def test_set_scan_interval_via_config(self, mock_track):
         """Test the setting of the scan interval via configuration."""
         def platform_setup(hass, config, add_entities, discovery_info=None):
@@ -164,7 +164,8 @@ class TestHelpersEntityComponent(unittest.TestCase):
 
         self.hass.block_till_done()
         assert mock_track.called
-        assert timedelta(seconds=30) == mock_track.call_args[0][2]
+        assert timedelta(seconds=30) == \
+            mock_track.call_args[0][0].scan_interval
 
     def test_set_entity_namespace_via_config(self):
         """Test setting an entity namespace."""
@@ -7,6 +7,7 @@ from datetime import timedelta
 
 import pytest
 
+from homeassistant.const import ATTR_RESTORED
 from homeassistant.exceptions import PlatformNotReady
 from homeassistant.helpers.entity import generate_entity_id
 from homeassistant.helpers.entity_component import (
@@ -17,7 +18,8 @@ import homeassistant.util.dt as dt_util
 
 from tests.common import (
     get_test_home_assistant, MockPlatform, fire_time_changed, mock_registry,
-    MockEntity, MockEntityPlatform, MockConfigEntry, mock_entity_platform)
+    MockEntity, MockEntityPlatform, MockConfigEntry, mock_entity_platform,
+    async_fire_time_changed)
 
 _LOGGER = logging.getLogger(__name__)
 DOMAIN = "test_domain"
@@ -138,7 +140,7 @@ class TestHelpersEntityPlatform(unittest.TestCase):
         assert not ent.update.called
 
     @patch('homeassistant.helpers.entity_platform.'
-           'async_track_time_interval')
+           'PollingScheduler.async_schedule')
     def test_set_scan_interval_via_platform(self, mock_track):
         """Test the setting of the scan interval via platform."""
         def platform_setup(hass, config, add_entities, discovery_info=None):
@@ -160,7 +162,8 @@ class TestHelpersEntityPlatform(unittest.TestCase):
 
         self.hass.block_till_done()
         assert mock_track.called
-        assert timedelta(seconds=30) == mock_track.call_args[0][2]
+        assert timedelta(seconds=30) == \
+            mock_track.call_args[0][0].scan_interval
 
     def test_adding_entities_with_generator_and_thread_callback(self):
         """Test generator in add_entities that calls thread method.
@@ -653,6 +656,41 @@ def test_not_fails_with_adding_empty_entities_(hass):
     assert len(hass.states.async_entity_ids()) == 0
 
 
+async def test_entity_takes_over_placeholder_state(hass):
+    """Test an entity replaces the placeholder state for its entity id."""
+    hass.states.async_set('test_domain.world', 'unavailable', {
+        ATTR_RESTORED: True})
+    hass.states.async_set('test_domain.taken', 'on')
+
+    platform = MockEntityPlatform(hass)
+    await platform.async_add_entities([
+        MockEntity(entity_id='test_domain.world', name='world'),
+        MockEntity(entity_id='test_domain.taken', name='taken')])
+
+    state = hass.states.get('test_domain.world')
+    assert state.state == 'unknown'
+    assert ATTR_RESTORED not in state.attributes
+    assert 'test_domain.world' in platform.entities
+    assert 'test_domain.taken' not in platform.entities
+
+
+async def test_entity_keeps_entity_id_of_restored_state(hass):
+    """Test a generated entity id is not taken by a restored state."""
+    mock_registry(hass)
+    hass.states.async_set('test_domain.world', 'on', {ATTR_RESTORED: True})
+    hass.states.async_set('test_domain.taken', 'on')
+
+    platform = MockEntityPlatform(hass)
+    await platform.async_add_entities([
+        MockEntity(name='world'), MockEntity(name='taken')])
+
+    assert sorted(platform.entities) == [
+        'test_domain.taken_2', 'test_domain.world']
+    state = hass.states.get('test_domain.world')
+    assert state.state == 'unknown'
+    assert ATTR_RESTORED not in state.attributes
+
+
 async def test_entity_registry_updates_entity_id(hass):
     """Test that updates on the entity registry update platform entities."""
     registry = mock_registry(hass, {
@@ -819,3 +857,150 @@ async def test_device_info_not_overrides(hass):
     assert device.id == device2.id
     assert device2.manufacturer == 'test-manufacturer'
     assert device2.model == 'test-model'
+
+
+def test_polling_spread_over_interval():
+    """Test entities get a fixed offset within the scan interval."""
+    now = dt_util.utcnow().timestamp()
+
+    due1 = entity_platform._first_poll_due('test_domain.one', 30, now)
+    due2 = entity_platform._first_poll_due('test_domain.two', 30, now)
+
+    assert now < due1 <= now + 30
+    assert now < due2 <= now + 30
+    assert due1 != due2
+    # The offset does not depend on when polling started
+    assert entity_platform._first_poll_due(
+        'test_domain.one', 30, now + 7) % 30 == pytest.approx(due1 % 30)
+
+
+async def test_polling_overrun_reports_lag(hass, caplog):
+    """Test an update due while the previous one runs starts late."""
+    platform = MockEntityPlatform(hass)
+    release = asyncio.Event()
+    updates = []
+
+    async def async_update():
+        updates.append(None)
+        await release.wait()
+
+    ent = MockEntity(should_poll=True)
+    ent.async_update = async_update
+    await platform.async_add_entities([ent])
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + platform.scan_interval)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert len(updates) == 1
+
+    # Next update is due while the first one is still running
+    async_fire_time_changed(hass, now + platform.scan_interval * 2)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert len(updates) == 1
+
+    with patch('homeassistant.util.dt.utcnow',
+               return_value=now + platform.scan_interval * 2.5):
+        release.set()
+        await hass.async_block_till_done()
+    assert len(updates) == 2
+    assert platform.polling_lag > timedelta(0)
+    assert 'took longer than the scheduled update interval' in caplog.text
+
+
+async def test_polling_lag_warning_rate_limited(hass, caplog):
+    """Test polling lag of a platform is only warned about now and then."""
+    platform = MockEntityPlatform(hass)
+    now = dt_util.utcnow()
+
+    with patch('homeassistant.util.dt.utcnow', return_value=now):
+        platform.async_report_polling_lag(timedelta(seconds=1))
+        platform.async_report_polling_lag(timedelta(seconds=2))
+
+    warnings = [record for record in caplog.records
+                if record.levelname == 'WARNING']
+    assert len(warnings) == 1
+    assert platform.polling_lag == timedelta(seconds=2)
+
+    with patch('homeassistant.util.dt.utcnow',
+               return_value=now +
+               entity_platform.POLLING_LAG_WARNING_INTERVAL):
+        platform.async_report_polling_lag(timedelta(seconds=3))
+
+    warnings = [record for record in caplog.records
+                if record.levelname == 'WARNING']
+    assert len(warnings) == 2
+
+
+async def test_polling_continues_after_error(hass, caplog):
+    """Test an entity is polled again after writing its state failed."""
+    platform = MockEntityPlatform(hass)
+    updates = []
+
+    class FailingEntity(MockEntity):
+        @property
+        def state(self):
+            updates.append(None)
+            raise ValueError('boom')
+
+    ent = FailingEntity(should_poll=True)
+    ent.hass = hass
+    ent.entity_id = 'test_domain.failing'
+    ent.platform = platform
+    now = dt_util.utcnow()
+    cancel = entity_platform.async_get_polling_scheduler(
+        hass).async_schedule(platform, ent)
+
+    async_fire_time_changed(hass, now + platform.scan_interval)
+    await hass.async_block_till_done()
+    assert len(updates) == 1
+    assert 'Error updating test_domain.failing' in caplog.text
+
+    async_fire_time_changed(hass, now + platform.scan_interval * 2)
+    await hass.async_block_till_done()
+    assert len(updates) == 2
+    cancel()
+
+
+async def test_polling_starts_when_should_poll_changes(hass):
+    """Test an entity is polled once it starts asking for it."""
+    platform = MockEntityPlatform(hass)
+    updates = []
+
+    async def async_update():
+        updates.append(None)
+
+    ent = MockEntity(should_poll=False)
+    ent.async_update = async_update
+    await platform.async_add_entities([ent])
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + platform.scan_interval)
+    await hass.async_block_till_done()
+    assert not updates
+
+    ent._values['should_poll'] = True
+    async_fire_time_changed(hass, now + platform.scan_interval * 2)
+    await hass.async_block_till_done()
+    assert len(updates) == 1
+
+
+async def test_polling_stops_for_removed_entity(hass):
+    """Test removing a polling entity stops polling it."""
+    platform = MockEntityPlatform(hass)
+    updates = []
+
+    async def async_update():
+        updates.append(None)
+
+    ent = MockEntity(should_poll=True)
+    ent.async_update = async_update
+    await platform.async_add_entities([ent])
+
+    await platform.async_reset()
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + platform.scan_interval)
+    await hass.async_block_till_done()
+    assert not updates
@@ -12,7 +12,10 @@ from homeassistant.setup import setup_component
 import homeassistant.core as ha
 from homeassistant.const import MATCH_ALL
 from homeassistant.helpers.event import (
+    TRACK_STATE_CHANGE_CALLBACKS,
+    async_call_at,
     async_call_later,
+    async_track_state_change,
     call_later,
     track_point_in_utc_time,
     track_point_in_time,
@@ -29,7 +32,8 @@ from homeassistant.helpers.template import Template
 from homeassistant.components import sun
 import homeassistant.util.dt as dt_util
 
-from tests.common import get_test_home_assistant, fire_time_changed
+from tests.common import (
+    async_fire_time_changed, get_test_home_assistant, fire_time_changed)
 from unittest.mock import patch
 
 
@@ -771,3 +775,68 @@ def test_async_call_later(hass):
     assert p_action is action
     assert p_point == now + timedelta(seconds=3)
     assert remove is mock()
+
+
+async def test_track_state_change_shares_listener(hass, caplog):
+    """Test trackers of specific entities share one state listener."""
+    listeners = hass.bus.async_listeners().get('state_changed', 0)
+    light_runs = []
+    switch_runs = []
+
+    @callback
+    def failing_action(entity_id, old_state, new_state):
+        raise ValueError('boom')
+
+    unsub_light = async_track_state_change(
+        hass, ['light.Bowl', 'light.bowl'],
+        lambda *args: light_runs.append(args))
+    unsub_switch = async_track_state_change(
+        hass, 'switch.ceiling', lambda *args: switch_runs.append(args))
+    unsub_failing = async_track_state_change(
+        hass, 'light.bowl', failing_action)
+
+    assert hass.bus.async_listeners()['state_changed'] == listeners + 1
+
+    hass.states.async_set('light.bowl', 'on')
+    await hass.async_block_till_done()
+    assert len(light_runs) == 1
+    assert len(switch_runs) == 0
+    assert 'Error while processing state changed for light.bowl' \
+        in caplog.text
+
+    unsub_failing()
+    unsub_light()
+    hass.states.async_set('light.bowl', 'off')
+    hass.states.async_set('switch.ceiling', 'on')
+    await hass.async_block_till_done()
+    assert len(light_runs) == 1
+    assert len(switch_runs) == 1
+    assert list(hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == ['switch.ceiling']
+
+    unsub_switch()
+    assert hass.bus.async_listeners().get('state_changed', 0) == listeners
+
+
+async def test_async_call_at(hass):
+    """Test calling an action at a point in time with a loop timer."""
+    runs = []
+    point_in_time = dt_util.utcnow() + timedelta(seconds=0.05)
+    listeners = hass.bus.async_listeners()
+
+    @callback
+    def action(now):
+        runs.append(now)
+
+    async_call_at(hass, point_in_time, action)
+    remove = async_call_at(hass, point_in_time, action)
+    assert hass.bus.async_listeners() == listeners
+
+    remove()
+    # Time changed events are not listened to
+    async_fire_time_changed(hass, point_in_time)
+    await hass.async_block_till_done()
+    assert runs == []
+
+    await asyncio.sleep(0.1)
+    await hass.async_block_till_done()
+    assert runs == [point_in_time]
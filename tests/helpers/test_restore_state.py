@@ -1,13 +1,15 @@
 """The tests for the Restore component."""
-from datetime import datetime
+from datetime import datetime, timedelta
+import os
+from unittest.mock import Mock
 
-from homeassistant.const import EVENT_HOMEASSISTANT_START
+from homeassistant.const import ATTR_RESTORED, EVENT_HOMEASSISTANT_START
 from homeassistant.core import CoreState, State
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.restore_state import (
-    RestoreStateData, RestoreEntity, StoredState, DATA_RESTORE_STATE_TASK,
-    STORAGE_KEY)
+    RestoreStateData, RestoreEntity, StateJournal, StoredState,
+    DATA_RESTORE_STATE_TASK, JOURNAL_KEY, SNAPSHOT_STORAGE_KEY, STORAGE_KEY)
 from homeassistant.util import dt as dt_util
 
 from asynctest import patch
@@ -25,7 +27,10 @@ async def test_caching_data(hass):
     ]
 
     data = await RestoreStateData.async_get_instance(hass)
-    await data.store.async_save([state.as_dict() for state in stored_states])
+    await data.store.async_save({
+        'generation': 1,
+        'states': [state.as_dict() for state in stored_states],
+    })
 
     # Emulate a fresh load
     hass.data[DATA_RESTORE_STATE_TASK] = None
@@ -58,7 +63,10 @@ async def test_hass_starting(hass):
     ]
 
     data = await RestoreStateData.async_get_instance(hass)
-    await data.store.async_save([state.as_dict() for state in stored_states])
+    await data.store.async_save({
+        'generation': 1,
+        'states': [state.as_dict() for state in stored_states],
+    })
 
     # Emulate a fresh load
     hass.data[DATA_RESTORE_STATE_TASK] = None
@@ -93,7 +101,7 @@ async def test_hass_starting(hass):
     assert mock_write_data.called
 
 
-async def test_dump_data(hass):
+async def test_dump_data(hass, hass_storage):
     """Test that we cache data."""
     states = [
         State('input_boolean.b0', 'on'),
@@ -130,7 +138,7 @@ async def test_dump_data(hass):
 
     assert mock_write_data.called
     args = mock_write_data.mock_calls[0][1]
-    written_states = args[0]
+    written_states = args[0]['states']
 
     # b0 should not be written, since it didn't extend RestoreEntity
     # b1 should be written, since it is present in the current run
@@ -151,14 +159,230 @@ async def test_dump_data(hass):
                    hass.states, 'async_all', return_value=states):
         await data.async_dump_states()
 
+    # Only the removal is written to the journal
+    assert not mock_write_data.called
+    assert hass_storage[JOURNAL_KEY] == [{
+        'generation': 1,
+        'entity_id': 'input_boolean.b1',
+        'stored': None,
+    }]
+
+    with patch('homeassistant.helpers.restore_state.Store.async_save'
+               ) as mock_write_data, patch.object(
+                   hass.states, 'async_all', return_value=states):
+        await data.async_dump_states(force=True)
+
     assert mock_write_data.called
     args = mock_write_data.mock_calls[0][1]
-    written_states = args[0]
+    assert args[0]['generation'] == 2
+    written_states = args[0]['states']
     assert len(written_states) == 1
     assert written_states[0]['state']['entity_id'] == 'input_boolean.b3'
     assert written_states[0]['state']['state'] == 'off'
 
 
+async def test_dump_skipped_without_changes(hass, hass_storage):
+    """Test that states are only dumped again if they changed."""
+    states = [
+        State('input_boolean.b0', 'on'),
+    ]
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = 'input_boolean.b0'
+    await entity.async_added_to_hass()
+
+    data = await RestoreStateData.async_get_instance(hass)
+
+    with patch('homeassistant.helpers.restore_state.Store.async_save'
+               ) as mock_write_data, patch.object(
+                   hass.states, 'async_all', return_value=states):
+        await data.async_dump_states()
+        assert len(mock_write_data.mock_calls) == 1
+
+        await data.async_dump_states()
+        assert len(mock_write_data.mock_calls) == 1
+
+        await data.async_dump_states(force=True)
+        assert len(mock_write_data.mock_calls) == 2
+
+        states[0] = State('input_boolean.b0', 'off')
+        await data.async_dump_states()
+        assert len(mock_write_data.mock_calls) == 2
+
+    records = hass_storage[JOURNAL_KEY]
+    assert len(records) == 1
+    assert records[0]['stored']['state']['state'] == 'off'
+
+
+async def test_dump_reuses_serialized_states(hass):
+    """Test unchanged states are serialized once and removed ones dropped."""
+    states = [
+        State('input_boolean.b0', 'on'),
+        State('input_boolean.b1', 'on'),
+    ]
+    data = await RestoreStateData.async_get_instance(hass)
+    data.entity_ids = {'input_boolean.b0', 'input_boolean.b1'}
+
+    with patch('homeassistant.helpers.restore_state.Store.async_save'
+               ) as mock_write_data, patch.object(
+                   hass.states, 'async_all', return_value=states):
+        await data.async_dump_states()
+        await data.async_dump_states(force=True)
+
+        first = mock_write_data.mock_calls[0][1][0]['states']
+        second = mock_write_data.mock_calls[1][1][0]['states']
+        assert first[0]['state'] is second[0]['state']
+
+        data.entity_ids.remove('input_boolean.b1')
+        del states[1]
+        await data.async_dump_states()
+
+    assert len(mock_write_data.mock_calls) == 2
+    assert list(data._state_dicts) == ['input_boolean.b0']
+
+
+async def test_dump_keeps_states_of_placeholders(hass):
+    """Test placeholder states don't replace the stored states."""
+    data = await RestoreStateData.async_get_instance(hass)
+    now = dt_util.utcnow()
+    data.last_states = {
+        'light.kitchen': StoredState(State('light.kitchen', 'on'), now),
+    }
+    states = [
+        State('light.kitchen', 'unavailable', {ATTR_RESTORED: True}),
+    ]
+
+    with patch('homeassistant.helpers.restore_state.Store.async_save'
+               ) as mock_write_data, patch.object(
+                   hass.states, 'async_all', return_value=states):
+        await data.async_dump_states()
+
+    written_states = mock_write_data.mock_calls[0][1][0]['states']
+    assert len(written_states) == 1
+    assert written_states[0]['state']['entity_id'] == 'light.kitchen'
+    assert written_states[0]['state']['state'] == 'on'
+
+
+async def test_journal(hass, hass_storage):
+    """Test only changed states are written until the journal is compacted."""
+    states = [State('input_boolean.b{}'.format(index), 'on')
+              for index in range(3)]
+    data = await RestoreStateData.async_get_instance(hass)
+    data.entity_ids = {state.entity_id for state in states}
+
+    with patch.object(hass.states, 'async_all', return_value=states):
+        await data.async_dump_states()
+        assert len(hass_storage[STORAGE_KEY]['data']['states']) == 3
+        assert JOURNAL_KEY not in hass_storage
+
+        states[1] = State('input_boolean.b1', 'off')
+        await data.async_dump_states()
+        data.entity_ids.remove('input_boolean.b2')
+        del states[2]
+        await data.async_dump_states()
+
+    assert hass_storage[STORAGE_KEY]['data']['generation'] == 1
+    assert [(record['generation'], record['entity_id'])
+            for record in hass_storage[JOURNAL_KEY]] == [
+                (1, 'input_boolean.b1'), (1, 'input_boolean.b2')]
+
+    # Records of another generation are outdated
+    hass_storage[JOURNAL_KEY].insert(0, {
+        'generation': 0,
+        'entity_id': 'input_boolean.b0',
+        'stored': None,
+    })
+
+    # Emulate a fresh load
+    hass.data[DATA_RESTORE_STATE_TASK] = None
+    with patch.object(hass.states, 'async_all', return_value=[]):
+        data = await RestoreStateData.async_get_instance(hass)
+        assert sorted(data.last_states) == [
+            'input_boolean.b0', 'input_boolean.b1']
+        assert data.last_states['input_boolean.b1'].state.state == 'off'
+
+        # All stored states are written on the first dump
+        await hass.async_block_till_done()
+
+    assert JOURNAL_KEY not in hass_storage
+    assert hass_storage[STORAGE_KEY]['data']['generation'] == 2
+
+    # A journal with more records than stored states is compacted
+    data.last_states = {}
+    data.entity_ids = {'input_boolean.b0'}
+    states = [State('input_boolean.b0', 'on')]
+    with patch.object(hass.states, 'async_all', return_value=states):
+        await data.async_dump_states()
+        assert hass_storage[STORAGE_KEY]['data']['generation'] == 3
+
+        states[0] = State('input_boolean.b0', 'off')
+        await data.async_dump_states()
+        assert len(hass_storage[JOURNAL_KEY]) == 1
+
+        states[0] = State('input_boolean.b0', 'on')
+        await data.async_dump_states()
+
+    assert JOURNAL_KEY not in hass_storage
+    assert hass_storage[STORAGE_KEY]['data']['generation'] == 4
+
+
+def test_journal_file(tmpdir):
+    """Test reading, appending to and clearing the journal file."""
+    hass = Mock()
+    hass.config.path = lambda *path: os.path.join(str(tmpdir), *path)
+    journal = StateJournal(hass, JOURNAL_KEY)
+
+    assert journal._read() == []
+
+    journal._append([{'entity_id': 'light.kitchen'}])
+    journal._append([{'entity_id': 'light.hallway'}])
+    # A record that was cut off while it was written
+    with open(journal.path, 'a') as fil:
+        fil.write('{"entity_id":')
+
+    assert journal._read() == [
+        {'entity_id': 'light.kitchen'}, {'entity_id': 'light.hallway'}]
+
+    journal._clear()
+    assert journal._read() == []
+
+
+async def test_state_snapshot(hass, hass_storage):
+    """Test the state machine is seeded from the snapshot of the last run."""
+    last_changed = dt_util.utcnow() - timedelta(hours=1)
+    hass.states.async_set('light.kitchen', 'on', {'brightness': 100})
+    hass.states.async_set('light.hallway', 'unavailable', {
+        ATTR_RESTORED: True})
+
+    data = await RestoreStateData.async_get_instance(hass)
+    with patch('homeassistant.util.dt.utcnow', return_value=last_changed):
+        hass.states.async_set('sensor.temperature', '21')
+    await data.async_dump_snapshot()
+
+    snapshot = hass_storage[SNAPSHOT_STORAGE_KEY]['data']
+    assert sorted(item['entity_id'] for item in snapshot) == [
+        'light.kitchen', 'sensor.temperature']
+
+    hass.states.async_remove('light.kitchen')
+    hass.states.async_remove('sensor.temperature')
+    hass.states.async_set('light.kitchen', 'off')
+
+    await data.async_restore_snapshot()
+    await hass.async_block_till_done()
+
+    # States that are set already are not replaced
+    assert hass.states.get('light.kitchen').state == 'off'
+
+    state = hass.states.get('sensor.temperature')
+    assert state.state == '21'
+    assert state.attributes == {ATTR_RESTORED: True}
+    assert state.last_changed == last_changed
+
+    # The snapshot is only used once
+    assert hass_storage[SNAPSHOT_STORAGE_KEY]['data'] == []
+
+
 async def test_dump_error(hass):
     """Test that we cache data."""
     states = [
@@ -250,3 +474,42 @@ async def test_restoring_invalid_entity_id(hass, hass_storage):
 
     state = await entity.async_get_last_state()
     assert state is None
+
+
+async def test_stored_states_parsed_lazily(hass, hass_storage):
+    """Test stored states are parsed when they are first needed."""
+    now = dt_util.utcnow().isoformat()
+    stored_state = {
+        'state': {
+            'entity_id': 'input_boolean.b0',
+            'state': 'on',
+            'attributes': {},
+            'last_changed': now,
+            'last_updated': now,
+            'context': {
+                'id': '3c2243ff5f30447eb12e7348cfd5b8ff',
+                'user_id': None
+            }
+        },
+        'last_seen': now
+    }
+    hass_storage[STORAGE_KEY] = {
+        'version': 1,
+        'key': STORAGE_KEY,
+        'data': [stored_state]
+    }
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = 'input_boolean.b0'
+
+    with patch('homeassistant.helpers.restore_state.State.from_dict',
+               wraps=State.from_dict) as mock_from_dict:
+        data = await RestoreStateData.async_get_instance(hass)
+        assert data.last_states['input_boolean.b0'].as_dict() == stored_state
+        assert not mock_from_dict.called
+
+        state = await entity.async_get_last_state()
+
+    assert mock_from_dict.called
+    assert state.state == 'on'
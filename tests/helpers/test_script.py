@@ -1,5 +1,6 @@
 """The tests for the Script component."""
 # pylint: disable=protected-access
+import asyncio
 from datetime import timedelta
 from unittest import mock
 import unittest
@@ -15,7 +16,8 @@ import homeassistant.components  # noqa
 import homeassistant.util.dt as dt_util
 from homeassistant.helpers import script, config_validation as cv
 
-from tests.common import fire_time_changed, get_test_home_assistant
+from tests.common import (
+    async_fire_time_changed, fire_time_changed, get_test_home_assistant)
 
 
 ENTITY_ID = 'script.test'
@@ -799,7 +801,7 @@ async def test_propagate_error_service_not_found(hass):
         await script_obj.async_run()
 
     assert len(events) == 0
-    assert script_obj._cur == -1
+    assert not script_obj.is_running
 
 
 async def test_propagate_error_invalid_service_data(hass):
@@ -831,7 +833,7 @@ async def test_propagate_error_invalid_service_data(hass):
 
     assert len(events) == 0
     assert len(calls) == 0
-    assert script_obj._cur == -1
+    assert not script_obj.is_running
 
 
 async def test_propagate_error_service_exception(hass):
@@ -862,7 +864,165 @@ async def test_propagate_error_service_exception(hass):
 
     assert len(events) == 0
     assert len(calls) == 0
-    assert script_obj._cur == -1
+    assert not script_obj.is_running
+
+
+async def test_delay_uses_call_at(hass):
+    """Test a delay waits on a loop timer instead of time changed events."""
+    script_obj = script.Script(hass, cv.SCRIPT_SCHEMA([
+        {'delay': {'seconds': 5}},
+        {'event': 'test_event'}]))
+    cancel = mock.Mock()
+
+    with mock.patch('homeassistant.helpers.script.async_call_at',
+                    return_value=cancel) as mock_call_at:
+        await script_obj.async_run()
+
+    assert script_obj.is_running
+    assert len(mock_call_at.mock_calls) == 1
+
+    script_obj.async_stop()
+    assert not script_obj.is_running
+    assert cancel.called
+
+
+async def test_run_mode_parallel(hass):
+    """Test parallel runs each have their own delay and variables."""
+    events = []
+
+    @callback
+    def record_event(event):
+        events.append(event)
+
+    hass.bus.async_listen('test_event', record_event)
+
+    script_obj = script.Script(hass, cv.SCRIPT_SCHEMA([
+        {'delay': {'seconds': 5}},
+        {'event': 'test_event',
+         'event_data_template': {'value': '{{ value }}'}}]),
+        run_mode=script.RUN_MODE_PARALLEL, max_runs=2)
+
+    now = dt_util.utcnow()
+    with mock.patch('homeassistant.util.dt.utcnow', return_value=now):
+        await script_obj.async_run({'value': 1})
+
+    async_fire_time_changed(hass, now + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    with mock.patch('homeassistant.util.dt.utcnow',
+                    return_value=now + timedelta(seconds=2)):
+        await script_obj.async_run({'value': 2})
+        # Over the maximum number of runs
+        await script_obj.async_run({'value': 3})
+    assert script_obj.runs == 2
+
+    # Each run waits out its own delay
+    async_fire_time_changed(hass, now + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert [event.data['value'] for event in events] == ['1']
+    assert script_obj.runs == 1
+
+    async_fire_time_changed(hass, now + timedelta(seconds=7))
+    await hass.async_block_till_done()
+    assert [event.data['value'] for event in events] == ['1', '2']
+    assert not script_obj.is_running
+
+    assert [step['step'] for step in script_obj.last_run_steps] == [1, 2]
+    assert script_obj.last_run_steps[0]['action'] == 'delay 0:00:05'
+    assert all(step['duration'] >= 0 for step in script_obj.last_run_steps)
+
+
+async def test_run_mode_queued(hass):
+    """Test queued runs wait for the previous run to finish."""
+    events = []
+
+    @callback
+    def record_event(event):
+        events.append(event)
+
+    hass.bus.async_listen('test_event', record_event)
+
+    script_obj = script.Script(hass, cv.SCRIPT_SCHEMA([
+        {'event': 'test_event',
+         'event_data_template': {'value': '{{ value }}'}},
+        {'delay': {'seconds': 5}}]),
+        run_mode=script.RUN_MODE_QUEUED)
+
+    await script_obj.async_run({'value': 1})
+    await script_obj.async_run({'value': 2})
+    await hass.async_block_till_done()
+    assert script_obj.runs == 2
+    assert [event.data['value'] for event in events] == ['1']
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert [event.data['value'] for event in events] == ['1', '2']
+    assert script_obj.runs == 1
+
+    script_obj.async_stop()
+    assert script_obj.runs == 0
+
+
+async def test_legacy_run_while_executing_step(hass):
+    """Test running again while a step is executed starts a new run."""
+    events = []
+    release = asyncio.Event()
+
+    @callback
+    def record_event(event):
+        events.append(event)
+
+    hass.bus.async_listen('test_event', record_event)
+
+    async def blocking_service(call):
+        await release.wait()
+
+    hass.services.async_register('test', 'script', blocking_service)
+
+    script_obj = script.Script(hass, cv.SCRIPT_SCHEMA([
+        {'service': 'test.script'},
+        {'event': 'test_event',
+         'event_data_template': {'value': '{{ value }}'}}]))
+
+    first = hass.async_create_task(script_obj.async_run({'value': 1}))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert script_obj.is_running
+
+    second = hass.async_create_task(script_obj.async_run({'value': 2}))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert script_obj.runs == 2
+
+    release.set()
+    await asyncio.gather(first, second)
+    await hass.async_block_till_done()
+    assert sorted(event.data['value'] for event in events) == ['1', '2']
+    assert not script_obj.is_running
+
+
+async def test_stop_while_executing_failing_step(hass):
+    """Test a step that fails after the run was stopped."""
+    release = asyncio.Event()
+
+    async def failing_service(call):
+        await release.wait()
+        raise exceptions.HomeAssistantError('boom')
+
+    hass.services.async_register('test', 'script', failing_service)
+
+    script_obj = script.Script(hass, cv.SCRIPT_SCHEMA([
+        {'service': 'test.script'}]))
+
+    run = hass.async_create_task(script_obj.async_run())
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    script_obj.async_stop()
+    assert not script_obj.is_running
+
+    release.set()
+    with pytest.raises(exceptions.HomeAssistantError):
+        await run
+    assert not script_obj.is_running
 
 
 def test_log_exception():
@@ -339,6 +339,20 @@ async def test_call_context_target_specific(hass, mock_service_platform_call,
     assert entities == [mock_entities['light.kitchen']]
 
 
+async def test_call_targets_unknown_entities(
+        hass, mock_service_platform_call, mock_entities):
+    """Check targeted entities are looked up per platform."""
+    await service.entity_service_call(hass, [
+        Mock(entities=mock_entities)
+    ], Mock(), ha.ServiceCall('test_domain', 'test_service', {
+        'entity_id': ['light.living_room', 'light.unknown']
+    }))
+
+    assert len(mock_service_platform_call.mock_calls) == 1
+    entities = mock_service_platform_call.mock_calls[0][1][2]
+    assert entities == [mock_entities['light.living_room']]
+
+
 async def test_call_context_target_specific_no_auth(
         hass, mock_service_platform_call, mock_entities):
     """Check targeting specific entities without auth."""
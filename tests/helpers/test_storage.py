@@ -192,3 +192,53 @@ async def test_migrator_transforming_config(hass, store, hass_storage):
         'version': MOCK_VERSION,
         'data': data,
     }
+
+
+async def test_writes_are_batched(hass):
+    """Test stores saved together are written by one executor job."""
+    store2 = storage.Store(hass, MOCK_VERSION, 'storage-test-2')
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    written = []
+
+    def mock_write_data(store, path, data):
+        written.append((store.key, data['data']))
+        return 10
+
+    with patch('homeassistant.helpers.storage.Store._write_data',
+               new=mock_write_data), \
+            patch.object(hass, 'async_add_executor_job',
+                         wraps=hass.async_add_executor_job) as mock_job:
+        await asyncio.gather(
+            store.async_save(MOCK_DATA),
+            store2.async_save(MOCK_DATA),
+            store.async_save(MOCK_DATA2))
+
+    # Only the last data of a store is written
+    assert written == [(MOCK_KEY, MOCK_DATA2), ('storage-test-2', MOCK_DATA)]
+    assert len(mock_job.mock_calls) == 1
+    assert storage.async_get_writer(hass).stats == {
+        MOCK_KEY: {'writes': 1, 'bytes': 10},
+        'storage-test-2': {'writes': 1, 'bytes': 10},
+    }
+
+
+async def test_write_error_does_not_stop_batch(hass, caplog):
+    """Test a failing store does not prevent writing the other stores."""
+    store2 = storage.Store(hass, MOCK_VERSION, 'storage-test-2')
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    written = []
+
+    def mock_write_data(store, path, data):
+        if store.key == MOCK_KEY:
+            raise storage.json_util.WriteError('boom')
+        written.append(store.key)
+        return 10
+
+    with patch('homeassistant.helpers.storage.Store._write_data',
+               new=mock_write_data):
+        await asyncio.gather(
+            store.async_save(MOCK_DATA),
+            store2.async_save(MOCK_DATA))
+
+    assert written == ['storage-test-2']
+    assert 'Error writing config for storage-test: boom' in caplog.text
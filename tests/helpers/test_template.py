@@ -1076,3 +1076,15 @@ def test_length_of_states(hass):
 
     tpl = template.Template('{{ states.sensor | length }}', hass)
     assert tpl.async_render() == '2'
+
+
+def test_compiled_code_is_shared(hass):
+    """Test templates with the same source share the compiled code."""
+    tpl_1 = template.Template('{{ 1 + 1 }}', hass)
+    tpl_2 = template.Template('{{ 1 + 1 }}', hass)
+
+    tpl_1.ensure_valid()
+    tpl_2.ensure_valid()
+
+    assert tpl_1._compiled_code is tpl_2._compiled_code
+    assert tpl_1.async_render() == tpl_2.async_render() == '2'
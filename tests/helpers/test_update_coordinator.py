@@ -0,0 +1,175 @@
+"""Tests for the update coordinator."""
+import asyncio
+from datetime import timedelta
+import logging
+
+import pytest
+
+from homeassistant.helpers import update_coordinator
+from homeassistant.helpers.entity_platform import _should_poll
+from homeassistant.util.dt import utcnow
+
+from tests.common import async_fire_time_changed
+
+LOGGER = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def crd(hass):
+    """Coordinator mock."""
+    calls = 0
+
+    async def refresh():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    crd = update_coordinator.DataUpdateCoordinator(
+        hass, LOGGER, name='test', update_method=refresh,
+        update_interval=timedelta(seconds=10))
+    return crd
+
+
+async def test_async_refresh(crd):
+    """Test async_refresh for update coordinator."""
+    assert crd.data is None
+    await crd.async_refresh()
+    assert crd.data == 1
+    assert crd.last_update_success is True
+
+    updates = []
+
+    def update_callback():
+        updates.append(crd.data)
+
+    unsub = crd.async_add_listener(update_callback)
+    await crd.async_refresh()
+    assert updates == [2]
+
+    # Test unsubscribing through function
+    unsub()
+    await crd.async_refresh()
+    assert updates == [2]
+
+    # Test unsubscribing through method
+    crd.async_add_listener(update_callback)
+    crd.async_remove_listener(update_callback)
+    await crd.async_refresh()
+    assert updates == [2]
+
+
+async def test_refresh_in_flight_is_shared(hass):
+    """Test concurrent refreshes only hit the data source once."""
+    calls = 0
+    release = asyncio.Event()
+
+    async def refresh():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    crd = update_coordinator.DataUpdateCoordinator(
+        hass, LOGGER, name='test', update_method=refresh,
+        update_interval=timedelta(seconds=10))
+
+    refreshes = [hass.async_create_task(crd.async_refresh())
+                 for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*refreshes)
+
+    assert calls == 1
+    assert crd.data == 1
+
+
+async def test_refresh_executor_update_method(hass):
+    """Test a sync update method is run in the executor."""
+    crd = update_coordinator.DataUpdateCoordinator(
+        hass, LOGGER, name='test', update_method=lambda: 'sync',
+        update_interval=timedelta(seconds=10))
+
+    await crd.async_refresh()
+    assert crd.data == 'sync'
+
+
+async def test_refresh_fail(crd, caplog):
+    """Test a failing update function logs once and backs off."""
+    async def fail():
+        raise update_coordinator.UpdateFailed("This is a failure")
+
+    crd._job = update_coordinator.HassJob(fail)  # pylint: disable=W0212
+
+    await crd.async_refresh()
+    assert crd.data is None
+    assert crd.last_update_success is False
+    assert "Error fetching test data: This is a failure" in caplog.text
+
+    caplog.clear()
+    await crd.async_refresh()
+    assert crd.last_update_success is False
+    assert "Error fetching test data" not in caplog.text
+
+
+async def test_update_interval_and_backoff(hass, crd):
+    """Test the coordinator polls while it has listeners and backs off."""
+    updates = []
+
+    def update_callback():
+        updates.append(crd.data)
+
+    unsub = crd.async_add_listener(update_callback)
+
+    async_fire_time_changed(hass, utcnow() + crd.update_interval)
+    await hass.async_block_till_done()
+    assert updates == [1]
+
+    async def fail():
+        raise update_coordinator.UpdateFailed("This is a failure")
+
+    crd._job = update_coordinator.HassJob(fail)  # pylint: disable=W0212
+
+    now = utcnow()
+    async_fire_time_changed(hass, now + crd.update_interval)
+    await hass.async_block_till_done()
+    assert len(updates) == 2
+
+    # The next refresh is scheduled after twice the interval
+    async_fire_time_changed(hass, now + crd.update_interval * 2)
+    await hass.async_block_till_done()
+    assert len(updates) == 2
+
+    async_fire_time_changed(hass, now + crd.update_interval * 3)
+    await hass.async_block_till_done()
+    assert len(updates) == 3
+
+    unsub()
+    async_fire_time_changed(hass, now + crd.update_interval * 20)
+    await hass.async_block_till_done()
+    assert len(updates) == 3
+
+
+async def test_coordinator_entity(hass, crd):
+    """Test the coordinator entity is not polled and writes on updates."""
+    entity = update_coordinator.CoordinatorEntity(crd)
+    entity.hass = hass
+    entity.entity_id = 'sensor.test'
+
+    assert entity.should_poll is False
+    assert _should_poll(entity) is False
+
+    class PollingEntity(update_coordinator.CoordinatorEntity):
+        should_poll = True
+
+    # Bound to a coordinator, the platform skips it even if it should poll
+    assert _should_poll(PollingEntity(crd)) is False
+
+    await entity.async_added_to_hass()
+    await crd.async_refresh()
+    assert hass.states.get('sensor.test') is not None
+
+    await entity.async_update()
+    assert crd.data == 2
+
+    await entity.async_remove()
+    assert not crd._listeners  # pylint: disable=W0212
@@ -2,16 +2,22 @@
 # pylint: disable=protected-access
 import asyncio
 import os
+from time import monotonic
 from unittest.mock import Mock, patch
 import logging
 
 import homeassistant.config as config_util
 from homeassistant import bootstrap
+from homeassistant.const import (
+    ATTR_FRIENDLY_NAME, ATTR_RESTORED, EVENT_COMPONENT_LOADED,
+    EVENT_HOMEASSISTANT_START)
+from homeassistant.core import CoreState, HomeAssistant, State
+from homeassistant.helpers import entity_registry, restore_state
 import homeassistant.util.dt as dt_util
 
 from tests.common import (
     patch_yaml_files, get_test_config_dir, mock_coro, mock_integration,
-    MockModule)
+    mock_registry, mock_restore_cache, MockModule)
 
 ORIG_TIMEZONE = dt_util.DEFAULT_TIME_ZONE
 VERSION_PATH = os.path.join(get_test_config_dir(), config_util.VERSION_FILE)
@@ -121,6 +127,49 @@ async def test_setting_up_config(hass, caplog):
     assert 'group' in hass.config.components
 
 
+async def test_preload_integrations(hass):
+    """Test integrations and configured platforms are imported ahead."""
+    preloaded = []
+
+    async def mock_preload(integration, platforms=()):
+        preloaded.append((integration.domain, list(platforms)))
+
+    with patch('homeassistant.loader.Integration.async_preload',
+               side_effect=mock_preload, autospec=True), \
+            patch('homeassistant.requirements.async_requirements_met',
+                  side_effect=lambda *args: mock_coro(True)):
+        await bootstrap._async_preload_integrations(hass, {
+            'light': [{'platform': 'hue'}, {'platform': 'not_exists'}],
+            'light 2': {'platform': 'demo'},
+            'group': {},
+        }, ['light', 'group'])
+
+    assert sorted(preloaded) == [
+        ('demo', ['light']),
+        ('group', []),
+        ('hue', ['light']),
+        ('light', []),
+    ]
+
+
+async def test_preload_skips_missing_requirements(hass):
+    """Test integrations with missing requirements are not imported ahead."""
+    preloaded = []
+
+    async def mock_preload(integration, platforms=()):
+        preloaded.append((integration.domain, list(platforms)))
+
+    with patch('homeassistant.loader.Integration.async_preload',
+               side_effect=mock_preload, autospec=True), \
+            patch('homeassistant.requirements.async_requirements_met',
+                  return_value=mock_coro(False)):
+        await bootstrap._async_preload_integrations(hass, {
+            'light': [{'platform': 'hue'}],
+        }, ['light'])
+
+    assert preloaded == [('light', [])]
+
+
 async def test_setup_after_deps_all_present(hass, caplog):
     """Test after_dependencies when all present."""
     caplog.set_level(logging.DEBUG)
@@ -240,3 +289,162 @@ async def test_setup_after_deps_not_present(hass, caplog):
     assert 'first_dep' not in hass.config.components
     assert 'second_dep' in hass.config.components
     assert order == ['root', 'second_dep']
+
+
+async def test_setup_after_start(hass):
+    """Test integrations that declare it are set up after start."""
+    hass.state = CoreState.not_running
+    order = []
+
+    def gen_domain_setup(domain):
+        async def async_setup(hass, config):
+            order.append(domain)
+            return True
+
+        return async_setup
+
+    mock_integration(hass, MockModule(
+        domain='root',
+        async_setup=gen_domain_setup('root')
+    ))
+    mock_integration(hass, MockModule(
+        domain='slow',
+        async_setup=gen_domain_setup('slow'),
+        partial_manifest={
+            'setup_after_start': True
+        }
+    ))
+    mock_integration(hass, MockModule(
+        domain='after_slow',
+        async_setup=gen_domain_setup('after_slow'),
+        partial_manifest={
+            'after_dependencies': ['slow']
+        }
+    ))
+    mock_registry(hass, {
+        'light.kitchen': entity_registry.RegistryEntry(
+            entity_id='light.kitchen',
+            unique_id='1234',
+            platform='slow'
+        ),
+        'light.hallway': entity_registry.RegistryEntry(
+            entity_id='light.hallway',
+            unique_id='5678',
+            platform='slow'
+        ),
+        'light.other': entity_registry.RegistryEntry(
+            entity_id='light.other',
+            unique_id='9012',
+            platform='root'
+        ),
+    })
+    mock_restore_cache(hass, [
+        State('light.kitchen', 'on', {ATTR_FRIENDLY_NAME: 'Kitchen'}),
+    ])
+
+    await bootstrap._async_set_up_integrations(hass, {
+        'root': {},
+        'slow': {},
+        'after_slow': {},
+    })
+
+    assert order == ['root']
+
+    state = hass.states.get('light.kitchen')
+    assert state.state == 'unavailable'
+    assert state.attributes == {
+        ATTR_FRIENDLY_NAME: 'Kitchen',
+        ATTR_RESTORED: True,
+    }
+    assert hass.states.get('light.hallway').attributes == {
+        ATTR_RESTORED: True}
+    assert hass.states.get('light.other') is None
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+
+    assert order == ['root', 'slow', 'after_slow']
+
+
+async def test_start_not_blocked_by_setup_after_start(hass):
+    """Test start does not wait for integrations set up after start."""
+    hass.state = CoreState.not_running
+    release = asyncio.Event(loop=hass.loop)
+
+    async def async_setup_slow(hass, config):
+        await release.wait()
+        return True
+
+    mock_integration(hass, MockModule(domain='root'))
+    mock_integration(hass, MockModule(
+        domain='slow',
+        async_setup=async_setup_slow,
+        partial_manifest={
+            'setup_after_start': True
+        }
+    ))
+
+    loaded = asyncio.Event(loop=hass.loop)
+    hass.bus.async_listen(
+        EVENT_COMPONENT_LOADED, lambda event: loaded.set())
+
+    start = monotonic()
+    await bootstrap._async_set_up_integrations(hass, {
+        'root': {},
+        'slow': {},
+    })
+    # The test instance keeps tracking tasks while starting, use the real
+    # start to not wait for the tasks created by the start listeners.
+    with patch('homeassistant.core._async_create_timer'):
+        await HomeAssistant.async_start(hass)
+    duration = monotonic() - start
+
+    # A blocked start would only continue after TIMEOUT_EVENT_START
+    assert duration < 1
+    assert hass.state == CoreState.running
+    assert 'root' in hass.config.components
+    assert 'slow' not in hass.config.components
+
+    loaded.clear()
+    release.set()
+    await asyncio.wait_for(loaded.wait(), 1, loop=hass.loop)
+    assert 'slow' in hass.config.components
+
+
+async def test_restore_state_snapshot(hass, hass_storage):
+    """Test states of the last run are available until set up finished."""
+    hass_storage[restore_state.SNAPSHOT_STORAGE_KEY] = {
+        'version': restore_state.STORAGE_VERSION,
+        'key': restore_state.SNAPSHOT_STORAGE_KEY,
+        'data': [
+            {'entity_id': 'light.kitchen', 'state': 'on', 'attributes': {}},
+            {'entity_id': 'light.hallway', 'state': 'on', 'attributes': {}},
+            {'entity_id': 'light.removed', 'state': 'on', 'attributes': {}},
+        ],
+    }
+    mock_registry(hass, {
+        'light.hallway': entity_registry.RegistryEntry(
+            entity_id='light.hallway',
+            unique_id='1234',
+            platform='root'
+        ),
+    })
+    restored = []
+
+    async def async_setup(hass, config):
+        restored.extend(sorted(
+            state.entity_id for state in hass.states.async_all()
+            if state.attributes.get(ATTR_RESTORED)))
+        hass.states.async_set('light.kitchen', 'off')
+        return True
+
+    mock_integration(hass, MockModule(domain='root', async_setup=async_setup))
+
+    await bootstrap._async_set_up_integrations(hass, {'root': {}})
+
+    assert restored == ['light.hallway', 'light.kitchen', 'light.removed']
+    assert hass.states.get('light.kitchen').state == 'off'
+    state = hass.states.get('light.hallway')
+    assert state.state == 'unavailable'
+    assert state.attributes == {ATTR_RESTORED: True}
+    assert hass.states.get('light.removed') is None
@@ -36,7 +36,8 @@ from homeassistant.components.config.customize import (
 import homeassistant.scripts.check_config as check_config
 
 from tests.common import (
-    get_test_config_dir, get_test_home_assistant, patch_yaml_files)
+    MockModule, MockPlatform, get_test_config_dir, get_test_home_assistant,
+    mock_entity_platform, mock_integration, patch_yaml_files)
 
 CONFIG_DIR = get_test_config_dir()
 YAML_PATH = os.path.join(CONFIG_DIR, config_util.YAML_CONFIG_FILE)
@@ -1010,3 +1011,82 @@ async def test_merge_split_component_definition(hass):
     assert len(config['light one']) == 1
     assert len(config['light two']) == 1
     assert len(config['light three']) == 1
+
+
+async def test_validated_platform_configs_are_reused(hass):
+    """Test unchanged platform configs are not validated again."""
+    validated = []
+
+    def platform_schema(config):
+        validated.append(config['name'])
+        return dict(config, validated=True)
+
+    mock_integration(hass, MockModule(
+        'light', platform_schema=lambda config: config))
+    mock_entity_platform(hass, 'light.test', MockPlatform(
+        platform_schema=platform_schema))
+    integration = await async_get_integration(hass, 'light')
+
+    config = {'light': [
+        {'platform': 'test', 'name': 'one'},
+        {'platform': 'test', 'name': 'two'},
+    ]}
+    processed = await config_util.async_process_component_config(
+        hass, config, integration, memoize=True)
+    assert validated == ['one', 'two']
+    assert processed['light'] == [
+        {'platform': 'test', 'name': 'one', 'validated': True},
+        {'platform': 'test', 'name': 'two', 'validated': True},
+    ]
+    processed['light'][0]['changed'] = True
+
+    config = {'light': [
+        {'platform': 'test', 'name': 'one'},
+        {'platform': 'test', 'name': 'three'},
+    ]}
+    processed = await config_util.async_process_component_config(
+        hass, config, integration, memoize=True)
+    assert validated == ['one', 'two', 'three']
+    assert processed['light'] == [
+        {'platform': 'test', 'name': 'one', 'validated': True},
+        {'platform': 'test', 'name': 'three', 'validated': True},
+    ]
+
+    # Each caller gets its own copy of a reused config
+    second = await config_util.async_process_component_config(
+        hass, config, integration, memoize=True)
+    assert validated == ['one', 'two', 'three']
+    assert second['light'] == processed['light']
+    assert second['light'][0] is not processed['light'][0]
+
+
+async def test_platform_configs_not_memoized(hass):
+    """Test platform configs are validated again unless memoized."""
+    validated = []
+
+    def platform_schema(config):
+        validated.append(config['name'])
+        return config
+
+    mock_integration(hass, MockModule(
+        'light', platform_schema=lambda config: config))
+    mock_entity_platform(hass, 'light.test', MockPlatform(
+        platform_schema=platform_schema))
+    integration = await async_get_integration(hass, 'light')
+
+    config = {'light': [{'platform': 'test', 'name': 'one'}]}
+    await config_util.async_process_component_config(
+        hass, config, integration)
+    await config_util.async_process_component_config(
+        hass, config, integration)
+    assert validated == ['one', 'one']
+    assert 'light' not in hass.data.get(
+        config_util.DATA_VALIDATED_PLATFORMS, {})
+
+
+def test_config_key():
+    """Test config keys are equal for equal configs."""
+    assert config_util.config_key({'a': 1, 'b': [1, 2]}) == \
+        config_util.config_key(OrderedDict([('b', [1, 2]), ('a', 1)]))
+    assert config_util.config_key({'a': 1}) != \
+        config_util.config_key({'a': 2})
@@ -4,6 +4,7 @@ import asyncio
 import functools
 import logging
 import os
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
@@ -14,8 +15,8 @@ import pytz
 import pytest
 
 import homeassistant.core as ha
-from homeassistant.exceptions import (InvalidEntityFormatError,
-                                      InvalidStateError)
+from homeassistant.exceptions import (
+    HomeAssistantError, InvalidEntityFormatError, InvalidStateError)
 from homeassistant.util.async_ import run_coroutine_threadsafe
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import (METRIC_SYSTEM)
@@ -40,7 +41,7 @@ def test_async_add_job_schedule_callback():
     hass = MagicMock()
     job = MagicMock()
 
-    ha.HomeAssistant.async_add_job(hass, ha.callback(job))
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(ha.callback(job)))
     assert len(hass.loop.call_soon.mock_calls) == 1
     assert len(hass.loop.create_task.mock_calls) == 0
     assert len(hass.add_job.mock_calls) == 0
@@ -52,7 +53,7 @@ def test_async_add_job_schedule_partial_callback():
     job = MagicMock()
     partial = functools.partial(ha.callback(job))
 
-    ha.HomeAssistant.async_add_job(hass, partial)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(partial))
     assert len(hass.loop.call_soon.mock_calls) == 1
     assert len(hass.loop.create_task.mock_calls) == 0
     assert len(hass.add_job.mock_calls) == 0
@@ -65,7 +66,7 @@ def test_async_add_job_schedule_coroutinefunction(loop):
     async def job():
         pass
 
-    ha.HomeAssistant.async_add_job(hass, job)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(job))
     assert len(hass.loop.call_soon.mock_calls) == 0
     assert len(hass.loop.create_task.mock_calls) == 1
     assert len(hass.add_job.mock_calls) == 0
@@ -79,7 +80,7 @@ def test_async_add_job_schedule_partial_coroutinefunction(loop):
         pass
     partial = functools.partial(job)
 
-    ha.HomeAssistant.async_add_job(hass, partial)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(partial))
     assert len(hass.loop.call_soon.mock_calls) == 0
     assert len(hass.loop.create_task.mock_calls) == 1
     assert len(hass.add_job.mock_calls) == 0
@@ -92,12 +93,49 @@ def test_async_add_job_add_threaded_job_to_pool():
     def job():
         pass
 
-    ha.HomeAssistant.async_add_job(hass, job)
+    ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(job))
     assert len(hass.loop.call_soon.mock_calls) == 0
     assert len(hass.loop.create_task.mock_calls) == 0
     assert len(hass.loop.run_in_executor.mock_calls) == 1
 
 
+def test_async_add_job_wraps_target_in_hass_job():
+    """Test that async_add_job classifies the target with a HassJob."""
+    hass = MagicMock()
+
+    def job():
+        pass
+
+    ha.HomeAssistant.async_add_job(hass, job, 'arg')
+    assert len(hass.async_add_hass_job.mock_calls) == 1
+    hassjob, arg = hass.async_add_hass_job.mock_calls[0][1]
+    assert hassjob.target is job
+    assert hassjob.job_type == ha.HassJobType.Executor
+    assert arg == 'arg'
+
+
+def test_hass_job_types():
+    """Test that a HassJob determines the type of its target once."""
+    async def coro_job():
+        pass
+
+    def executor_job():
+        pass
+
+    assert ha.HassJob(coro_job).job_type == \
+        ha.HassJobType.Coroutinefunction
+    assert ha.HassJob(functools.partial(coro_job)).job_type == \
+        ha.HassJobType.Coroutinefunction
+    assert ha.HassJob(ha.callback(lambda: None)).job_type == \
+        ha.HassJobType.Callback
+    assert ha.HassJob(executor_job).job_type == ha.HassJobType.Executor
+
+    coro = coro_job()
+    with pytest.raises(ValueError):
+        ha.HassJob(coro)
+    coro.close()
+
+
 def test_async_create_task_schedule_coroutine(loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
     hass = MagicMock(loop=MagicMock(wraps=loop))
@@ -182,13 +220,11 @@ class TestHomeAssistant(unittest.TestCase):
         for _ in range(3):
             self.hass.add_job(test_coro())
 
-        run_coroutine_threadsafe(
-            asyncio.wait(self.hass._pending_tasks, loop=self.hass.loop),
-            loop=self.hass.loop
-        ).result()
+        self.hass.block_till_done()
 
-        assert len(self.hass._pending_tasks) == 3
         assert len(call_count) == 3
+        # Done tasks are no longer tracked
+        assert len(self.hass._pending_tasks) == 0
 
     def test_async_add_job_pending_tasks_coro(self):
         """Add a coro to pending tasks."""
@@ -211,9 +247,9 @@ class TestHomeAssistant(unittest.TestCase):
         run_coroutine_threadsafe(
             wait_finish_callback(), self.hass.loop).result()
 
-        assert len(self.hass._pending_tasks) == 2
         self.hass.block_till_done()
         assert len(call_count) == 2
+        assert len(self.hass._pending_tasks) == 0
 
     def test_async_add_job_pending_tasks_executor(self):
         """Run an executor in pending tasks."""
@@ -235,9 +271,9 @@ class TestHomeAssistant(unittest.TestCase):
         run_coroutine_threadsafe(
             wait_finish_callback(), self.hass.loop).result()
 
-        assert len(self.hass._pending_tasks) == 2
         self.hass.block_till_done()
         assert len(call_count) == 2
+        assert len(self.hass._pending_tasks) == 0
 
     def test_async_add_job_pending_tasks_callback(self):
         """Run a callback in pending tasks."""
@@ -646,6 +682,37 @@ class TestStateMachine(unittest.TestCase):
         assert 1 == len(events)
 
 
+async def test_state_machine_restore(hass):
+    """Test restoring a state keeps its last changed time."""
+    events = []
+
+    @ha.callback
+    def callback(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, callback)
+    last_changed = dt_util.utcnow() - timedelta(hours=2)
+    hass.states.async_set('light.kitchen', 'off')
+
+    hass.states.async_restore(
+        ha.State('light.bowl', 'on', {'brightness': 100}, last_changed))
+    hass.states.async_restore(ha.State('light.kitchen', 'on'))
+    await hass.async_block_till_done()
+
+    state = hass.states.get('light.bowl')
+    assert state.state == 'on'
+    assert state.attributes == {'brightness': 100}
+    assert state.last_changed == last_changed
+    assert hass.states.get('light.kitchen').state == 'off'
+    assert len(events) == 2
+    assert events[1].data['old_state'] is None
+    assert events[1].data['new_state'] is state
+
+    # Setting the same state keeps the restored last changed time
+    hass.states.async_set('light.bowl', 'on')
+    assert hass.states.get('light.bowl').last_changed == last_changed
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall('homeassistant', 'start')
@@ -1117,6 +1184,84 @@ async def test_service_call_event_contains_original_data(hass):
     assert calls[0].context is context
 
 
+def test_service_validate_remembers_simple_data():
+    """Test simple service data is validated once per payload."""
+    validations = []
+
+    def coerce(value):
+        validations.append(value)
+        return int(value)
+
+    service = ha.Service(lambda call: None, vol.Schema({
+        vol.Optional('number'): coerce,
+        vol.Optional('entity_id'): [str],
+    }))
+
+    data = {'number': '23', 'entity_id': ['light.kitchen']}
+    first = service.async_validate(data)
+    second = service.async_validate(dict(data))
+    assert first == second == {'number': 23, 'entity_id': ['light.kitchen']}
+    assert validations == ['23']
+
+    # The returned lists are copies of the remembered data
+    second['entity_id'].append('light.living_room')
+    assert service.async_validate(data)['entity_id'] == ['light.kitchen']
+
+    # Equal values of a different type are validated separately
+    service.async_validate({'number': 1})
+    service.async_validate({'number': True})
+    service.async_validate({'number': 1.0})
+    assert validations == ['23', 1, True, 1.0]
+
+
+def test_service_validate_skips_complex_data():
+    """Test service data that is not simple is always validated."""
+    validations = []
+
+    def validate(value):
+        validations.append(value)
+        return value
+
+    service = ha.Service(lambda call: None, vol.Schema({
+        'value': validate,
+    }))
+
+    service.async_validate({'value': {'nested': 1}})
+    service.async_validate({'value': {'nested': 1}})
+    assert len(validations) == 2
+
+    # Simple data that validates to complex data is not remembered
+    service = ha.Service(lambda call: None, vol.Schema({
+        'value': vol.All(validate, lambda value: {'wrapped': value}),
+    }))
+    service.async_validate({'value': 'test'})
+    service.async_validate({'value': 'test'})
+    assert len(validations) == 4
+
+
+def test_service_validate_cache_size():
+    """Test the least recently used service data is forgotten."""
+    validations = []
+
+    def validate(value):
+        validations.append(value)
+        return value
+
+    service = ha.Service(lambda call: None, vol.Schema({'value': validate}))
+
+    with patch('homeassistant.core.SERVICE_SCHEMA_CACHE_SIZE', 2):
+        service.async_validate({'value': 1})
+        service.async_validate({'value': 2})
+        service.async_validate({'value': 1})
+        service.async_validate({'value': 3})
+        assert validations == [1, 2, 3]
+
+        service.async_validate({'value': 1})
+        assert validations == [1, 2, 3]
+        service.async_validate({'value': 2})
+        assert validations == [1, 2, 3, 2]
+
+
 def test_context():
     """Test context init."""
     c = ha.Context()
@@ -1128,3 +1273,71 @@ def test_context():
     assert c.user_id == 23
     assert c.parent_id == 100
     assert c.id is not None
+
+
+async def test_async_add_executor_job_pool(hass):
+    """Test executor jobs run in the requested executor pool."""
+    hass.async_create_executor_pool('Test', 1)
+
+    def thread_name():
+        return threading.current_thread().name
+
+    name = await hass.async_add_executor_job(thread_name, pool='Test')
+    assert name.startswith('TestWorker')
+    name = await hass.async_add_executor_job(thread_name, pool=ha.POOL_CORE)
+    assert name.startswith('CoreWorker')
+    name = await hass.async_add_executor_job(
+        thread_name, pool=ha.POOL_HISTORY)
+    assert name.startswith('HistoryWorker')
+    # Unknown pools fall back to the default pool
+    name = await hass.async_add_executor_job(thread_name, pool='unknown')
+    assert name.startswith('SyncWorker')
+
+    stats = hass.async_executor_pool_stats()
+    assert stats['Test']['max_workers'] == 1
+    assert stats['Test']['completed'] == 1
+    assert stats['Test']['queued'] == 0
+
+    with pytest.raises(HomeAssistantError):
+        hass.async_create_executor_pool('Test')
+
+
+async def test_block_till_done_waits_for_nested_tasks(hass):
+    """Test tasks added by tracked tasks are waited for and released."""
+    calls = []
+
+    async def inner():
+        await asyncio.sleep(0)
+        calls.append('inner')
+
+    async def outer():
+        await asyncio.sleep(0)
+        hass.async_create_task(inner())
+        calls.append('outer')
+
+    hass.async_create_task(outer())
+    await hass.async_block_till_done()
+
+    assert calls == ['outer', 'inner']
+    assert not hass._pending_tasks  # pylint: disable=protected-access
+
+
+async def test_block_till_done_cancel(hass):
+    """Test cancelling async_block_till_done keeps the tasks running."""
+    release = asyncio.Event()
+
+    async def wait_for_release():
+        await release.wait()
+
+    task = hass.async_create_task(wait_for_release())
+    waiter = hass.loop.create_task(hass.async_block_till_done())
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert not task.done()
+
+    release.set()
+    await hass.async_block_till_done()
+    assert task.done()
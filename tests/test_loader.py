@@ -1,11 +1,21 @@
 """Test to verify that we can load components."""
+from datetime import timedelta
+import os
+import sys
+from unittest.mock import patch
+
 import pytest
 
 import homeassistant.loader as loader
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
+from homeassistant.const import __version__
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.util.dt as dt_util
 
-from tests.common import MockModule, async_mock_service, mock_integration
+from tests.common import (
+    MockModule, async_fire_time_changed, async_mock_service,
+    mock_integration)
 
 
 async def test_component_dependencies(hass):
@@ -162,3 +172,131 @@ async def test_integrations_only_once(hass):
         loader.async_get_integration(hass, 'hue'))
 
     assert await int_1 is await int_2
+
+
+async def test_manifest_index_stored(hass, hass_storage):
+    """Test the manifest index is built and stored."""
+    hass.data.pop(loader.DATA_MANIFEST_INDEX)
+    index = await loader.async_get_manifest_index(hass)
+
+    assert index['ha_version'] == __version__
+    assert index['builtin']['hue']['manifest']['name'] == 'Philips Hue'
+    assert index['custom']['test_package']['manifest']['name'] == \
+        'Test Package'
+    # Legacy custom components without a manifest are not indexed
+    assert 'test_standalone' not in index['custom']
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(
+        seconds=loader.MANIFEST_INDEX_SAVE_DELAY))
+    await hass.async_block_till_done()
+    assert hass_storage[loader.MANIFEST_INDEX_KEY]['data'] == index
+
+
+def _stored_hue_index(mtime, path=None):
+    """Return a stored manifest index with a renamed hue manifest."""
+    return {
+        'version': loader.MANIFEST_INDEX_VERSION,
+        'data': {
+            'ha_version': __version__,
+            'builtin': {
+                'hue': {
+                    'path': path or hue.__path__[0],
+                    'mtime': mtime,
+                    'manifest': {
+                        'domain': 'hue',
+                        'name': 'Stored Hue',
+                        'dependencies': [],
+                        'requirements': [],
+                    },
+                },
+            },
+            'custom': {},
+        },
+    }
+
+
+async def test_manifest_index_loaded(hass, hass_storage):
+    """Test unchanged manifests of a stored index are not read again."""
+    hass.data.pop(loader.DATA_MANIFEST_INDEX)
+    mtime = os.stat(os.path.join(hue.__path__[0], 'manifest.json')).st_mtime
+    hass_storage[loader.MANIFEST_INDEX_KEY] = _stored_hue_index(mtime)
+
+    integration = await loader.async_get_integration(hass, 'hue')
+
+    assert integration.name == 'Stored Hue'
+
+
+@pytest.mark.parametrize('mtime, path', [
+    # Manifest that was edited
+    (0, None),
+    # Install that was moved
+    (None, '/old/homeassistant/components/hue'),
+])
+async def test_manifest_index_changed(hass, hass_storage, mtime, path):
+    """Test manifests that changed since they were stored are read again."""
+    hass.data.pop(loader.DATA_MANIFEST_INDEX)
+    if mtime is None:
+        mtime = os.stat(
+            os.path.join(hue.__path__[0], 'manifest.json')).st_mtime
+    hass_storage[loader.MANIFEST_INDEX_KEY] = _stored_hue_index(mtime, path)
+
+    integration = await loader.async_get_integration(hass, 'hue')
+
+    assert integration.name == 'Philips Hue'
+    assert str(integration.file_path) == hue.__path__[0]
+
+
+@pytest.mark.parametrize('stored', [
+    {'ha_version': __version__},
+    {'ha_version': __version__, 'builtin': None, 'custom': {}},
+])
+async def test_manifest_index_invalid(hass, hass_storage, caplog, stored):
+    """Test an invalid stored index is rebuilt."""
+    hass.data.pop(loader.DATA_MANIFEST_INDEX)
+    hass_storage[loader.MANIFEST_INDEX_KEY] = {
+        'version': loader.MANIFEST_INDEX_VERSION,
+        'data': stored,
+    }
+
+    integration = await loader.async_get_integration(hass, 'hue')
+
+    assert integration.name == 'Philips Hue'
+    assert 'Error loading the manifest index' in caplog.text
+
+
+async def test_manifest_index_load_error(hass, caplog):
+    """Test the index is rebuilt if the stored index can't be read."""
+    hass.data.pop(loader.DATA_MANIFEST_INDEX)
+
+    with patch('homeassistant.helpers.storage.Store.async_load',
+               side_effect=HomeAssistantError):
+        integration = await loader.async_get_integration(hass, 'hue')
+
+    assert integration.name == 'Philips Hue'
+    assert 'Error loading the manifest index' in caplog.text
+
+
+async def test_integration_preload(hass):
+    """Test the component and platforms are imported in the import pool."""
+    integration = await loader.async_get_integration(hass, 'hue')
+    hass.data.pop(loader.DATA_COMPONENTS, None)
+
+    await integration.async_preload(['light'])
+
+    assert hass.data[loader.DATA_COMPONENTS] == {
+        'hue': hue,
+        'hue.light': hue_light,
+    }
+    assert hass.async_executor_pool_stats()['Import']['completed'] == 2
+
+
+async def test_import_times(hass):
+    """Test the time it took to import a module is recorded."""
+    integration = await loader.async_get_integration(hass, 'test_package')
+
+    with patch.dict(sys.modules):
+        sys.modules.pop('custom_components.test_package', None)
+        integration.get_component()
+
+    import_times = hass.data[loader.DATA_IMPORT_TIMES]
+    assert import_times['custom_components.test_package'] > 0
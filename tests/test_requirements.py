@@ -1,15 +1,22 @@
 """Test requirements module."""
+import asyncio
+from datetime import timedelta
 import os
 from unittest.mock import patch, call
 
 from homeassistant import setup
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.requirements import (
-    CONSTRAINT_FILE, PackageLoadable, async_process_requirements)
+    CONSTRAINT_FILE, SAVE_DELAY, STORAGE_KEY, STORAGE_VERSION,
+    PackageLoadable, async_process_requirements, async_requirements_met)
+import homeassistant.util.dt as dt_util
 
 import pkg_resources
+import pytest
 
 from tests.common import (
-    get_test_home_assistant, MockModule, mock_coro, mock_integration)
+    async_fire_time_changed, get_test_home_assistant, MockModule, mock_coro,
+    mock_integration)
 
 RESOURCE_DIR = os.path.abspath(
     os.path.join(os.path.dirname(__file__), '..', 'resources'))
@@ -124,3 +131,108 @@ async def test_package_loadable_installed_twice(hass):
 
     with patch('pkg_resources.find_distributions', side_effect=[[v2]]):
         assert await PackageLoadable(hass).loadable('Hello==2.0.0')
+
+
+async def test_install_missing_packages(hass):
+    """Test only the missing requirements are installed."""
+    installed_package = list(pkg_resources.working_set)[0].project_name
+
+    with patch('homeassistant.util.package.install_package',
+               return_value=True) as mock_inst:
+        assert await async_process_requirements(
+            hass, 'test_component',
+            [installed_package, 'hello==1.0.0', 'world==1.0.0'])
+
+    assert [mock_call[1][0] for mock_call in mock_inst.mock_calls] == \
+        ['hello==1.0.0', 'world==1.0.0']
+
+    with patch('homeassistant.util.package.install_package',
+               side_effect=lambda req, **kwargs: req != 'world==1.0.0'):
+        assert not await async_process_requirements(
+            hass, 'test_component', ['hello==1.0.0', 'world==1.0.0'])
+
+
+async def test_install_packages_once(hass):
+    """Test a package needed by two integrations is installed once."""
+    installed = set()
+
+    def mock_install(req, **kwargs):
+        installed.add(req)
+        return True
+
+    async def mock_loadable(self, req):
+        return req in installed
+
+    with patch('homeassistant.requirements.PackageLoadable.loadable',
+               mock_loadable), \
+            patch('homeassistant.util.package.install_package',
+                  side_effect=mock_install) as mock_inst:
+        assert all(await asyncio.gather(
+            async_process_requirements(hass, 'one', ['hello==1.0.0']),
+            async_process_requirements(hass, 'two', ['hello==1.0.0'])))
+
+    assert len(mock_inst.mock_calls) == 1
+
+
+async def test_requirements_met(hass):
+    """Test checking requirements without installing them."""
+    installed_package = list(pkg_resources.working_set)[0].project_name
+
+    with patch('homeassistant.util.package.install_package') as mock_inst:
+        assert await async_requirements_met(hass, [installed_package])
+        assert not await async_requirements_met(
+            hass, [installed_package, 'hello==1.0.0'])
+
+    assert len(mock_inst.mock_calls) == 0
+
+
+async def test_met_requirements_stored(hass, hass_storage):
+    """Test requirements that were met are stored with the Python path."""
+    installed_package = list(pkg_resources.working_set)[0].project_name
+    assert await PackageLoadable(hass).loadable(installed_package)
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY))
+    await hass.async_block_till_done()
+    assert hass_storage[STORAGE_KEY]['data']['satisfied'] == \
+        [installed_package]
+
+    # Met requirements are not looked up again
+    with patch('pkg_resources.find_distributions') as mock_find:
+        assert await PackageLoadable(hass).loadable(installed_package)
+    assert len(mock_find.mock_calls) == 0
+
+    # Until packages are installed or removed
+    with patch('homeassistant.requirements._sys_path_fingerprint',
+               return_value=[['/changed', 1]]), \
+            patch('pkg_resources.find_distributions', return_value=[]):
+        assert not await PackageLoadable(hass).loadable(installed_package)
+
+
+@pytest.mark.parametrize('stored', [
+    {'satisfied': ['hello==1.0']},
+    ['hello==1.0'],
+])
+async def test_invalid_met_requirements(hass, hass_storage, caplog, stored):
+    """Test an invalid store of met requirements is treated as empty."""
+    hass_storage[STORAGE_KEY] = {
+        'version': STORAGE_VERSION,
+        'data': stored,
+    }
+    installed_package = list(pkg_resources.working_set)[0].project_name
+
+    assert await PackageLoadable(hass).loadable(installed_package)
+    assert 'Error loading the met requirements' in caplog.text
+
+
+async def test_met_requirements_load_error(hass, caplog):
+    """Test met requirements that can't be read are looked up again."""
+    installed_package = list(pkg_resources.working_set)[0].project_name
+
+    with patch('homeassistant.helpers.storage.Store.async_load',
+               side_effect=HomeAssistantError):
+        package_loadable = PackageLoadable(hass)
+        assert await package_loadable.loadable(installed_package)
+        assert await package_loadable.loadable(installed_package)
+
+    assert 'Error loading the met requirements' in caplog.text
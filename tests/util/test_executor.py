@@ -0,0 +1,66 @@
+"""Test Home Assistant executor pools."""
+import threading
+
+from homeassistant.util.executor import ExecutorPool
+
+
+def test_stats_idle_pool():
+    """Test the statistics of a pool that did not run anything."""
+    pool = ExecutorPool('Test', 2)
+
+    assert pool.name == 'Test'
+    assert pool.stats == {
+        'max_workers': 2,
+        'queued': 0,
+        'running': 0,
+        'completed': 0,
+        'average_wait': 0.0,
+        'max_wait': 0.0,
+    }
+    pool.shutdown()
+
+
+def test_stats_queue_depth():
+    """Test jobs waiting for a worker are reported as queued."""
+    pool = ExecutorPool('Test', 1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_job():
+        started.set()
+        release.wait()
+        return 'done'
+
+    first = pool.submit(blocking_job)
+    started.wait()
+    second = pool.submit(lambda: 'second')
+
+    stats = pool.stats
+    assert stats['running'] == 1
+    assert stats['queued'] == 1
+
+    release.set()
+    assert first.result() == 'done'
+    assert second.result() == 'second'
+
+    stats = pool.stats
+    assert stats['running'] == 0
+    assert stats['queued'] == 0
+    assert stats['completed'] == 2
+    assert stats['max_wait'] > 0
+    assert stats['average_wait'] <= stats['max_wait']
+    pool.shutdown()
+
+
+def test_exception_is_counted():
+    """Test failing jobs still complete and propagate the exception."""
+    pool = ExecutorPool('Test', 1)
+
+    def failing_job():
+        raise ValueError('boom')
+
+    future = pool.submit(failing_job)
+    assert isinstance(future.exception(), ValueError)
+    assert pool.stats['completed'] == 1
+    assert pool.stats['running'] == 0
+    pool.shutdown()
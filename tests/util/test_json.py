@@ -10,7 +10,7 @@ from homeassistant.util.json import (
 from homeassistant.exceptions import HomeAssistantError
 import pytest
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 # Test data that can be saved as JSON
 TEST_JSON_A = {"a": 1, "B": "two"}
@@ -64,6 +64,20 @@ class TestJSON(unittest.TestCase):
         data = load_json(fname)
         assert data == TEST_JSON_B
 
+    def test_save_compact(self):
+        """Test saving compact JSON and the bytes written."""
+        fname = self._path_for("test7")
+        assert save_json(fname, TEST_JSON_A, compact=True) == \
+            len('{"a":1,"B":"two"}')
+        with open(fname) as fh:
+            assert fh.read() == '{"a":1,"B":"two"}'
+
+        with patch('os.fsync') as mock_fsync:
+            assert save_json(fname, TEST_JSON_B, fsync=True) == \
+                os.path.getsize(fname)
+        assert mock_fsync.called
+        assert load_json(fname) == TEST_JSON_B
+
     def test_save_bad_data(self):
         """Test error from trying to save unserialisable data."""
         fname = self._path_for("test4")
@@ -0,0 +1,70 @@
+"""Test Home Assistant rolling window statistics."""
+from collections import deque
+import random
+import statistics
+
+import pytest
+
+from homeassistant.util.rolling import RollingStatistics
+
+
+def test_empty_window():
+    """Test the statistics of an empty window."""
+    stats = RollingStatistics()
+
+    assert len(stats) == 0
+    assert stats.total == 0
+    assert stats.mean is None
+    assert stats.median is None
+    assert stats.variance is None
+    assert stats.stdev is None
+    assert stats.min is None
+    assert stats.max is None
+
+
+def test_single_value():
+    """Test variance needs at least two values."""
+    stats = RollingStatistics()
+    stats.add(4.0)
+
+    assert stats.mean == 4.0
+    assert stats.median == 4.0
+    assert stats.variance is None
+
+    stats.remove(4.0)
+    assert len(stats) == 0
+    assert stats.mean is None
+
+
+def test_remove_unknown_value():
+    """Test removing a value that is not in the window."""
+    stats = RollingStatistics()
+    stats.add(1.0)
+
+    with pytest.raises(ValueError):
+        stats.remove(2.0)
+
+
+def test_matches_statistics_module():
+    """Test a sliding window against the statistics module."""
+    rand = random.Random(1234)
+    window = deque()
+    stats = RollingStatistics()
+
+    for _ in range(1000):
+        if len(window) == 50:
+            stats.remove(window.popleft())
+        value = round(rand.uniform(-100, 100), 2)
+        window.append(value)
+        stats.add(value)
+
+        assert len(stats) == len(window)
+        assert stats.total == pytest.approx(sum(window))
+        assert stats.mean == pytest.approx(statistics.mean(window))
+        assert stats.median == statistics.median(window)
+        assert stats.min == min(window)
+        assert stats.max == max(window)
+        if len(window) > 1:
+            assert stats.variance == pytest.approx(
+                statistics.variance(window))
+            assert stats.stdev == pytest.approx(statistics.stdev(window))
@@ -443,3 +443,39 @@ def test_duplicate_key(caplog):
     with patch_yaml_files(files):
         load_yaml_config_file(YAML_CONFIG_FILE)
     assert 'contains duplicate key' in caplog.text
+
+
+def test_parsed_cache(tmpdir):
+    """Test composed files are cached and invalidated on changes."""
+    yaml.clear_parsed_cache()
+    config_path = str(tmpdir.join('configuration.yaml'))
+    cache_path = str(tmpdir.join('.storage', 'core.yaml_cache'))
+    with open(config_path, 'w') as fil:
+        fil.write('key: &anchor\n  - 1\n  - two\nother: *anchor\n'
+                  'password: !env_var CACHED_PASSWORD\n')
+
+    yaml.load_parsed_cache(cache_path)
+    with patch.dict(os.environ, {'CACHED_PASSWORD': 'first'}):
+        data = yaml.load_yaml(config_path)
+    assert data['key'] == data['other'] == [1, 'two']
+    assert data['password'] == 'first'
+    line = data['other'].__line__
+    yaml.save_parsed_cache(cache_path)
+    assert os.path.isfile(cache_path)
+
+    # A new run composes the file from the stored cache
+    yaml.clear_parsed_cache()
+    yaml.load_parsed_cache(cache_path)
+    with patch.object(yaml, '_ComposeLoader') as mock_loader, \
+            patch.dict(os.environ, {'CACHED_PASSWORD': 'second'}):
+        data = yaml.load_yaml(config_path)
+    assert not mock_loader.called
+    assert data['other'] == [1, 'two']
+    assert data['password'] == 'second'
+    assert data['key'].__config_file__ == config_path
+    assert data['other'].__line__ == line
+
+    with open(config_path, 'w') as fil:
+        fil.write('key: changed\n')
+    assert yaml.load_yaml(config_path) == {'key': 'changed'}
+    yaml.clear_parsed_cache()